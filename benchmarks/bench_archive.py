@@ -0,0 +1,75 @@
+"""Measures a FixtureArchive of ten seasons of six competitions against
+the same fixtures held as Fixture objects: the memory each takes, the
+size of the archive on disk and the time taken to find a team's fixtures
+over the ten seasons.
+
+Run from the repository root with::
+
+    python -m benchmarks.bench_archive
+"""
+import gc
+import json
+import os
+import shutil
+import tempfile
+import timeit
+import tracemalloc
+
+from tests import resources
+from pyfootball.archive import FixtureArchive
+from pyfootball.models.fixture import Fixture
+
+COMP_IDS = (2021, 2014, 2002, 2019, 2015, 2016)
+
+
+def allocated(fn):
+    """Returns what fn returns and the bytes it leaves allocated."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn()
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current
+
+
+def main():
+    matches = resources.seasons_v4(n_seasons=10, comp_ids=COMP_IDS)
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'archive')
+        FixtureArchive(path).append(matches)
+        disk = sum(os.path.getsize(os.path.join(path, name))
+                   for name in os.listdir(path))
+
+        body = json.dumps(matches)
+        fixtures, fixture_bytes = allocated(
+            lambda: [Fixture(m) for m in json.loads(body)])
+        archive, archive_bytes = allocated(lambda: FixtureArchive(path))
+        print('{} fixtures, JSON {:.1f} MB, archive on disk {:.1f} MB'
+              .format(len(matches), len(body) / 1e6,
+                      disk / 1e6))
+        print('{:<16} {:>10.1f} MB'.format('Fixture objects',
+                                           fixture_bytes / 1e6))
+        print('{:<16} {:>10.1f} MB'.format('archive',
+                                           archive_bytes / 1e6))
+
+        cases = [
+            ('scan', lambda: [f for f in fixtures
+                              if 1003 in (f.home_team_id, f.away_team_id)]),
+            ('archive select', lambda: archive.select(team_id=1003)),
+            ('archive query', lambda: archive.query(team_id=1003)),
+        ]
+        print("One team's fixtures over ten seasons")
+        for name, fn in cases:
+            number, elapsed = timeit.Timer(fn).autorange()
+            print('{:<16} {:>10.3f} ms'.format(name,
+                                               elapsed / number * 1000))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
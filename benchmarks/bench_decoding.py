@@ -0,0 +1,168 @@
+"""Measures how many model objects per second are built from the payloads in
+``tests/resources.py``, with the strptime-based constructors the models used
+before the compiled decoders ("before"), with the models themselves
+("after"), and with their lazy variants, which decode nothing up front.
+
+Run from the repository root with::
+
+    python -m benchmarks.bench_decoding
+"""
+import copy
+import timeit
+from datetime import datetime
+
+from tests import resources
+from pyfootball.decoding import parse_date, parse_datetime
+from pyfootball.models.competition import Competition, LazyCompetition
+from pyfootball.models.fixture import Fixture, LazyFixture
+from pyfootball.models.player import Player, LazyPlayer
+from pyfootball.models.standings import Standings, LazyStanding
+
+
+class _Legacy(object):
+    pass
+
+
+def legacy_fixture(data):
+    obj = _Legacy()
+    obj.area = data['area']
+    obj.competition = data['competition']
+    obj.season = data['season']
+    obj.id = data['id']
+    obj.date = datetime.strptime(data['utcDate'], '%Y-%m-%dT%H:%M:%SZ')
+    obj.status = data['status']
+    obj.matchday = data['matchday']
+    obj.stage = data['stage']
+    obj.group = data['group']
+    obj.lastUpdated = data['lastUpdated']
+    obj.home_team = data['homeTeam']
+    obj.home_team_id = obj.home_team['id']
+    obj.home_team_name = obj.home_team['name']
+    obj.away_team = data['awayTeam']
+    obj.away_team_id = obj.away_team['id']
+    obj.away_team_name = obj.away_team['name']
+    obj.score = data['score']
+    obj.odds = data['odds']
+    obj.referees = data['referees']
+    if obj.status == 'FINISHED':
+        if obj.score['winner'] == 'HOME_TEAM':
+            obj.winner = obj.home_team_name
+        elif obj.score['winner'] == 'AWAY_TEAM':
+            obj.winner = obj.away_team_name
+        else:
+            obj.winner = 'DRAW'
+    else:
+        obj.winner = None
+    return obj
+
+
+def legacy_competition(data):
+    obj = _Legacy()
+    obj.id = data['id']
+    obj.area = data['area']
+    obj.name = data['name']
+    obj.code = data['code']
+    obj.type = data['type']
+    obj.emblem = data['emblem']
+    obj.start_date = datetime.strptime(data['currentSeason']['startDate'],
+                                       '%Y-%m-%d')
+    obj.end_date = datetime.strptime(data['currentSeason']['endDate'],
+                                     '%Y-%m-%d')
+    obj.current_matchday = data['currentSeason']['currentMatchday']
+    obj.winner = data['currentSeason']['winner']
+    obj.numberOfAvailableSeasons = data.get('numberOfAvailableSeasons') or \
+        len(data['seasons'])
+    obj.last_updated = datetime.strptime(data['lastUpdated'],
+                                         '%Y-%m-%dT%H:%M:%SZ')
+    return obj
+
+
+def legacy_player(data):
+    obj = _Legacy()
+    obj.id = data['id']
+    obj.name = data['name']
+    obj.position = data['position']
+    obj.date_of_birth = datetime.strptime(data['dateOfBirth'],
+                                          '%Y-%m-%d').date()
+    obj.nationality = data['nationality']
+    obj.shirt_number = data.get('shirtNumber')
+    obj.lastUpdated = data.get('lastUpdated')
+    obj.currentTeam = data.get('currentTeam')
+    return obj
+
+
+def legacy_standing(data):
+    obj = _Legacy()
+    obj.position = data['position']
+    obj.team = data['team']
+    obj.team_id = obj.team['id']
+    obj.team_name = obj.team['name']
+    obj.team_shortName = obj.team['shortName']
+    obj.team_tla = obj.team['tla']
+    obj.team_crest = obj.team['crest']
+    obj.games_played = data['playedGames']
+    obj.form = data['form']
+    obj.wins = data['won']
+    obj.draws = data['draw']
+    obj.losses = data['lost']
+    obj.points = data['points']
+    obj.goals = data['goalsFor']
+    obj.goals_against = data['goalsAgainst']
+    obj.goal_difference = data['goalDifference']
+    return obj
+
+
+def season_fixtures(matchdays=38, per_matchday=10):
+    """Returns a season's worth of fixture payloads, where the matches of a
+    matchday share a handful of kickoff times as they do in practice."""
+    template = resources.FIXTURES_V4['matches'][0]
+    fixtures = []
+    for matchday in range(matchdays):
+        for i in range(per_matchday):
+            match = copy.deepcopy(template)
+            match['id'] = matchday * per_matchday + i
+            match['matchday'] = matchday + 1
+            match['utcDate'] = '2023-{:02d}-{:02d}T{}:00:00Z'.format(
+                8 + matchday // 8, 1 + matchday % 28, 12 + i % 4 * 2)
+            fixtures.append(match)
+    return fixtures
+
+
+def _rate(build, payloads, repeat=5):
+    def run():
+        for data in payloads:
+            build(data)
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return len(payloads) / best
+
+
+CASES = [
+    ('Fixture', legacy_fixture, Fixture, LazyFixture, season_fixtures),
+    ('Competition', legacy_competition, Competition, LazyCompetition,
+     lambda: resources.COMPETITIONS_V4['competitions'] * 100),
+    ('Player', legacy_player, Player, LazyPlayer,
+     lambda: [team['squad'][0] for team in
+              resources.COMP_TEAMS_V4['teams']] * 250),
+    ('Standing', legacy_standing, Standings.Standing, LazyStanding,
+     lambda: resources.LEAGUE_TABLE_V4['standings'][0]['table'] * 250),
+]
+
+
+def main():
+    print('{:<12} {:>14} {:>14} {:>8} {:>14}'.format(
+        'model', 'before (obj/s)', 'after (obj/s)', 'speedup',
+        'lazy (obj/s)'))
+    for name, before, after, lazy, payloads in CASES:
+        payloads = payloads()
+        parse_datetime.cache_clear()
+        parse_date.cache_clear()
+        rate_before = _rate(before, payloads)
+        rate_after = _rate(after, payloads)
+        rate_lazy = _rate(lazy, payloads)
+        print('{:<12} {:>14,.0f} {:>14,.0f} {:>7.1f}x {:>14,.0f}'.format(
+            name, rate_before, rate_after, rate_after / rate_before,
+            rate_lazy))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Measures the bytes retained per model object once the decoded response
+body has been dropped, for the regular and the compact models, and for
+the regular models built from a body interned with an IdentityMap.
+
+Run from the repository root with::
+
+    python -m benchmarks.bench_memory
+"""
+import gc
+import json
+import tracemalloc
+
+from tests import resources
+from benchmarks.bench_decoding import season_fixtures
+from pyfootball.decoding import shared_values
+from pyfootball.identity import IdentityMap
+from pyfootball.models.fixture import Fixture, CompactFixture
+from pyfootball.models.player import Player, CompactPlayer
+from pyfootball.models.standings import Standings, CompactStanding
+
+
+def retained_bytes(cls, body, key, identity_map=None):
+    """Decodes body, builds a cls object from each item of ``data[key]``
+    and returns the number of bytes still allocated per object after the
+    decoded body is released. The compact models' interning table is
+    emptied first and filled while memory is traced, so what it holds is
+    counted too."""
+    shared_values.clear()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        data = json.loads(body)
+        if identity_map is not None:
+            identity_map.intern_body(data)
+        models = [cls(item) for item in data[key]]
+        del data
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    shared_values.clear()
+    return current / len(models)
+
+
+CASES = [
+    ('Fixture', Fixture, CompactFixture,
+     lambda: {'matches': season_fixtures()}, 'matches'),
+    ('Player', Player, CompactPlayer,
+     lambda: {'squad': [player for team in resources.COMP_TEAMS_V4['teams']
+                        for player in team['squad']] * 100}, 'squad'),
+    ('Standing', Standings.Standing, CompactStanding,
+     lambda: {'table': resources.LEAGUE_TABLE_V4['standings'][0]['table'] *
+              100}, 'table'),
+]
+
+
+def main():
+    print('{:<10} {:>16} {:>16} {:>8} {:>16} {:>8}'.format(
+        'model', 'regular (B/obj)', 'compact (B/obj)', 'ratio',
+        'interned (B/obj)', 'ratio'))
+    for name, regular, compact, payload, key in CASES:
+        body = json.dumps(payload())
+        before = retained_bytes(regular, body, key)
+        after = retained_bytes(compact, body, key)
+        interned = retained_bytes(regular, body, key, IdentityMap())
+        print('{:<10} {:>16,.0f} {:>16,.0f} {:>7.1f}x {:>16,.0f} {:>7.1f}x'
+              .format(name, before, after, before / after, interned,
+                      before / interned))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""Measures the time taken to compute a league table from a season of
+fixtures, against a plain Python loop over the fixtures, and the time
+taken to update it for one changed result.
+
+Run from the repository root with::
+
+    python -m benchmarks.bench_tables
+"""
+import copy
+import timeit
+
+from tests import resources
+from tests.test_tables import reference_table
+from pyfootball.frame import FixtureFrame
+from pyfootball.models.fixture import Fixture
+from pyfootball.models.standings import Standings
+from pyfootball.tables import compute_table_data
+
+
+def main():
+    matches = resources.season_v4(played_matchdays=30)
+    frame = FixtureFrame.from_json(matches)
+    fixtures = [Fixture(m) for m in matches]
+    table = Standings.from_fixtures(fixtures)
+    events = []
+    for goals in range(5):
+        match = copy.deepcopy(matches[0])
+        match['score']['fullTime']['home'] = goals
+        events.append(Fixture(match))
+    cases = [
+        ('python loop', lambda: [reference_table(matches, venue) for venue
+                                 in (None, 'homeTeam', 'awayTeam')]),
+        ('FixtureFrame', lambda: compute_table_data(frame)),
+        ('Fixture list', lambda: compute_table_data(fixtures)),
+        ('update', lambda: table.apply(events[0]) + table.apply(events[1])),
+    ]
+    print('{} fixtures, total, home and away tables'.format(len(matches)))
+    for name, fn in cases:
+        number, elapsed = timeit.Timer(fn).autorange()
+        if name == 'update':
+            # Two changed results per call.
+            number *= 2
+        print('{:<14} {:>10.3f} ms'.format(name, elapsed / number * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Measures the client against the local stand-in server with a fixed
+latency per response: a new connection for every request against the
+pooled Transport, and sequential requests against ``get_teams``.
+
+Run from the repository root with::
+
+    python -m benchmarks.bench_transport
+"""
+import time
+
+import requests
+
+from tests.server import FootballDataServer
+from pyfootball.football import Football
+from pyfootball.transport import Transport
+
+LATENCY = 0.01
+TEAM_IDS = list(range(1000, 1020))
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    with FootballDataServer(latency=LATENCY) as server:
+        transport = Transport(base_url=server.url, rate_limiter=None)
+        f = Football(api_key='key', transport=transport)
+        urls = [server.url + 'teams/{}'.format(team_id)
+                for team_id in TEAM_IDS]
+        cases = [
+            ('new connections', lambda: [requests.get(url).json()
+                                         for url in urls]),
+            ('pooled', lambda: [f.get_team(team_id)
+                                for team_id in TEAM_IDS]),
+            ('get_teams', lambda: f.get_teams(TEAM_IDS)),
+        ]
+        print('{} teams, {:.0f} ms latency per response'.format(
+            len(TEAM_IDS), LATENCY * 1000))
+        for name, fn in cases:
+            connections = server.connections
+            elapsed = timed(fn)
+            print('{:<16} {:>8.1f} ms {:>4} connections'.format(
+                name, elapsed * 1000, server.connections - connections))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+"""Runs the benchmark suite and writes its results as JSON, or compares
+the results of two runs and flags the metrics that regressed.
+
+The suite measures how many model objects per second are built from a
+season-sized payload, the latency and throughput of requests to the local
+stand-in server, sequential and concurrent, and the peak memory of
+fetching a list endpoint.
+
+Run from the repository root with::
+
+    python -m benchmarks.suite run -o before.json
+    python -m benchmarks.suite run -o after.json
+    python -m benchmarks.suite compare before.json after.json
+
+``compare`` exits with status 1 if any metric is worse by more than the
+threshold, 10% by default. Timings are the best of several runs, but
+still vary from run to run on a busy machine, so both runs should be made
+on the same idle one.
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+
+from tests.server import FootballDataServer, build_routes
+from pyfootball.football import Football
+from pyfootball.models.competition import Competition
+from pyfootball.models.fixture import Fixture
+from pyfootball.models.player import Player
+from pyfootball.models.standings import Standings
+from pyfootball.models.team import Team
+from pyfootball.transport import Transport
+
+DEFAULT_THRESHOLD = 0.1
+
+# The latency of the stand-in server's responses, in seconds.
+LATENCY = 0.005
+
+TEAM_IDS = list(range(1000, 1020))
+
+
+def metric(value, unit, better):
+    """Returns a result: a value, its unit, and ``'higher'`` or
+    ``'lower'`` for the direction that is an improvement."""
+    return {'value': value, 'unit': unit, 'better': better}
+
+
+def _rate(build, payloads, repeat=5):
+    def run():
+        for data in payloads:
+            build(data)
+    timer = timeit.Timer(run)
+    number, elapsed = timer.autorange()
+    best = min(timer.repeat(repeat, number)) / number
+    return len(payloads) / best
+
+
+def bench_models():
+    """Objects built per second from the payloads of a 20-team season."""
+    routes = build_routes(n_competitions=1)
+    teams = routes['competitions/2021/teams']['teams']
+    cases = [
+        ('Fixture', Fixture, routes['competitions/2021/matches']['matches']),
+        ('Team', Team, teams),
+        ('Competition', Competition,
+         routes['competitions/']['competitions'] * 20),
+        ('Player', Player, [routes['persons/{}'.format(player['id'])]
+                            for team in teams for player in team['squad']]),
+    ]
+    if 'competitions/2021/standings' in routes:
+        cases.append(('Standings', Standings,
+                      [routes['competitions/2021/standings']] * 5))
+    return {'models.{}'.format(name): metric(_rate(cls, payloads),
+                                             'objects/s', 'higher')
+            for name, cls, payloads in cases}
+
+
+def _client(server):
+    transport = Transport(base_url=server.url, rate_limiter=None)
+    return Football(api_key='key', transport=transport)
+
+
+def _best(fn, repeat=5):
+    # The shortest of several timings, the least disturbed by the rest of
+    # the machine.
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def bench_requests():
+    """Request latency and throughput against the stand-in server. Each
+    measurement is the best of several, after the connections are open.
+    """
+    with FootballDataServer(latency=LATENCY) as server:
+        f = _client(server)
+        f.get_teams(TEAM_IDS)
+        team = _best(lambda: f.get_team(TEAM_IDS[0]), repeat=20)
+        sequential = _best(lambda: [f.get_team(team_id)
+                                    for team_id in TEAM_IDS])
+        concurrent = _best(lambda: f.get_teams(TEAM_IDS))
+        fixtures = _best(lambda: f.get_comp_fixtures(2021))
+    return {
+        'requests.team.latency': metric(team * 1000, 'ms', 'lower'),
+        'requests.team.sequential': metric(len(TEAM_IDS) / sequential,
+                                           'requests/s', 'higher'),
+        'requests.team.concurrent': metric(len(TEAM_IDS) / concurrent,
+                                           'requests/s', 'higher'),
+        'requests.comp_fixtures.latency': metric(fixtures * 1000, 'ms',
+                                                 'lower'),
+    }
+
+
+def _peak(fn):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def bench_memory():
+    """Peak bytes allocated while fetching every fixture of two
+    competitions, as a list and streamed."""
+    with FootballDataServer() as server:
+        f = _client(server)
+        return {
+            'memory.all_fixtures.list': metric(
+                _peak(f.get_all_fixtures) / 1e6, 'MB', 'lower'),
+            'memory.all_fixtures.iter': metric(
+                _peak(lambda: sum(1 for fixture in f.iter_all_fixtures()))
+                / 1e6, 'MB', 'lower'),
+        }
+
+
+BENCHMARKS = [bench_models, bench_requests, bench_memory]
+
+
+def run(benchmarks=BENCHMARKS):
+    """Runs the benchmarks and returns the results, keyed on metric name,
+    with the details of the machine they ran on."""
+    results = {}
+    for bench in benchmarks:
+        results.update(bench())
+    return {
+        'meta': {'python': platform.python_version(),
+                 'platform': platform.platform(),
+                 'created_at': time.time()},
+        'results': results,
+    }
+
+
+def compare(before, after, threshold=DEFAULT_THRESHOLD):
+    """Compares the results of two runs.
+
+    :param before: The results of the baseline run.
+    :type before: dict
+    :param after: The results of the new run.
+    :type after: dict
+    :keyword threshold: The relative change past which a metric that got
+        worse is a regression.
+    :type threshold: float
+
+    :returns: rows: A ``(name, before, after, change, regressed)`` tuple
+        for each metric in both runs, where change is relative and
+        positive when the metric improved.
+    """
+    rows = []
+    old, new = before['results'], after['results']
+    for name in sorted(set(old) & set(new)):
+        a, b = old[name]['value'], new[name]['value']
+        change = (b - a) / a if a else 0.0
+        if new[name]['better'] == 'lower':
+            change = -change
+        rows.append((name, a, b, change, change < -threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('-o', '--output',
+                            help='write the results to this file')
+    compare_parser = commands.add_parser(
+        'compare', help='compare the results of two runs')
+    compare_parser.add_argument('before')
+    compare_parser.add_argument('after')
+    compare_parser.add_argument('--threshold', type=float,
+                                default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run()
+        for name, result in sorted(results['results'].items()):
+            print('{:<34} {:>14,.3f} {}'.format(name, result['value'],
+                                                result['unit']))
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2)
+        return 0
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    rows = compare(before, after, args.threshold)
+    for name, a, b, change, regressed in rows:
+        print('{:<34} {:>14,.3f} {:>14,.3f} {:>+8.1%}{}'.format(
+            name, a, b, change, '  REGRESSION' if regressed else ''))
+    return 1 if any(row[4] for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
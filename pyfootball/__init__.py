@@ -1,5 +1,27 @@
-# from pyfootball.football import Football
-import os
+import importlib
 import sys
 
-sys.path.append(os.path.dirname(os.path.realpath(__file__)))
\ No newline at end of file
+# Names exposed at the package level, and the modules they live in. They are
+# imported on first use, so that ``import pyfootball`` stays cheap.
+_exports = {
+    'Football': 'pyfootball.football',
+    'AsyncFootball': 'pyfootball.aio',
+    'KeyPool': 'pyfootball.keypool',
+    'Transport': 'pyfootball.transport',
+}
+
+__all__ = sorted(_exports)
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module(_exports[name]), name)
+    # pyfootball.globals shadows globals() here, so set it on the module.
+    setattr(sys.modules[__name__], name, value)
+    return value
+
+
+def __dir__():
+    return sorted(set(vars(sys.modules[__name__])) | set(_exports))
@@ -0,0 +1,591 @@
+import asyncio
+import functools
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+
+from pyfootball.globals import endpoints
+from pyfootball.football import get_api_key, get_key_pool, \
+    get_model_classes
+from pyfootball.models.competition import Competition
+from pyfootball.models.team import Team
+from pyfootball.models.fixture import Fixture
+from pyfootball.models.standings import Standings
+from pyfootball.models.player import Player
+from pyfootball.ratelimit import default_limiter
+from pyfootball.cache import ResponseCache
+from pyfootball.instrumentation import Instrumentation, observe_response
+from pyfootball.diskcache import DiskCache
+from pyfootball.identity import IdentityMap
+from pyfootball.snapshot import Snapshot
+from pyfootball.singleflight import AsyncSingleFlight
+from pyfootball.batch import fan_out_async, iter_completed_async
+from pyfootball.transport import Transport, DEFAULT_POOL_SIZE, \
+    DEFAULT_TIMEOUT, fetch_models_async
+from pyfootball.frame import fetch_frame_async
+from pyfootball.live import Poller, DEFAULT_LIVE_INTERVAL, \
+    DEFAULT_IDLE_INTERVAL
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+DEFAULT_MAX_CONCURRENCY = 10
+
+
+def _trace_config():
+    # Records the time spent resolving the host and connecting in the
+    # record passed as a request's trace_request_ctx.
+    async def started(session, context, params):
+        context.started = time.perf_counter()
+
+    async def resolved(session, context, params):
+        context.trace_request_ctx['dns'] = \
+            time.perf_counter() - context.started
+
+    async def connected(session, context, params):
+        record = context.trace_request_ctx
+        record['connect'] = time.perf_counter() - context.started - \
+            (record['dns'] or 0)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(started)
+    trace_config.on_dns_resolvehost_end.append(resolved)
+    trace_config.on_connection_create_start.append(started)
+    trace_config.on_connection_create_end.append(connected)
+    return trace_config
+
+
+class AsyncTransport(object):
+    is_async = True
+
+    url = Transport.url
+    request_headers = Transport.request_headers
+    build = Transport.build
+    _should_retry = Transport._should_retry
+
+    def __init__(self, headers=None, pool_size=DEFAULT_POOL_SIZE,
+                 timeout=DEFAULT_TIMEOUT, rate_limiter=default_limiter,
+                 base_url=None, cache=None, disk_cache=None,
+                 single_flight=True, model_classes=None, identity_map=None,
+                 snapshot=None, hooks=None, key_pool=None,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        """The asyncio counterpart of Transport, built on a pooled
+        ``aiohttp.ClientSession``. At most max_concurrency requests are in
+        flight at once; the rest wait their turn on the event loop.
+
+        The session is created on the first request, so the object can be
+        constructed outside of a running event loop.
+
+        :keyword max_concurrency: The number of requests allowed in flight
+            at the same time.
+        :type max_concurrency: integer
+
+        See Transport for the other keyword arguments.
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncTransport requires aiohttp; install " +
+                              "it with: pip install aiohttp")
+        self.headers = headers
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.base_url = base_url
+        self.cache = cache
+        self.disk_cache = disk_cache
+        self.single_flight = AsyncSingleFlight() if single_flight else None
+        self.model_classes = model_classes or {}
+        self.identity_map = identity_map
+        self.snapshot = snapshot
+        self.instrumentation = Instrumentation(hooks or ())
+        self.key_pool = key_pool
+        self.max_concurrency = max_concurrency
+        self._session = None
+        self._semaphore = None
+        self._built = OrderedDict()
+        self._built_lock = threading.Lock()
+
+    @property
+    def session(self):
+        if self._session is None or self._session.closed:
+            if isinstance(self.timeout, tuple):
+                timeout = aiohttp.ClientTimeout(sock_connect=self.timeout[0],
+                                                sock_read=self.timeout[1])
+            else:
+                timeout = aiohttp.ClientTimeout(total=self.timeout)
+            connector = aiohttp.TCPConnector(limit=self.pool_size,
+                                             limit_per_host=self.pool_size)
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=timeout,
+                trace_configs=[_trace_config()])
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def _acquire(self, key):
+        while True:
+            delay = self.rate_limiter.try_acquire(key)
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    async def _send(self, endpoint, params, headers, record):
+        request_headers = self.request_headers(headers)
+        key = request_headers.get('X-Auth-Token', '')
+        limiter = self.rate_limiter
+        pool = self.key_pool
+        attempts = 2 if pool is None else len(pool) + 1
+        session = self.session
+        wait = 0.0
+        for attempt in range(attempts):
+            if pool is not None:
+                key = request_headers['X-Auth-Token'] = pool.choose()
+            start = time.perf_counter()
+            if limiter is not None:
+                await self._acquire(key)
+            async with self._semaphore:
+                wait += time.perf_counter() - start
+                start = time.perf_counter()
+                async with session.get(self.url(endpoint), params=params,
+                                       headers=request_headers,
+                                       trace_request_ctx=record) as r:
+                    record['ttfb'] = time.perf_counter() - start
+                    body = await r.read()
+                    record['total'] = time.perf_counter() - start
+            if not self._should_retry(key, r.headers, r.status) or \
+                    attempt == attempts - 1:
+                break
+            record['retries'] += 1
+        # The time spent waiting for the limiter and for a free slot.
+        record['rate_limit_wait'] = wait
+        observe_response(record, r.headers, r.status, len(body))
+        if record['cache'] is None:
+            record['cache'] = 'miss'
+        if r.status >= 400:
+            raise requests.exceptions.HTTPError(
+                '{} Error: {} for url: {}'.format(r.status, r.reason, r.url))
+        return r, body
+
+    async def get_json(self, endpoint, params=None, headers=None):
+        """Sends a GET request to the given endpoint and returns the decoded
+        JSON body. Raises an ``HTTPError`` if the response status code is
+        4XX or 5XX. Caches and single-flight are used the same way as by
+        ``Transport.get_json``.
+
+        :param endpoint: The full endpoint URL.
+        :type endpoint: string
+        :keyword params: Query string parameters.
+        :type params: dict
+        :keyword headers: Extra headers for this request only.
+        :type headers: dict
+
+        :returns: data: The decoded response body.
+        """
+        with self.instrumentation.request(endpoint, params) as record:
+            key = record['url']
+            if self.cache is not None:
+                data = self.cache.get(key)
+                if data is not None:
+                    record['cache'] = 'hit'
+                    return data
+            if self.snapshot is not None:
+                data = self.snapshot.get_fresh(key)
+                if data is not None:
+                    record['cache'] = 'snapshot'
+                    return data
+
+            if self.single_flight is None:
+                return await self._fetch_json(key, endpoint, params, headers,
+                                              record)
+            data = await self.single_flight.do(key, self._fetch_json, key,
+                                               endpoint, params, headers,
+                                               record)
+            if record['cache'] is None:
+                # Another call's request answered this one.
+                record['cache'] = 'coalesced'
+            return data
+
+    async def _fetch_json(self, key, endpoint, params, headers, record):
+        start = time.perf_counter()
+        fetched_at = None
+        if self.disk_cache is None:
+            r, body = await self._send(endpoint, params, headers, record)
+            start = time.perf_counter()
+            data, size = json.loads(body), len(body)
+        else:
+            # SQLite calls block, waiting up to its timeout for another
+            # process's lock, so they run on the default executor.
+            loop = asyncio.get_running_loop()
+            data, conditional, entry = await loop.run_in_executor(
+                None, self.disk_cache.lookup, key)
+            if data is None:
+                headers = dict(headers or {}, **(conditional or {}))
+                r, body = await self._send(endpoint, params, headers, record)
+                start = time.perf_counter()
+                data, reused = await loop.run_in_executor(
+                    None, functools.partial(self.disk_cache.resolve, key,
+                                            entry, r.status, body, r.headers))
+                size = len(body)
+                if reused:
+                    record['cache'] = 'revalidated'
+            else:
+                size = len(entry.body)
+                fetched_at = entry.fetched_at
+                record['cache'] = 'disk'
+        record['decode'] = time.perf_counter() - start
+
+        if self.snapshot is not None:
+            data = self.snapshot.revalidate(key, data, fetched_at)
+        if self.cache is not None:
+            # A body from the disk cache keeps the time it was fetched.
+            self.cache.set(key, data, size, fetched_at)
+        return data
+
+    async def close(self):
+        """Closes every pooled connection."""
+        if self._session is not None:
+            await self._session.close()
+
+
+class AsyncFootball(object):
+    def __init__(self, api_key=None, pool_size=DEFAULT_POOL_SIZE,
+                 timeout=DEFAULT_TIMEOUT, headers=None, transport=None,
+                 rate_limiter=default_limiter, cache=None, disk_cache=None,
+                 single_flight=True, models=None, identity_map=None,
+                 snapshot=None, hooks=None,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, lazy=False):
+        """The asyncio counterpart of Football. Every ``get_*`` method of
+        Football has an awaitable version here, and the Competition and
+        Team objects it returns support the ``*_async`` variants of their
+        methods. Requires aiohttp.
+
+        Unlike Football, the constructor sends no request; the API key is
+        checked by ``validate``, which is awaited on entering an
+        ``async with`` block unless lazy is True.
+
+        :keyword max_concurrency: The number of requests allowed in flight
+            at the same time.
+        :type max_concurrency: integer
+
+        See Football for the other keyword arguments.
+        """
+        key_pool = get_key_pool(api_key)
+        key = key_pool.keys[0] if key_pool else get_api_key(api_key)
+        model_classes = get_model_classes(models)
+
+        if cache is True:
+            cache = ResponseCache()
+        if isinstance(disk_cache, str):
+            disk_cache = DiskCache(disk_cache)
+        if identity_map is True:
+            identity_map = IdentityMap()
+        if isinstance(snapshot, str):
+            snapshot = Snapshot(snapshot)
+        if transport is None:
+            transport = AsyncTransport(pool_size=pool_size, timeout=timeout,
+                                       rate_limiter=rate_limiter, cache=cache,
+                                       disk_cache=disk_cache,
+                                       single_flight=single_flight,
+                                       model_classes=model_classes,
+                                       identity_map=identity_map,
+                                       snapshot=snapshot, hooks=hooks,
+                                       max_concurrency=max_concurrency)
+        transport.headers = dict(transport.headers or {})
+        transport.headers.update(headers or {})
+        transport.headers['X-Auth-Token'] = key
+        if key_pool is not None:
+            transport.key_pool = key_pool
+        self._transport = transport
+        self._lazy = lazy
+
+    @property
+    def transport(self):
+        """The AsyncTransport shared by this client and the objects it returns,
+        which exposes the rate limiter, caches and single-flight counters.
+        """
+        return self._transport
+
+    async def validate(self):
+        """Sends a test request to make sure that the API key is valid.
+
+        Sends one request to api.football-data.org.
+        """
+        await self._transport.get_json(endpoints['all_competitions'])
+
+    async def close(self):
+        """Closes every pooled connection."""
+        await self._transport.close()
+
+    async def __aenter__(self):
+        if not self._lazy:
+            await self.validate()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def get_prev_response(self):
+        """Returns the headers of the most recent response received by this
+        client on the current thread (the event loop's), with its
+        ``Status-Code`` and ``Endpoint``, or an empty dict if there isn't
+        one.
+
+        :returns: prev_response: Information about the most recent response.
+        """
+        return self._transport.instrumentation.last_response()
+
+    async def get_competition(self, comp_id):
+        """Awaitable version of ``Football.get_competition``.
+
+        Sends one request to api.football-data.org.
+
+        :param comp_id: The competition ID.
+        :type comp_id: integer
+
+        :returns: Competition: The Competition object.
+        """
+        endpoint = endpoints['competition'].format(comp_id)
+        return await fetch_models_async(self._transport, endpoint,
+                                        Competition, bind=True)
+
+    async def get_all_competitions(self):
+        """Awaitable version of ``Football.get_all_competitions``.
+
+        Sends one request to api.football-data.org.
+
+        :returns: comp_list: List of Competition objects.
+        """
+        endpoint = endpoints['all_competitions']
+        return await fetch_models_async(self._transport, endpoint, Competition,
+                                        'competitions', bind=True)
+
+    async def get_league_table(self, comp_id):
+        """Awaitable version of ``Football.get_league_table``.
+
+        Sends one request to api.football-data.org.
+
+        :param comp_id: The competition ID.
+        :type comp_id: integer
+
+        :returns: LeagueTable: A LeagueTable object.
+        """
+        endpoint = endpoints['league_table'].format(comp_id)
+        return await fetch_models_async(self._transport, endpoint, Standings)
+
+    async def get_comp_fixtures(self, comp_id, as_frame=False):
+        """Awaitable version of ``Football.get_comp_fixtures``.
+
+        Sends one request to api.football-data.org.
+
+        :param comp_id: The competition ID.
+        :type comp_id: integer
+        :keyword as_frame: Whether to return a FixtureFrame instead of a
+            list. Requires numpy.
+        :type as_frame: bool
+
+        :returns: fixture_list: A list of Fixture objects.
+        """
+        endpoint = endpoints['comp_fixtures'].format(comp_id)
+        if as_frame:
+            return await fetch_frame_async(self._transport, endpoint)
+        return await fetch_models_async(self._transport, endpoint, Fixture,
+                                        'matches')
+
+    async def get_competition_teams(self, comp_id):
+        """Awaitable version of ``Football.get_competition_teams``.
+
+        Sends one request to api.football-data.org.
+
+        :param comp_id: The competition ID.
+        :type comp_id: integer
+
+        :returns: team_list: A list of Team objects.
+        """
+        endpoint = endpoints['comp_teams'].format(comp_id)
+        return await fetch_models_async(self._transport, endpoint, Team,
+                                        'teams', bind=True)
+
+    async def get_fixture(self, fixture_id):
+        """Awaitable version of ``Football.get_fixture``.
+
+        Sends one request to api.football-data.org.
+
+        :param fixture_id: The fixture ID.
+        :type fixture_id: integer
+
+        :returns: Fixture: A Fixture object.
+        """
+        endpoint = endpoints['fixture'].format(fixture_id)
+        return await fetch_models_async(self._transport, endpoint, Fixture)
+
+    async def get_all_fixtures(self, as_frame=False):
+        """Awaitable version of ``Football.get_all_fixtures``.
+
+        Sends one request to api.football-data.org.
+
+        :keyword as_frame: Whether to return a FixtureFrame instead of a
+            list. Requires numpy.
+        :type as_frame: bool
+
+        :returns: fixture_list: A list of Fixture objects.
+        """
+        endpoint = endpoints['all_fixtures']
+        if as_frame:
+            return await fetch_frame_async(self._transport, endpoint)
+        return await fetch_models_async(self._transport, endpoint, Fixture,
+                                        'matches')
+
+    async def get_team(self, team_id):
+        """Awaitable version of ``Football.get_team``.
+
+        Sends one request to api.football-data.org.
+
+        :param team_id: The team ID.
+        :type team_id: integer
+
+        :returns: Team: A Team object.
+        """
+        endpoint = endpoints['team'].format(team_id)
+        return await fetch_models_async(self._transport, endpoint,
+                                        Team, bind=True)
+
+    async def get_team_players(self, team_id):
+        """Awaitable version of ``Football.get_team_players``.
+
+        Sends one request to api.football-data.org.
+
+        :param team_id: The team ID.
+        :type team_id: integer
+
+        :returns: player_list: A list of Player objects in the specified team.
+        """
+        endpoint = endpoints['team'].format(team_id)
+        return await fetch_models_async(self._transport, endpoint, Player,
+                                        'squad')
+
+    async def get_team_fixtures(self, team_id, as_frame=False):
+        """Awaitable version of ``Football.get_team_fixtures``.
+
+        Sends one request to api.football-data.org.
+
+        :param team_id: The team ID.
+        :type team_id: integer
+        :keyword as_frame: Whether to return a FixtureFrame instead of a
+            list. Requires numpy.
+        :type as_frame: bool
+
+        :returns: fixture_list: A list of Fixture objects for the team.
+        """
+        endpoint = endpoints['team_fixtures'].format(team_id)
+        if as_frame:
+            return await fetch_frame_async(self._transport, endpoint)
+        return await fetch_models_async(self._transport, endpoint, Fixture,
+                                        'matches')
+
+    async def get_player(self, player_id):
+        """Awaitable version of ``Football.get_player``.
+
+        Sends one request to api.football-data.org.
+
+        :param player_id: The player ID.
+        :type player_id: integer
+
+        :return: Player: A Player object for the player.
+        """
+        endpoint = endpoints['player'].format(player_id)
+        return await fetch_models_async(self._transport, endpoint, Player)
+
+    async def get_player_matches(self, player_id, n_matches=15,
+                                 as_frame=False):
+        """Awaitable version of ``Football.get_player_matches``.
+
+        :param player_id: The player ID
+        :param n_matches: The number of matches to receive (default 15)
+        :keyword as_frame: Whether to return a FixtureFrame instead of a
+            list. Requires numpy.
+        :type as_frame: bool
+        :return: matches_list: List of Fixture objects
+        """
+        endpoint = endpoints['player_matches'].format(player_id) + '?limit={}'.format(n_matches)
+        if as_frame:
+            return await fetch_frame_async(self._transport, endpoint)
+        return await fetch_models_async(self._transport, endpoint, Fixture,
+                                        'matches')
+
+    def _fan_out(self, fn, ids, ordered):
+        if ordered:
+            return fan_out_async(fn, ids)
+        return iter_completed_async(fn, ids)
+
+    def get_teams(self, team_ids, ordered=True):
+        """Asynchronous version of ``Football.get_teams``. With ordered=True
+        the result is awaited; otherwise it is an asynchronous iterator.
+        Concurrency is bounded by the transport's max_concurrency.
+
+        Sends one request per ID to api.football-data.org.
+
+        :param team_ids: The team IDs.
+        :type team_ids: list
+        :keyword ordered: Whether to return the results in input order.
+        :type ordered: bool
+
+        :returns: results: BatchResult objects.
+        """
+        return self._fan_out(self.get_team, team_ids, ordered)
+
+    def get_players(self, player_ids, ordered=True):
+        """Asynchronous version of ``Football.get_players``. See
+        ``get_teams``.
+
+        Sends one request per ID to api.football-data.org.
+
+        :param player_ids: The player IDs.
+        :type player_ids: list
+
+        :returns: results: BatchResult objects.
+        """
+        return self._fan_out(self.get_player, player_ids, ordered)
+
+    def get_fixtures(self, fixture_ids, ordered=True):
+        """Asynchronous version of ``Football.get_fixtures``. See
+        ``get_teams``.
+
+        Sends one request per ID to api.football-data.org.
+
+        :param fixture_ids: The fixture IDs.
+        :type fixture_ids: list
+
+        :returns: results: BatchResult objects.
+        """
+        return self._fan_out(self.get_fixture, fixture_ids, ordered)
+
+    def get_team_players_many(self, team_ids, ordered=True):
+        """Asynchronous version of ``Football.get_team_players_many``. See
+        ``get_teams``.
+
+        Sends one request per ID to api.football-data.org.
+
+        :param team_ids: The team IDs.
+        :type team_ids: list
+
+        :returns: results: BatchResult objects.
+        """
+        return self._fan_out(self.get_team_players, team_ids, ordered)
+
+    def live_poller(self, comp_id=None, live_interval=DEFAULT_LIVE_INTERVAL,
+                    idle_interval=DEFAULT_IDLE_INTERVAL):
+        """Same as ``Football.live_poller``. Iterate over ``Poller.events``
+        to receive the events in a coroutine.
+
+        Sends one request to api.football-data.org per poll.
+
+        :returns: poller: A Poller object.
+        """
+        if comp_id is None:
+            fetch = self.get_all_fixtures
+        else:
+            fetch = functools.partial(self.get_comp_fixtures, comp_id)
+        return Poller(fetch, live_interval, idle_interval)
@@ -0,0 +1,486 @@
+import calendar
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from pyfootball.decoding import parse_datetime
+from pyfootball.frame import COLUMNS, MISSING, STATUSES, STATUS_CODES, \
+    FixtureFrame, _goals
+from pyfootball.models.fixture import _FixtureBase
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FORMAT_VERSION = 2
+
+# The number of decoded strings and sub-objects an archive keeps.
+DEFAULT_STRING_CACHE_SIZE = 4096
+
+# Rows of a column read at a time when an append looks for the fixture IDs
+# and strings the archive already holds.
+_SCAN_ROWS = 1 << 20
+
+# The columns of FixtureFrame, followed by the season's start year, the
+# fixture's lastUpdated time in seconds since the epoch, and references
+# into the string table for the sub-objects and strings of a fixture.
+REFERENCES = [
+    ('area', 'area'),
+    ('competition', 'competition'),
+    ('season', 'season'),
+    ('stage', 'stage'),
+    ('group', 'group'),
+    ('home_team', 'homeTeam'),
+    ('away_team', 'awayTeam'),
+    ('score', 'score'),
+    ('odds', 'odds'),
+    ('referees', 'referees'),
+]
+ARCHIVE_COLUMNS = COLUMNS + [
+    ('season_year', 'int16'),
+    ('last_updated', 'int64'),
+] + [(name, 'int32') for name, key in REFERENCES]
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("FixtureArchive requires numpy; install it with: "
+                          "pip install numpy")
+
+
+def _dtype(dtype):
+    # Columns are stored little-endian whatever the host.
+    return np.dtype(dtype).newbyteorder('<')
+
+
+def _timestamp(value):
+    if value is None:
+        return MISSING
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    return calendar.timegm(value.timetuple())
+
+
+def _as_json(fixture):
+    # The API dict of a fixture given as a dict or as any model variant.
+    if isinstance(fixture, dict):
+        return fixture
+    return {'id': fixture.id, 'area': fixture.area,
+            'competition': fixture.competition, 'season': fixture.season,
+            'utcDate': fixture.date, 'status': fixture.status,
+            'matchday': fixture.matchday, 'stage': fixture.stage,
+            'group': fixture.group, 'lastUpdated': fixture.lastUpdated,
+            'homeTeam': fixture.home_team, 'awayTeam': fixture.away_team,
+            'score': fixture.score, 'odds': fixture.odds,
+            'referees': fixture.referees}
+
+
+def _season_year(season):
+    if not season or not season.get('startDate'):
+        return MISSING
+    return int(season['startDate'][:4])
+
+
+def _hash(encoded):
+    return int.from_bytes(hashlib.blake2b(encoded, digest_size=8).digest(),
+                          'little')
+
+
+def _find(column, values):
+    # The positions of the elements of a mapped column that are in values,
+    # reading it a chunk at a time rather than all at once.
+    values = np.unique(np.asarray(values, column.dtype))
+    for start in range(0, len(column), _SCAN_ROWS):
+        chunk = column[start:start + _SCAN_ROWS]
+        for offset in np.flatnonzero(np.isin(chunk, values)).tolist():
+            yield start + offset
+
+
+class FixtureArchive(object):
+    def __init__(self, path, string_cache_size=DEFAULT_STRING_CACHE_SIZE):
+        """An append-only store of fixtures on disk, for history that is too
+        large to hold as Fixture objects: many seasons of many
+        competitions. Requires numpy.
+
+        The archive is a directory holding one file per column in
+        ``ARCHIVE_COLUMNS``, a fixed-width array with one element per
+        fixture, and a table of the distinct strings and sub-objects of the
+        fixtures, such as team and score dicts, which the reference columns
+        point into, with a column of their hashes that appends look new
+        strings up in. The files are opened through memory maps, so a query
+        only reads the pages of the columns it looks at, and processes
+        reading the same archive share those pages.
+
+        Fixtures are returned as ArchivedFixture views, which have the
+        attributes of a Fixture and read them from the archive on demand,
+        or as a FixtureFrame. Only one process should append to an archive
+        at a time; others see what was appended after ``refresh``.
+
+        :param path: The directory of the archive, created if it doesn't
+            exist.
+        :type path: string
+        :keyword string_cache_size: The number of decoded strings and
+            sub-objects to keep for reuse.
+        :type string_cache_size: integer
+        """
+        _require_numpy()
+        self.path = path
+        self._lock = threading.RLock()
+        self._decoded = lru_cache(maxsize=string_cache_size)(self._decode)
+        os.makedirs(path, exist_ok=True)
+        if not os.path.exists(self._file('meta.json')):
+            self._write_meta(0, 0)
+        self._refresh()
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _read_meta(self):
+        with open(self._file('meta.json')) as f:
+            meta = json.load(f)
+        if meta.get('version') != FORMAT_VERSION:
+            raise ValueError("{} has archive format version {}; expected "
+                             "{}.".format(self.path, meta.get('version'),
+                                          FORMAT_VERSION))
+        return meta
+
+    def _write_meta(self, rows, strings):
+        meta = {'version': FORMAT_VERSION, 'rows': rows, 'strings': strings,
+                'columns': ARCHIVE_COLUMNS}
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._file('meta.json'))
+
+    def _map(self, name, dtype, count):
+        dtype = _dtype(dtype)
+        if count == 0:
+            return np.empty(0, dtype)
+        return np.memmap(self._file(name), dtype, mode='r', shape=(count,))
+
+    def refresh(self):
+        """Maps the fixtures appended since the archive was opened, by this
+        or another process."""
+        self._refresh()
+
+    def _refresh(self):
+        with self._lock:
+            meta = self._read_meta()
+            self.columns = {name: self._map(name + '.col', dtype,
+                                            meta['rows'])
+                            for name, dtype in ARCHIVE_COLUMNS}
+            self._string_ends = self._map('strings.idx', 'int64',
+                                          meta['strings'])
+            self._string_hashes = self._map('strings.hash', 'uint64',
+                                            meta['strings'])
+            size = int(self._string_ends[-1]) if meta['strings'] else 0
+            self._string_data = self._map('strings.bin', 'uint8', size)
+            return meta
+
+    def __len__(self):
+        return len(self.columns['id'])
+
+    def __getitem__(self, row):
+        if not -len(self) <= row < len(self):
+            raise IndexError('archive row out of range')
+        return ArchivedFixture(self, row % len(self))
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield ArchivedFixture(self, row)
+
+    def __repr__(self):
+        return '<FixtureArchive of {} fixtures>'.format(len(self))
+
+    def string(self, ref):
+        """Returns the string or sub-object a reference column points to,
+        or None for ``MISSING``. The most recently used ones are kept and
+        shared, so they should be treated as read-only.
+
+        :param ref: The reference.
+        :type ref: integer
+        """
+        if ref == MISSING:
+            return None
+        return self._decoded(ref)
+
+    def _decode(self, ref):
+        return json.loads(self._encoded(ref))
+
+    def _encoded(self, ref):
+        start = int(self._string_ends[ref - 1]) if ref else 0
+        end = int(self._string_ends[ref])
+        return self._string_data[start:end].tobytes()
+
+    def _held_ids(self, ids):
+        column = self.columns['id']
+        return {column[row].item() for row in _find(column, ids)}
+
+    def _string_refs(self, encodings):
+        # The refs of the strings the archive already holds, found through
+        # their hashes without reading the rest of the table.
+        by_hash = {}
+        for encoded in encodings:
+            by_hash.setdefault(_hash(encoded), []).append(encoded)
+        refs = {}
+        for ref in _find(self._string_hashes, list(by_hash)):
+            for encoded in by_hash[self._string_hashes[ref].item()]:
+                if encoded not in refs and self._encoded(ref) == encoded:
+                    refs[encoded] = ref
+        return refs
+
+    def append(self, fixtures):
+        """Appends fixtures to the archive, skipping those whose IDs it
+        already holds, and maps them.
+
+        :param fixtures: The fixtures, as Fixture objects of any variant,
+            views or the dicts of a response's ``matches`` list.
+        :type fixtures: list
+
+        :returns: count: The number of fixtures appended.
+        """
+        with self._lock:
+            meta = self._refresh()
+            rows, n_strings = meta['rows'], meta['strings']
+            fixtures = [_as_json(fixture) for fixture in fixtures]
+            if not fixtures:
+                return 0
+            seen = self._held_ids([data['id'] for data in fixtures])
+            matches = []
+            for data in fixtures:
+                if data['id'] not in seen:
+                    seen.add(data['id'])
+                    matches.append(data)
+            if not matches:
+                return 0
+
+            encoded = {}
+            for m in matches:
+                for name, key in REFERENCES:
+                    value = m.get(key)
+                    if value is not None:
+                        encoded[id(value)] = json.dumps(
+                            value, separators=(',', ':')).encode()
+            refs = self._string_refs(set(encoded.values()))
+            new_strings = []
+
+            def intern(value):
+                if value is None:
+                    return MISSING
+                string = encoded[id(value)]
+                ref = refs.get(string)
+                if ref is None:
+                    ref = refs[string] = n_strings + len(new_strings)
+                    new_strings.append(string)
+                return ref
+
+            values = {name: [] for name, dtype in ARCHIVE_COLUMNS}
+            for m in matches:
+                full_time = m['score']['fullTime']
+                half_time = m['score']['halfTime']
+                for name, value in (
+                        ('id', m['id']),
+                        ('competition_id', m['competition']['id']),
+                        ('matchday', _goals(m['matchday'])),
+                        ('utc_date', _timestamp(m['utcDate'])),
+                        ('status', STATUS_CODES[m['status']]),
+                        ('home_team_id', m['homeTeam']['id']),
+                        ('away_team_id', m['awayTeam']['id']),
+                        ('home_goals', _goals(full_time['home'])),
+                        ('away_goals', _goals(full_time['away'])),
+                        ('home_goals_half_time', _goals(half_time['home'])),
+                        ('away_goals_half_time', _goals(half_time['away'])),
+                        ('season_year', _season_year(m.get('season'))),
+                        ('last_updated', _timestamp(m.get('lastUpdated')))):
+                    values[name].append(value)
+                for name, key in REFERENCES:
+                    values[name].append(intern(m.get(key)))
+
+            self._write(rows, n_strings, new_strings, values)
+            self._write_meta(rows + len(matches),
+                             n_strings + len(new_strings))
+            self._refresh()
+            return len(matches)
+
+    def _write(self, rows, n_strings, new_strings, values):
+        # Strings first, so that no mapped row points past the table;
+        # anything after the counts in meta.json is left by a failed append
+        # and is overwritten.
+        with open(self._file('strings.bin'), 'ab') as data, \
+                open(self._file('strings.idx'), 'ab') as index, \
+                open(self._file('strings.hash'), 'ab') as hashes:
+            end = int(self._string_ends[-1]) if n_strings else 0
+            data.truncate(end)
+            index.truncate(n_strings * 8)
+            hashes.truncate(n_strings * 8)
+            ends = []
+            for encoded in new_strings:
+                data.write(encoded)
+                end += len(encoded)
+                ends.append(end)
+            index.write(np.array(ends, _dtype('int64')).tobytes())
+            hashes.write(np.array([_hash(encoded) for encoded in new_strings],
+                                  _dtype('uint64')).tobytes())
+        for name, dtype in ARCHIVE_COLUMNS:
+            dtype = _dtype(dtype)
+            with open(self._file(name + '.col'), 'ab') as f:
+                f.truncate(rows * dtype.itemsize)
+                f.write(np.array(values[name], dtype).tobytes())
+
+    def select(self, comp_id=None, season=None, team_id=None, status=None,
+               matchday=None, start=None, end=None):
+        """Returns the rows of the fixtures matching every given condition,
+        in kickoff order, reading only the columns the conditions need.
+
+        :keyword comp_id: The competition's ID, or a list of them.
+        :type comp_id: integer or list
+        :keyword season: A season's start year, or a ``(first, last)``
+            range.
+        :type season: integer or tuple
+        :keyword team_id: The ID of a team playing either home or away.
+        :type team_id: integer
+        :keyword status: A status, or a list of them.
+        :type status: string or list
+        :keyword matchday: A matchday, or a ``(first, last)`` range.
+        :type matchday: integer or tuple
+        :keyword start: The earliest kickoff time (inclusive).
+        :type start: datetime
+        :keyword end: The latest kickoff time (exclusive).
+        :type end: datetime
+
+        :returns: rows: An array of row positions.
+        """
+        c = self.columns
+        keep = np.ones(len(self), dtype=bool)
+        if comp_id is not None:
+            if isinstance(comp_id, int):
+                comp_id = [comp_id]
+            keep &= np.isin(c['competition_id'], comp_id)
+        if season is not None:
+            keep &= _in_range(c['season_year'], season)
+        if team_id is not None:
+            keep &= (c['home_team_id'] == team_id) | \
+                (c['away_team_id'] == team_id)
+        if status is not None:
+            if isinstance(status, str):
+                status = [status]
+            keep &= np.isin(c['status'],
+                            [STATUS_CODES[s] for s in status])
+        if matchday is not None:
+            keep &= _in_range(c['matchday'], matchday)
+        if start is not None:
+            keep &= c['utc_date'] >= _timestamp(start)
+        if end is not None:
+            keep &= c['utc_date'] < _timestamp(end)
+        rows = np.flatnonzero(keep)
+        order = np.lexsort((c['id'][rows], c['utc_date'][rows]))
+        return rows[order]
+
+    def query(self, **conditions):
+        """Same as ``select``, but returns a list of ArchivedFixture
+        views."""
+        return [ArchivedFixture(self, row)
+                for row in self.select(**conditions).tolist()]
+
+    def frame(self, **conditions):
+        """Same as ``select``, but returns the fixtures as a FixtureFrame,
+        with the team dicts of the fixtures and the sub-objects of the
+        first."""
+        rows = self.select(**conditions)
+        columns = {name: np.asarray(self.columns[name][rows], dtype)
+                   for name, dtype in COLUMNS}
+        refs = np.unique(np.concatenate([self.columns['home_team'][rows],
+                                         self.columns['away_team'][rows]]))
+        teams = {}
+        for ref in refs.tolist():
+            team = self.string(ref)
+            teams[team['id']] = team
+        meta = {}
+        if len(rows):
+            meta = {name: self.string(self.columns[name][rows[0]].item())
+                    for name in ('area', 'competition', 'season')}
+        return FixtureFrame(columns, teams, meta)
+
+    def get(self, fixture_id):
+        """Returns the view of the fixture with the given ID, or None."""
+        rows = np.flatnonzero(self.columns['id'] == fixture_id)
+        return ArchivedFixture(self, int(rows[0])) if len(rows) else None
+
+
+def _in_range(column, value):
+    if isinstance(value, tuple):
+        return (column >= value[0]) & (column <= value[1])
+    return column == value
+
+
+def _column_property(name, convert=None):
+    def get(self):
+        value = self._archive.columns[name][self._row].item()
+        return value if convert is None else convert(value)
+    return property(get)
+
+
+def _reference_property(name):
+    def get(self):
+        archive = self._archive
+        return archive.string(archive.columns[name][self._row].item())
+    return property(get)
+
+
+def _optional(value):
+    return None if value == MISSING else value
+
+
+def _datetime(value):
+    return _EPOCH + timedelta(seconds=value)
+
+
+def _iso(value):
+    if value == MISSING:
+        return None
+    return _datetime(value).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class ArchivedFixture(_FixtureBase):
+    """A view of one fixture of a FixtureArchive, with the attributes of a
+    Fixture, each read from the archive when it is accessed. Views hold no
+    data of their own, and their sub-objects are shared with every other
+    view of the archive and must be treated as read-only.
+    """
+    __slots__ = ('_archive', '_row')
+
+    id = _column_property('id')
+    date = _column_property('utc_date', _datetime)
+    status = _column_property('status', STATUSES.__getitem__)
+    matchday = _column_property('matchday', _optional)
+    lastUpdated = _column_property('last_updated', _iso)
+    home_team_id = _column_property('home_team_id')
+    away_team_id = _column_property('away_team_id')
+
+    def __init__(self, archive, row):
+        self._archive = archive
+        self._row = row
+
+    @property
+    def home_team_name(self):
+        return self.home_team['name']
+
+    @property
+    def away_team_name(self):
+        return self.away_team['name']
+
+    @property
+    def winner(self):
+        return self._get_winner()
+
+
+for _name, _key in REFERENCES:
+    setattr(ArchivedFixture, _name, _reference_property(_name))
+del _name, _key
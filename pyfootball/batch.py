@@ -0,0 +1,96 @@
+from collections import namedtuple
+
+
+class BatchResult(namedtuple('BatchResult', ['id', 'result', 'error'])):
+    """The outcome of one item of a batch: the ID it was requested with, and
+    either the result or the exception raised while fetching it."""
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        """Whether the item was fetched without an error."""
+        return self.error is None
+
+
+def _call(fn, item_id):
+    try:
+        return BatchResult(item_id, fn(item_id), None)
+    except Exception as e:
+        return BatchResult(item_id, None, e)
+
+
+def fan_out(fn, ids, max_workers, ordered=True):
+    """Calls ``fn(id)`` for every ID on a pool of at most max_workers
+    threads. An exception raised for one ID is recorded on its BatchResult
+    instead of aborting the batch.
+
+    :param fn: The function to call with each ID.
+    :type fn: callable
+    :param ids: The IDs to call fn with.
+    :type ids: iterable
+    :param max_workers: The number of threads to use.
+    :type max_workers: integer
+    :keyword ordered: If True, returns a list in the order of ids;
+        otherwise returns an iterator that yields each result as soon as it
+        is ready.
+    :type ordered: bool
+
+    :returns: A list or an iterator of BatchResult objects.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    ids = list(ids)
+    if ordered:
+        if not ids:
+            return []
+        with ThreadPoolExecutor(min(max_workers, len(ids))) as executor:
+            return list(executor.map(lambda i: _call(fn, i), ids))
+    return _iter_completed(fn, ids, max_workers)
+
+
+def _iter_completed(fn, ids, max_workers):
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    if not ids:
+        return
+    executor = ThreadPoolExecutor(min(max_workers, len(ids)))
+    futures = [executor.submit(_call, fn, i) for i in ids]
+    try:
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # Don't send the remaining requests if the caller stops early.
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+async def _call_async(fn, item_id):
+    try:
+        return BatchResult(item_id, await fn(item_id), None)
+    except Exception as e:
+        return BatchResult(item_id, None, e)
+
+
+async def fan_out_async(fn, ids):
+    """Same as ``fan_out`` with ordered=True, but awaits ``fn(id)`` for
+    every ID concurrently on the running event loop.
+    """
+    import asyncio
+
+    return await asyncio.gather(*[_call_async(fn, i) for i in ids])
+
+
+async def iter_completed_async(fn, ids):
+    """Same as ``fan_out`` with ordered=False, but awaits ``fn(id)`` for
+    every ID concurrently and yields from an asynchronous iterator.
+    """
+    import asyncio
+
+    tasks = [asyncio.ensure_future(_call_async(fn, i)) for i in ids]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,220 @@
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+from pyfootball.globals import resolve_endpoint
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_LIVE_TTL = 15
+
+# Seconds each resource stays fresh, keyed on the names in globals.endpoints.
+DEFAULT_TTLS = {
+    'all_competitions': 24 * 60 * 60,
+    'competition': 60 * 60,
+    'comp_teams': 24 * 60 * 60,
+    'team': 60 * 60,
+    'player': 24 * 60 * 60,
+    'league_table': 5 * 60,
+    'fixture': 5 * 60,
+    'all_fixtures': 5 * 60,
+    'comp_fixtures': 5 * 60,
+    'team_fixtures': 5 * 60,
+    'player_matches': 60 * 60,
+}
+
+# Resources whose TTL drops to live_ttl while any of their matches is live.
+LIVE_RESOURCES = frozenset(['fixture', 'all_fixtures', 'comp_fixtures',
+                            'team_fixtures', 'player_matches'])
+LIVE_STATUSES = frozenset(['IN_PLAY', 'PAUSED'])
+
+
+def cache_key(endpoint, params=None):
+    """Returns the cache key of a request: the endpoint URL followed by its
+    query string, with the parameters sorted so that their order doesn't
+    matter.
+
+    :param endpoint: The full endpoint URL.
+    :type endpoint: string
+    :keyword params: Query string parameters.
+    :type params: dict
+
+    :returns: key: The cache key.
+    """
+    if not params:
+        return endpoint
+    separator = '&' if '?' in endpoint else '?'
+    return endpoint + separator + urlencode(sorted(params.items()))
+
+
+def is_live(data):
+    """Returns True if a fixture payload, or any fixture in a list payload,
+    is currently being played.
+
+    :param data: The decoded response body.
+    :type data: dict
+    """
+    if data.get('status') in LIVE_STATUSES:
+        return True
+    for match in data.get('matches') or ():
+        if match.get('status') in LIVE_STATUSES:
+            return True
+    return False
+
+
+def resource_ttl(key, data, ttls, live_ttl):
+    """Returns how many seconds a response body stays fresh, given the TTLs
+    per endpoint name and the TTL of fixture resources while a match is in
+    play.
+
+    :param key: The cache key.
+    :type key: string
+    :param data: The decoded response body.
+    :type data: dict
+    """
+    resource = resolve_endpoint(key)
+    if resource in LIVE_RESOURCES and is_live(data):
+        return live_ttl
+    return ttls.get(resource, 0)
+
+
+class ResponseCache(object):
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, ttls=None,
+                 live_ttl=DEFAULT_LIVE_TTL):
+        """An in-memory LRU cache of decoded response bodies, keyed on the
+        endpoint URL and its query string. How long an entry stays fresh
+        depends on the kind of resource it holds; fixture lists expire
+        after live_ttl seconds while any of their matches is in play.
+
+        Cached bodies are shared between callers, so the dicts held by the
+        model objects built from them should be treated as read-only.
+
+        :keyword max_bytes: The total size of the response bodies to keep
+            before the least recently used entries are evicted.
+        :type max_bytes: integer
+        :keyword ttls: TTLs in seconds that override ``DEFAULT_TTLS``,
+            keyed on the names in ``globals.endpoints``.
+        :type ttls: dict
+        :keyword live_ttl: The TTL of fixture resources while a match is
+            in play.
+        :type live_ttl: integer
+        """
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.live_ttl = live_ttl
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl(self, key, data):
+        """Returns how many seconds a response body stays fresh.
+
+        :param key: The cache key.
+        :type key: string
+        :param data: The decoded response body.
+        :type data: dict
+        """
+        return resource_ttl(key, data, self.ttls, self.live_ttl)
+
+    def get(self, key):
+        """Returns the cached body for a key, or None if it is missing or
+        has expired.
+
+        :param key: The cache key.
+        :type key: string
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[2] <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, data, size, fetched_at=None):
+        """Stores a response body, evicting the least recently used entries
+        if the cache grows past max_bytes. The entry expires its TTL after
+        the body was fetched, so a body taken from a DiskCache or a
+        snapshot only stays for what is left of its TTL. Bodies that have
+        already expired, with a TTL of zero, or larger than the whole
+        cache, are not stored.
+
+        :param key: The cache key.
+        :type key: string
+        :param data: The decoded response body.
+        :type data: dict
+        :param size: The size of the raw response body in bytes.
+        :type size: integer
+        :keyword fetched_at: The time, in seconds since the epoch, at which
+            the body was fetched, or None for now.
+        :type fetched_at: float
+        """
+        now = time.time()
+        if fetched_at is None:
+            fetched_at = now
+        left = fetched_at + self.ttl(key, data) - now
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if left <= 0 or size > self.max_bytes:
+                return
+            self._entries[key] = (data, size, time.monotonic() + left,
+                                  fetched_at)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def fetched_at(self, key, data):
+        """Returns the time, in seconds since the epoch, at which the body
+        cached for a key was stored, if that body is data and still fresh,
+        else None.
+
+        :param key: The cache key.
+        :type key: string
+        :param data: A decoded response body.
+        :type data: dict
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry[0] is not data or \
+                entry[2] <= time.monotonic():
+            return None
+        return entry[3]
+
+    def bodies(self):
+        """Returns every fresh cached body, without counting hits or
+        changing the order of eviction."""
+        return [data for key, data in self.items()]
+
+    def items(self):
+        """Same as ``bodies``, but returns ``(key, body)`` tuples."""
+        now = time.monotonic()
+        with self._lock:
+            return [(key, entry[0]) for key, entry in self._entries.items()
+                    if entry[2] > now]
+
+    def _remove(self, key):
+        data, size, expires, fetched_at = self._entries.pop(key)
+        self.size -= size
+
+    def clear(self):
+        """Removes every entry and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.size = self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Returns a dict of the cache's counters and current size."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'entries': len(self._entries),
+                'bytes': self.size}
@@ -0,0 +1,86 @@
+import socket
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.util.connection import allowed_gai_family
+
+from pyfootball.instrumentation import _connecting
+
+# Imported by Transport.session, so that requests is only imported once a
+# client sends its first request.
+
+
+class _TimedConnection(object):
+    # Resolves the host once, timing the lookup, and connects to the
+    # addresses it returned, recording both on the record of the request
+    # being sent on this thread.
+
+    def _new_conn(self):
+        record = getattr(_connecting, 'record', None)
+        if record is None:
+            return super(_TimedConnection, self)._new_conn()
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(host.strip('[]'), self.port,
+                                           allowed_gai_family(),
+                                           socket.SOCK_STREAM)
+        except OSError:
+            # Lets urllib3 raise its own error for the failed lookup.
+            record['dns'] = time.perf_counter() - start
+            return super(_TimedConnection, self)._new_conn()
+        record['dns'] = time.perf_counter() - start
+
+        error = None
+        for info in addresses:
+            # Connect to the resolved address, so that urllib3 doesn't
+            # look the host up again.
+            self._dns_host = info[4][0]
+            try:
+                return super(_TimedConnection, self)._new_conn()
+            except ConnectTimeoutError as e:
+                error = e
+            finally:
+                self._dns_host = host
+        if error is None:
+            return super(_TimedConnection, self)._new_conn()
+        raise error
+
+    def connect(self):
+        record = getattr(_connecting, 'record', None)
+        start = time.perf_counter()
+        super(_TimedConnection, self).connect()
+        if record is not None:
+            record['connect'] = time.perf_counter() - start - \
+                (record['dns'] or 0)
+
+
+class _TimedHTTPConnection(_TimedConnection, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnection, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimingAdapter(HTTPAdapter):
+    """An HTTPAdapter whose new connections record the time spent on DNS
+    and connecting in the record passed to ``sending``."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(TimingAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
@@ -0,0 +1,252 @@
+import sys
+from collections import namedtuple
+from datetime import datetime
+from functools import lru_cache
+
+DEFAULT_TIMESTAMP_CACHE_SIZE = 4096
+DEFAULT_SHARED_VALUES = 65536
+
+_REQUIRED = object()
+
+
+@lru_cache(maxsize=DEFAULT_TIMESTAMP_CACHE_SIZE)
+def parse_datetime(value):
+    """Parses an API timestamp, either ``YYYY-MM-DDTHH:MM:SSZ`` or
+    ``YYYY-MM-DD``, into a naive datetime. Results are cached, since the
+    same timestamps, like the kickoff times of a matchday, repeat across a
+    response. Raises a ValueError for any other format.
+
+    :param value: The timestamp.
+    :type value: string
+    """
+    try:
+        if len(value) == 20 and value[10] == 'T' and value[19] == 'Z' \
+                and value[13] == value[16] == ':':
+            return datetime(int(value[0:4]), int(value[5:7]),
+                            int(value[8:10]), int(value[11:13]),
+                            int(value[14:16]), int(value[17:19]))
+        if len(value) == 10 and value[4] == value[7] == '-':
+            return datetime(int(value[0:4]), int(value[5:7]),
+                            int(value[8:10]))
+    except ValueError:
+        pass
+    # Let strptime produce the same error as before.
+    fmt = '%Y-%m-%d' if len(value) <= 10 else '%Y-%m-%dT%H:%M:%SZ'
+    return datetime.strptime(value, fmt)
+
+
+@lru_cache(maxsize=DEFAULT_TIMESTAMP_CACHE_SIZE)
+def parse_date(value):
+    """Same as ``parse_datetime``, but returns a date."""
+    return parse_datetime(value).date()
+
+
+class SharedValues(object):
+    def __init__(self, max_entries=DEFAULT_SHARED_VALUES):
+        """An interning table for the sub-objects that repeat across many
+        models: the area, competition, season and team dicts of every
+        fixture in a season. ``share`` returns one canonical dict for each
+        of them, keyed on its ``id``, so the duplicates can be freed.
+        Strings are interned; other values, such as scores and referee
+        lists, rarely repeat and are left alone.
+
+        Shared values are seen by every model that holds them and must be
+        treated as read-only.
+
+        :keyword max_entries: The number of distinct values kept before
+            the table is emptied and starts over.
+        :type max_entries: integer
+        """
+        self.max_entries = max_entries
+        self._values = {}
+
+    def __len__(self):
+        return len(self._values)
+
+    def share(self, value):
+        """Returns the canonical object equal to value: an interned string,
+        or the dict stored for its type and ``id`` if that is equal to it.
+        Other values are returned as they are.
+        """
+        if isinstance(value, str):
+            return sys.intern(value)
+        if not isinstance(value, dict):
+            return value
+        entity_id = value.get('id')
+        if not isinstance(entity_id, int):
+            return value
+        # Keeps interned TeamRef objects apart from equal plain dicts.
+        key = type(value), entity_id
+        shared = self._values.get(key)
+        if shared is not None:
+            if shared == value:
+                return shared
+            # The entity changed, e.g. a season's current matchday; later
+            # models share the new version.
+            self._values[key] = value
+            return value
+        if len(self._values) >= self.max_entries:
+            self._values.clear()
+        # Atomic, so threads sharing equal values at the same time all get
+        # the one stored first, without a lock that every thread building
+        # models would wait on.
+        shared = self._values.setdefault(key, value)
+        return shared if shared == value else value
+
+    def clear(self):
+        """Forgets every shared value."""
+        self._values.clear()
+
+
+shared_values = SharedValues()
+share = shared_values.share
+
+
+class Field(namedtuple('Field', ['attr', 'key', 'convert', 'default'])):
+    """Declares how one attribute of a model is read from its JSON data.
+
+    :param attr: The attribute name.
+    :type attr: string
+    :keyword key: The key in the data, or a dotted path into nested dicts
+        such as ``homeTeam.id``. Defaults to attr.
+    :type key: string
+    :keyword convert: A function applied to the value, unless it is None.
+    :type convert: callable
+    :keyword default: The value used when the key is missing. If it isn't
+        given, the key is required and a missing one raises a KeyError.
+    """
+    __slots__ = ()
+
+    def __new__(cls, attr, key=None, convert=None, default=_REQUIRED):
+        return super(Field, cls).__new__(cls, attr, key or attr, convert,
+                                         default)
+
+
+def compile_decoder(fields, name='decode'):
+    """Compiles a list of Fields into a function ``decode(obj, data)`` that
+    sets every attribute on obj with straight-line code: nested dicts are
+    looked up once and shared by the fields that read from them, and there
+    is no per-field loop or dispatch at decode time.
+
+    :param fields: The fields to decode.
+    :type fields: list
+    :keyword name: The name of the compiled function, shown in tracebacks.
+    :type name: string
+
+    :returns: decode: The decoder function.
+    """
+    namespace = {}
+    lines = ['def {}(obj, data):'.format(name)]
+    parents = {(): 'data'}
+
+    def lookup(path):
+        # Returns the expression of the dict at path, binding a local
+        # variable the first time it is needed.
+        if path not in parents:
+            parent = lookup(path[:-1])
+            var = '_' + '_'.join(path)
+            lines.append('    {} = {}[{!r}]'.format(var, parent, path[-1]))
+            parents[path] = var
+        return parents[path]
+
+    for i, field in enumerate(fields):
+        path = tuple(field.key.split('.'))
+        parent = lookup(path[:-1])
+        if field.default is _REQUIRED:
+            value = '{}[{!r}]'.format(parent, path[-1])
+        else:
+            namespace['_default{}'.format(i)] = field.default
+            value = '{}.get({!r}, _default{})'.format(parent, path[-1], i)
+        if field.convert is not None:
+            namespace['_convert{}'.format(i)] = field.convert
+            lines.append('    value = {}'.format(value))
+            value = '_convert{}(value) if value is not None else None' \
+                .format(i)
+        lines.append('    obj.{} = {}'.format(field.attr, value))
+    if len(lines) == 1:
+        lines.append('    pass')
+
+    exec(compile('\n'.join(lines), '<{}>'.format(name), 'exec'), namespace)
+    return namespace[name]
+
+
+def shared_fields(fields, attrs):
+    """Returns a copy of a field list in which the values of the named
+    attributes are passed through ``share``, for the compact variants of
+    the models.
+
+    :param fields: The fields of the regular model.
+    :type fields: list
+    :param attrs: The names of the attributes to share.
+    :type attrs: iterable
+
+    :returns: fields: The new list of fields.
+    """
+    attrs = set(attrs)
+    return [field._replace(convert=share) if field.attr in attrs else field
+            for field in fields]
+
+
+def compile_getter(field):
+    """Compiles a Field into a function ``get(obj)`` that decodes its value
+    from the raw dict stored in ``obj._data``.
+
+    :param field: The field to decode.
+    :type field: Field
+
+    :returns: get: The getter function.
+    """
+    namespace = {'_default': field.default, '_convert': field.convert}
+    path = field.key.split('.')
+    value = 'obj._data' + ''.join('[{!r}]'.format(key) for key in path[:-1])
+    if field.default is _REQUIRED:
+        value += '[{!r}]'.format(path[-1])
+    else:
+        value += '.get({!r}, _default)'.format(path[-1])
+    lines = ['def get_{}(obj):'.format(field.attr),
+             '    value = {}'.format(value)]
+    if field.convert is None:
+        lines.append('    return value')
+    else:
+        lines.append('    return _convert(value) if value is not None '
+                     'else None')
+    exec(compile('\n'.join(lines), '<get_{}>'.format(field.attr), 'exec'),
+         namespace)
+    return namespace['get_' + field.attr]
+
+
+class LazyAttribute(object):
+    def __init__(self, name, fn):
+        """A descriptor that computes an attribute with ``fn(obj)`` the
+        first time it is read, and stores the result in the instance's
+        ``__dict__`` so that later reads are plain attribute lookups.
+
+        :param name: The attribute name.
+        :type name: string
+        :param fn: The function that computes the value.
+        :type fn: callable
+        """
+        self.name = name
+        self.fn = fn
+        self.__doc__ = getattr(fn, '__doc__', None)
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+        value = obj.__dict__[self.name] = self.fn(obj)
+        return value
+
+
+def lazy_fields(fields):
+    """A class decorator that adds a LazyAttribute for each Field, decoded
+    from ``self._data``, for the lazy variants of the models.
+
+    :param fields: The fields to decode.
+    :type fields: list
+    """
+    def decorate(cls):
+        for field in fields:
+            setattr(cls, field.attr,
+                    LazyAttribute(field.attr, compile_getter(field)))
+        return cls
+    return decorate
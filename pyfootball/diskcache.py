@@ -0,0 +1,269 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from requests.structures import CaseInsensitiveDict
+
+from pyfootball.cache import DEFAULT_TTLS, DEFAULT_LIVE_TTL, LIVE_RESOURCES, \
+    is_live
+from pyfootball.globals import resolve_endpoint
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'pyfootball')
+DEFAULT_DECODED_ENTRIES = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    headers TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    live INTEGER NOT NULL,
+    version TEXT NOT NULL
+)
+"""
+
+CacheEntry = namedtuple('CacheEntry',
+                        ['body', 'headers', 'fetched_at', 'live', 'version'])
+
+
+def payload_version(data, body):
+    """Returns a fingerprint of a response body built from its
+    ``lastUpdated`` fields, including those of the items in its top-level
+    lists, so that two bodies with the same fingerprint hold the same data.
+    Bodies without any ``lastUpdated`` field fall back to a hash of the raw
+    body.
+
+    :param data: The decoded response body.
+    :type data: dict
+    :param body: The raw response body.
+    :type body: bytes
+    """
+    stamps = [data.get('lastUpdated')]
+    for value in data.values():
+        if isinstance(value, list):
+            stamps.extend(item.get('lastUpdated') for item in value
+                          if isinstance(item, dict))
+    if not any(stamps):
+        return hashlib.sha1(body).hexdigest()
+    return hashlib.sha1('|'.join(map(str, stamps)).encode()).hexdigest()
+
+
+class DiskCache(object):
+    def __init__(self, path=DEFAULT_PATH, ttls=None,
+                 live_ttl=DEFAULT_LIVE_TTL,
+                 decoded_entries=DEFAULT_DECODED_ENTRIES):
+        """A persistent cache of raw response bodies, their headers and the
+        time they were fetched, stored in an SQLite database in the given
+        directory. It survives restarts and can be shared by several
+        processes on the same host.
+
+        Fresh entries are served without a request. Stale entries are
+        revalidated: the request carries ``If-None-Match`` and
+        ``If-Modified-Since`` when the stored response had an ``ETag`` or
+        ``Last-Modified`` header, and a full response whose ``lastUpdated``
+        fields match the stored ones is treated like a 304. Either way the
+        previously decoded body is returned, so that the model objects
+        built from it aren't rebuilt.
+
+        :keyword path: The directory that holds the database.
+        :type path: string
+        :keyword ttls: See ResponseCache.
+        :type ttls: dict
+        :keyword live_ttl: See ResponseCache.
+        :type live_ttl: integer
+        :keyword decoded_entries: The number of decoded bodies kept in
+            memory for reuse.
+        :type decoded_entries: integer
+        """
+        os.makedirs(path, exist_ok=True)
+        self.path = os.path.join(path, 'responses.sqlite3')
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.live_ttl = live_ttl
+        self.decoded_entries = decoded_entries
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._decoded = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self):
+        # sqlite3 connections can't be shared across threads or forks.
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30,
+                                   isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        """Returns the stored CacheEntry for a key, fresh or not, or None.
+
+        :param key: The cache key.
+        :type key: string
+        """
+        row = self._connect().execute(
+            'SELECT body, headers, fetched_at, live, version FROM responses '
+            'WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        body, headers, fetched_at, live, version = row
+        headers = CaseInsensitiveDict(json.loads(headers))
+        return CacheEntry(bytes(body), headers, fetched_at, bool(live),
+                          version)
+
+    def ttl(self, key, entry):
+        """Returns how many seconds an entry stays fresh.
+
+        :param key: The cache key.
+        :type key: string
+        :param entry: The stored entry.
+        :type entry: CacheEntry
+        """
+        if entry.live:
+            return self.live_ttl
+        return self.ttls.get(resolve_endpoint(key), 0)
+
+    def decode(self, key, entry):
+        """Returns the decoded body of an entry, reusing the object decoded
+        for the same key and version earlier in this process."""
+        with self._lock:
+            decoded = self._decoded.get(key)
+            if decoded is not None and decoded[0] == entry.version:
+                self._decoded.move_to_end(key)
+                return decoded[1]
+        data = json.loads(entry.body)
+        self._remember(key, entry.version, data)
+        return data
+
+    def fetched_at(self, key, data):
+        """Returns the time, in seconds since the epoch, at which the body
+        stored for a key was fetched or last revalidated, if data was
+        decoded from it, else None.
+
+        :param key: The cache key.
+        :type key: string
+        :param data: A decoded response body.
+        :type data: dict
+        """
+        with self._lock:
+            decoded = self._decoded.get(key)
+        if decoded is None or decoded[1] is not data:
+            return None
+        entry = self.get(key)
+        if entry is None or entry.version != decoded[0]:
+            return None
+        return entry.fetched_at
+
+    def _remember(self, key, version, data):
+        with self._lock:
+            self._decoded[key] = (version, data)
+            self._decoded.move_to_end(key)
+            while len(self._decoded) > self.decoded_entries:
+                self._decoded.popitem(last=False)
+
+    def lookup(self, key):
+        """Looks a key up before a request is sent.
+
+        :param key: The cache key.
+        :type key: string
+
+        :returns: (data, headers, entry): The decoded body if the entry is
+            fresh, else None; the conditional headers to send with the
+            request; and the stored entry, if any.
+        """
+        entry = self.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, None, None
+        if time.time() < entry.fetched_at + self.ttl(key, entry):
+            self.hits += 1
+            return self.decode(key, entry), None, entry
+
+        headers = {}
+        if 'ETag' in entry.headers:
+            headers['If-None-Match'] = entry.headers['ETag']
+        if 'Last-Modified' in entry.headers:
+            headers['If-Modified-Since'] = entry.headers['Last-Modified']
+        return None, headers, entry
+
+    def resolve(self, key, entry, status_code, body, headers):
+        """Turns the response to a request made after ``lookup`` into a
+        decoded body, storing it or refreshing the stored entry.
+
+        :param key: The cache key.
+        :type key: string
+        :param entry: The entry returned by ``lookup``.
+        :type entry: CacheEntry
+        :param status_code: The response status code.
+        :type status_code: integer
+        :param body: The raw response body.
+        :type body: bytes
+        :param headers: The response headers.
+        :type headers: dict
+
+        :returns: (data, reused): The decoded body, and whether it is the
+            stored entry's, because the response was a 304 or held the same
+            version of the data.
+        """
+        if entry is not None and status_code == 304:
+            self.revalidations += 1
+            self._touch(key)
+            return self.decode(key, entry), True
+
+        data = json.loads(body)
+        version = payload_version(data, body)
+        if entry is not None and entry.version == version:
+            self.revalidations += 1
+            self._touch(key)
+            return self.decode(key, entry), True
+
+        self.set(key, data, body, headers, version)
+        return data, False
+
+    def set(self, key, data, body, headers, version=None):
+        """Stores a response body.
+
+        :param key: The cache key.
+        :type key: string
+        :param data: The decoded response body.
+        :type data: dict
+        :param body: The raw response body.
+        :type body: bytes
+        :param headers: The response headers.
+        :type headers: dict
+        """
+        if version is None:
+            version = payload_version(data, body)
+        live = resolve_endpoint(key) in LIVE_RESOURCES and is_live(data)
+        self._connect().execute(
+            'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+            (key, body, json.dumps(dict(headers)), time.time(), live,
+             version))
+        self._remember(key, version, data)
+
+    def _touch(self, key):
+        self._connect().execute(
+            'UPDATE responses SET fetched_at = ? WHERE key = ?',
+            (time.time(), key))
+
+    def clear(self):
+        """Removes every stored response."""
+        self._connect().execute('DELETE FROM responses')
+        with self._lock:
+            self._decoded.clear()
+
+    def stats(self):
+        """Returns a dict of the cache's counters and number of entries."""
+        entries = self._connect().execute(
+            'SELECT COUNT(*) FROM responses').fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses,
+                'revalidations': self.revalidations, 'entries': entries}
@@ -1,51 +1,205 @@
 import datetime
+import functools
 
-import requests
 import os
 
-import globals
-from globals import endpoints
-from models.competition import Competition
-from models.team import Team
-from models.fixture import Fixture
-from models.standings import Standings
-from models.player import Player
+from pyfootball.globals import endpoints
+from pyfootball.models.competition import Competition, LazyCompetition
+from pyfootball.models.team import Team, LazyTeam
+from pyfootball.models.fixture import Fixture, CompactFixture, LazyFixture
+from pyfootball.models.standings import Standings, CompactStandings, \
+    LazyStandings
+from pyfootball.models.player import Player, CompactPlayer, LazyPlayer
+from pyfootball.transport import Transport, DEFAULT_POOL_SIZE, \
+    DEFAULT_TIMEOUT, fetch_models, iter_models
+from pyfootball.batch import fan_out
+from pyfootball.live import Poller, DEFAULT_LIVE_INTERVAL, \
+    DEFAULT_IDLE_INTERVAL
+from pyfootball.ratelimit import default_limiter
+from pyfootball.cache import ResponseCache
+from pyfootball.identity import IdentityMap
+from pyfootball.keypool import KeyPool
+
+# The kinds of model objects a client can build, for its models kwarg.
+MODEL_CLASSES = {
+    None: {},
+    'compact': {Fixture: CompactFixture, Player: CompactPlayer,
+                Standings: CompactStandings},
+    'lazy': {Fixture: LazyFixture, Player: LazyPlayer,
+             Standings: LazyStandings, Competition: LazyCompetition,
+             Team: LazyTeam},
+}
+
+
+def get_api_key(api_key=None):
+    """Returns api_key if it is given, otherwise the value of the
+    ``PYFOOTBALL_API_KEY`` envvar. Raises a ValueError if neither is set.
+    """
+    if api_key:
+        return api_key
+    elif os.getenv('PYFOOTBALL_API_KEY', None):
+        return os.getenv('PYFOOTBALL_API_KEY')
+    else:
+        raise ValueError("Couldn't find an API key in the keyword " +
+                         "argument api_key nor the environmental " +
+                         "variable PYFOOTBALL_API_KEY.")
+
+
+def get_key_pool(api_key):
+    """Returns a KeyPool of the keys if api_key is a list of them, the
+    KeyPool itself if it is one, or None for a single key.
+    """
+    if isinstance(api_key, KeyPool):
+        return api_key
+    if isinstance(api_key, (list, tuple)):
+        return KeyPool(api_key)
+    return None
+
+
+def get_model_classes(models=None):
+    """Returns the ``Transport.model_classes`` for one of the kinds of
+    model objects in ``MODEL_CLASSES``. Raises a ValueError for an unknown
+    kind.
+    """
+    if models not in MODEL_CLASSES:
+        kinds = sorted(kind for kind in MODEL_CLASSES if kind)
+        raise ValueError("Unknown kind of models {!r}; expected None or "
+                         "one of {}.".format(models, kinds))
+    return MODEL_CLASSES[models]
 
 
 class Football(object):
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, pool_size=DEFAULT_POOL_SIZE,
+                 timeout=DEFAULT_TIMEOUT, headers=None, transport=None,
+                 rate_limiter=default_limiter, cache=None, disk_cache=None,
+                 single_flight=True, models=None, identity_map=None,
+                 snapshot=None, hooks=None, lazy=False):
         """Takes either an api_key as a keyword argument or tries to access
         an environmental variable ``PYFOOTBALL_API_KEY``, then uses the key to
         send a test request to make sure that it's valid. The api_key
         kwarg takes precedence over the envvar.
 
-        Sends one request to api.football-data.org.
-
-        :keyword api_key: The user's football-data.org API key.
-        :type api_key: string
+        Every request, including those sent by the Competition and Team
+        objects returned from this instance, goes through a single pooled
+        Transport so that open connections are reused. The Transport holds
+        the instance's API key and headers, so several instances with
+        different keys can be used side by side, from any number of
+        threads.
+
+        Sends one request to api.football-data.org, unless the snapshot
+        holds a fresh list of competitions or lazy is True.
+
+        :keyword api_key: The user's football-data.org API key, or a list
+            of keys, or a KeyPool of them, to spread requests over.
+        :type api_key: string, list or KeyPool
+        :keyword pool_size: The number of keep-alive connections to pool.
+        :type pool_size: integer
+        :keyword timeout: Seconds to wait for the server, either a single
+            number or a ``(connect, read)`` tuple.
+        :type timeout: float or tuple
+        :keyword headers: Extra headers to send with every request.
+        :type headers: dict
+        :keyword transport: A Transport object to use instead of creating
+            one; the keyword arguments below other than headers are ignored
+            when it is given. The key and headers are set on it, so it
+            shouldn't be shared with a client that uses another key.
+        :type transport: Transport
+        :keyword rate_limiter: The RateLimiter that spaces requests so the
+            API's per-minute quota is never exceeded. It is shared by every
+            instance by default; None disables it.
+        :type rate_limiter: RateLimiter
+        :keyword cache: A ResponseCache for responses, or True to create one
+            with the default TTLs. Responses aren't cached by default.
+        :type cache: ResponseCache or bool
+        :keyword disk_cache: A DiskCache that keeps responses across
+            restarts, or a directory path to create one in.
+        :type disk_cache: DiskCache or string
+        :keyword single_flight: Whether concurrent calls for the same
+            resource share one request.
+        :type single_flight: bool
+        :keyword models: The kind of model objects to build: None for the
+            regular ones, or ``'compact'`` for ``__slots__`` variants of
+            Fixture, Player and Standings that share repeated sub-objects
+            and take a fraction of the memory, or ``'lazy'`` for variants
+            of every model that decode each attribute on first access.
+        :type models: string
+        :keyword identity_map: An IdentityMap, or True to create one, that
+            makes every model built by this client share one object for
+            each team, competition, area and season; the team dicts of
+            fixtures, table entries and players become TeamRef objects.
+            Useful with any kind of models to shrink large fixture lists.
+        :type identity_map: IdentityMap or bool
+        :keyword snapshot: A Snapshot, or the path of a snapshot file to
+            open, written by ``save_snapshot``. Fresh bodies are read from
+            it instead of being requested.
+        :type snapshot: Snapshot or string
+        :keyword hooks: Callables passed a RequestRecord for every call the
+            client serves, with its timings, size and cache outcome, such
+            as a HistogramExporter or PrometheusExporter.
+        :type hooks: list
+        :keyword lazy: Whether to skip the test request, e.g. for short-lived
+            processes; an invalid key then makes the first call raise an
+            ``HTTPError`` instead. ``validate`` sends it on demand.
+        :type lazy: bool
         """
-        if api_key:
-            key = api_key
-        elif os.getenv('PYFOOTBALL_API_KEY', None):
-            key = os.getenv('PYFOOTBALL_API_KEY')
-        else:
-            raise ValueError("Couldn't find an API key in the keyword " +
-                             "argument api_key nor the environmental " +
-                             "variable PYFOOTBALL_API_KEY.")
-
-        endpoint = endpoints['all_competitions']
-        globals.headers = {'X-Auth-Token': key}
-        r = requests.get(endpoint, headers=globals.headers)
-        globals.update_prev_response(r, endpoint)
-        r.raise_for_status()
-        globals.api_key = key
+        key_pool = get_key_pool(api_key)
+        key = key_pool.keys[0] if key_pool else get_api_key(api_key)
+        model_classes = get_model_classes(models)
+
+        if cache is True:
+            cache = ResponseCache()
+        if isinstance(disk_cache, str):
+            from pyfootball.diskcache import DiskCache
+            disk_cache = DiskCache(disk_cache)
+        if identity_map is True:
+            identity_map = IdentityMap()
+        if isinstance(snapshot, str):
+            from pyfootball.snapshot import Snapshot
+            snapshot = Snapshot(snapshot)
+        if transport is None:
+            transport = Transport(pool_size=pool_size, timeout=timeout,
+                                  rate_limiter=rate_limiter, cache=cache,
+                                  disk_cache=disk_cache,
+                                  single_flight=single_flight,
+                                  model_classes=model_classes,
+                                  identity_map=identity_map,
+                                  snapshot=snapshot, hooks=hooks)
+        transport.headers = dict(transport.headers or {})
+        transport.headers.update(headers or {})
+        transport.headers['X-Auth-Token'] = key
+        if key_pool is not None:
+            transport.key_pool = key_pool
+        self._transport = transport
+        if not lazy:
+            self.validate()
+
+    def validate(self):
+        """Sends a test request to make sure that the API key is valid.
+        Raises an ``HTTPError`` if it isn't.
+
+        Sends one request to api.football-data.org, unless the snapshot
+        holds a fresh list of competitions.
+        """
+        snapshot = self._transport.snapshot
+        if snapshot is None or \
+                snapshot.get_fresh(endpoints['all_competitions']) is None:
+            self._transport.get(endpoints['all_competitions'])
+
+    @property
+    def transport(self):
+        """The Transport shared by this client and the objects it returns,
+        which exposes the rate limiter, caches and single-flight counters.
+        """
+        return self._transport
 
     def get_prev_response(self):
-        """Returns information about the most recent response.
+        """Returns the headers of the most recent response received by this
+        client on the current thread, with its ``Status-Code`` and
+        ``Endpoint``, or an empty dict if this thread hasn't received one.
 
         :returns: prev_response: Information about the most recent response.
         """
-        return globals.prev_response
+        return self._transport.instrumentation.last_response()
 
     def get_competition(self, comp_id):
         """Returns a Competition object associated with the competition ID.
@@ -58,11 +212,7 @@ class Football(object):
         :returns: Competition: The Competition object.
         """
         endpoint = endpoints['competition'].format(comp_id)
-        r = requests.get(endpoint, headers=globals.headers)
-        globals.update_prev_response(r, endpoint)
-        r.raise_for_status()
-
-        return Competition(r.json())
+        return fetch_models(self._transport, endpoint, Competition, bind=True)
 
     def get_all_competitions(self):
         """Returns a list of Competition objects representing the current
@@ -73,15 +223,8 @@ class Football(object):
         :returns: comp_list: List of Competition objects.
         """
         endpoint = endpoints['all_competitions']
-        r = requests.get(endpoint, headers=globals.headers)
-        globals.update_prev_response(r, endpoint)
-        r.raise_for_status()
-
-        data = r.json()
-        comp_list = []
-        for comp in data['competitions']:
-            comp_list.append(Competition(comp))
-        return comp_list
+        return fetch_models(self._transport, endpoint, Competition,
+                            'competitions', bind=True)
 
     def get_league_table(self, comp_id):
         """Given a competition ID, returns a LeagueTable object for the
@@ -95,14 +238,9 @@ class Football(object):
         :returns: LeagueTable: A LeagueTable object.
         """
         endpoint = endpoints['league_table'].format(comp_id)
-        r = requests.get(endpoint, headers=globals.headers)
-        globals.update_prev_response(r, endpoint)
-        r.raise_for_status()
-        data = r.json()
-
-        return Standings(data)
+        return fetch_models(self._transport, endpoint, Standings)
 
-    def get_comp_fixtures(self, comp_id):
+    def get_comp_fixtures(self, comp_id, as_frame=False):
         """Given an ID, returns a list of Fixture objects associated with the
         given competition, for the current season.
 
@@ -110,19 +248,32 @@ class Football(object):
 
         :param comp_id: The competition ID.
         :type comp_id: integer
+        :keyword as_frame: Whether to return a FixtureFrame instead of a
+            list. Requires numpy.
+        :type as_frame: bool
 
         :returns: fixture_list: A list of Fixture objects.
         """
         endpoint = endpoints['comp_fixtures'].format(comp_id)
-        r = requests.get(endpoint, headers=globals.headers)
-        globals.update_prev_response(r, endpoint)
-        r.raise_for_status()
+        if as_frame:
+            from pyfootball.frame import fetch_frame
+            return fetch_frame(self._transport, endpoint)
+        return fetch_models(self._transport, endpoint, Fixture, 'matches')
+
+    def iter_comp_fixtures(self, comp_id):
+        """Same as ``get_comp_fixtures``, but yields the Fixture objects one
+        at a time while the response is streamed, so that memory use stays
+        flat however many fixtures there are.
+
+        Sends one request to api.football-data.org.
+
+        :param comp_id: The competition ID.
+        :type comp_id: integer
 
-        data = r.json()
-        fixture_list = []
-        for fixture in data['matches']:
-            fixture_list.append(Fixture(fixture))
-        return fixture_list
+        :returns: fixture_iter: An iterator of Fixture objects.
+        """
+        endpoint = endpoints['comp_fixtures'].format(comp_id)
+        return iter_models(self._transport, endpoint, Fixture, 'matches')
 
     def get_competition_teams(self, comp_id):
         """Given an ID, returns a list of Team objects associated with the
@@ -136,15 +287,8 @@ class Football(object):
         :returns: team_list: A list of Team objects.
         """
         endpoint = endpoints['comp_teams'].format(comp_id)
-        r = requests.get(endpoint, headers=globals.headers)
-        globals.update_prev_response(r, endpoint)
-        r.raise_for_status()
-
-        data = r.json()
-        team_list = []
-        for tm in data['teams']:
-            team_list.append(Team(tm))
-        return team_list
+        return fetch_models(self._transport, endpoint, Team,
+                            'teams', bind=True)
 
     def get_fixture(self, fixture_id):
         """Returns a Fixture object associated with the given ID. The response
@@ -159,31 +303,38 @@ class Football(object):
         :returns: Fixture: A Fixture object.
         """
         endpoint = endpoints['fixture'].format(fixture_id)
-        r = requests.get(endpoint, headers=globals.headers)
-        globals.update_prev_response(r, endpoint)
-        r.raise_for_status()
-        data = r.json()
-        return Fixture(data)
+        return fetch_models(self._transport, endpoint, Fixture)
 
-    def get_all_fixtures(self):
+    def get_all_fixtures(self, as_frame=False):
         """Returns a list of all Fixture objects in the specified time frame.
         Defaults to the next 7 days or "n7". TODO: Include timeFrameStart
         and timeFrameEnd, and filter for specifying time frame.
 
         Sends one request to api.football-data.org.
 
+        :keyword as_frame: Whether to return a FixtureFrame instead of a
+            list. Requires numpy.
+        :type as_frame: bool
+
         :returns: fixture_list: A list of Fixture objects.
         """
         endpoint = endpoints['all_fixtures']
-        r = requests.get(endpoint, headers=globals.headers)
-        globals.update_prev_response(r, endpoint)
-        r.raise_for_status()
+        if as_frame:
+            from pyfootball.frame import fetch_frame
+            return fetch_frame(self._transport, endpoint)
+        return fetch_models(self._transport, endpoint, Fixture, 'matches')
+
+    def iter_all_fixtures(self):
+        """Same as ``get_all_fixtures``, but yields the Fixture objects one
+        at a time while the response is streamed, so that memory use stays
+        flat however many fixtures there are.
 
-        data = r.json()
-        fixture_list = []
-        for fixture in data['matches']:
-            fixture_list.append(Fixture(fixture))
-        return fixture_list
+        Sends one request to api.football-data.org.
+
+        :returns: fixture_iter: An iterator of Fixture objects.
+        """
+        endpoint = endpoints['all_fixtures']
+        return iter_models(self._transport, endpoint, Fixture, 'matches')
 
     def get_team(self, team_id):
         """Given an ID, returns a Team object for the team associated with
@@ -197,11 +348,7 @@ class Football(object):
         :returns: Team: A Team object.
         """
         endpoint = endpoints['team'].format(team_id)
-        r = requests.get(endpoint, headers=globals.headers)
-        globals.update_prev_response(r, endpoint)
-        r.raise_for_status()
-
-        return Team(r.json())
+        return fetch_models(self._transport, endpoint, Team, bind=True)
 
     def get_team_players(self, team_id):
         """Given a team ID, returns a list of Player objects associated
@@ -215,17 +362,9 @@ class Football(object):
         :returns: player_list: A list of Player objects in the specified team.
         """
         endpoint = endpoints['team'].format(team_id)
-        r = requests.get(endpoint, headers=globals.headers)
-        globals.update_prev_response(r, endpoint)
-        r.raise_for_status()
-
-        data = r.json()
-        player_list = []
-        for player in data['squad']:
-            player_list.append(Player(player))
-        return player_list
+        return fetch_models(self._transport, endpoint, Player, 'squad')
 
-    def get_team_fixtures(self, team_id):
+    def get_team_fixtures(self, team_id, as_frame=False):
         """Given a team ID, returns a list of Fixture objects associated
         with the team.
 
@@ -233,19 +372,32 @@ class Football(object):
 
         :param team_id: The team ID.
         :type team_id: integer
+        :keyword as_frame: Whether to return a FixtureFrame instead of a
+            list. Requires numpy.
+        :type as_frame: bool
 
         :returns: fixture_list: A list of Fixture objects for the team.
         """
         endpoint = endpoints['team_fixtures'].format(team_id)
-        r = requests.get(endpoint, headers=globals.headers)
-        globals.update_prev_response(r, endpoint)
-        r.raise_for_status()
+        if as_frame:
+            from pyfootball.frame import fetch_frame
+            return fetch_frame(self._transport, endpoint)
+        return fetch_models(self._transport, endpoint, Fixture, 'matches')
+
+    def iter_team_fixtures(self, team_id):
+        """Same as ``get_team_fixtures``, but yields the Fixture objects one
+        at a time while the response is streamed, so that memory use stays
+        flat however many fixtures there are.
+
+        Sends one request to api.football-data.org.
 
-        data = r.json()
-        fixture_list = []
-        for fixture in data['matches']:
-            fixture_list.append(Fixture(fixture))
-        return fixture_list
+        :param team_id: The team ID.
+        :type team_id: integer
+
+        :returns: fixture_iter: An iterator of Fixture objects.
+        """
+        endpoint = endpoints['team_fixtures'].format(team_id)
+        return iter_models(self._transport, endpoint, Fixture, 'matches')
 
     def get_player(self, player_id):
         """Given a player ID, returns a Player object associated with
@@ -259,31 +411,152 @@ class Football(object):
         :return: Player: A Player object for the player.
         """
         endpoint = endpoints['player'].format(player_id)
-        r = requests.get(endpoint, headers=globals.headers)
-        globals.update_prev_response(r, endpoint)
-        r.raise_for_status()
-        data = r.json()
-
-        return Player(data)
+        return fetch_models(self._transport, endpoint, Player)
 
-    def get_player_matches(self, player_id, n_matches=15):
+    def get_player_matches(self, player_id, n_matches=15,
+                           as_frame=False):
         """Given a player_id, returns n_matches number of Fixture objects
         of which the player has played in.
 
         :param player_id: The player ID
         :param n_matches: The number of matches to receive (default 15)
+        :keyword as_frame: Whether to return a FixtureFrame instead of a
+            list. Requires numpy.
+        :type as_frame: bool
         :return: matches_list: List of Fixture objects
         """
         endpoint = endpoints['player_matches'].format(player_id) + '?limit={}'.format(n_matches)
-        r = requests.get(endpoint, headers=globals.headers)
-        globals.update_prev_response(r, endpoint)
-        r.raise_for_status()
-        data = r.json()
-
-        matches_list = []
-        for match in data['matches']:
-            matches_list.append(Fixture(match))
-        return matches_list
+        if as_frame:
+            from pyfootball.frame import fetch_frame
+            return fetch_frame(self._transport, endpoint)
+        return fetch_models(self._transport, endpoint, Fixture, 'matches')
+
+    def _fan_out(self, fn, ids, max_workers, ordered):
+        if max_workers is None:
+            max_workers = self._transport.pool_size
+        return fan_out(fn, ids, max_workers, ordered)
+
+    def get_teams(self, team_ids, max_workers=None, ordered=True):
+        """Given a list of team IDs, returns a BatchResult for each, holding
+        either its Team object or the exception raised while fetching it.
+        The requests are sent concurrently, paced by the rate limiter.
+
+        Sends one request per ID to api.football-data.org.
+
+        :param team_ids: The team IDs.
+        :type team_ids: list
+        :keyword max_workers: The number of requests sent at the same time.
+            Defaults to the Transport's pool size.
+        :type max_workers: integer
+        :keyword ordered: If True, returns a list in the order of team_ids;
+            otherwise returns an iterator that yields each result as soon
+            as it is ready.
+        :type ordered: bool
+
+        :returns: results: A list or an iterator of BatchResult objects.
+        """
+        return self._fan_out(self.get_team, team_ids, max_workers, ordered)
+
+    def get_players(self, player_ids, max_workers=None, ordered=True):
+        """Given a list of player IDs, returns a BatchResult for each,
+        holding either its Player object or the exception raised while
+        fetching it. See ``get_teams`` for the keyword arguments.
+
+        Sends one request per ID to api.football-data.org.
+
+        :param player_ids: The player IDs.
+        :type player_ids: list
+
+        :returns: results: A list or an iterator of BatchResult objects.
+        """
+        return self._fan_out(self.get_player, player_ids, max_workers,
+                             ordered)
+
+    def get_fixtures(self, fixture_ids, max_workers=None, ordered=True):
+        """Given a list of fixture IDs, returns a BatchResult for each,
+        holding either its Fixture object or the exception raised while
+        fetching it. See ``get_teams`` for the keyword arguments.
+
+        Sends one request per ID to api.football-data.org.
+
+        :param fixture_ids: The fixture IDs.
+        :type fixture_ids: list
+
+        :returns: results: A list or an iterator of BatchResult objects.
+        """
+        return self._fan_out(self.get_fixture, fixture_ids, max_workers,
+                             ordered)
+
+    def get_team_players_many(self, team_ids, max_workers=None,
+                              ordered=True):
+        """Given a list of team IDs, returns a BatchResult for each, holding
+        either the team's list of Player objects or the exception raised
+        while fetching it. See ``get_teams`` for the keyword arguments.
+
+        Sends one request per ID to api.football-data.org.
+
+        :param team_ids: The team IDs.
+        :type team_ids: list
+
+        :returns: results: A list or an iterator of BatchResult objects.
+        """
+        return self._fan_out(self.get_team_players, team_ids, max_workers,
+                             ordered)
+
+    def live_poller(self, comp_id=None, live_interval=DEFAULT_LIVE_INTERVAL,
+                    idle_interval=DEFAULT_IDLE_INTERVAL):
+        """Returns a Poller that watches ``get_all_fixtures``, or a
+        competition's fixtures, and reports kickoffs, goals, status changes
+        and full time results as LiveEvent objects. It polls every
+        live_interval seconds while a match is in play, and otherwise waits
+        until the next kickoff, for at most idle_interval seconds.
+
+        Sends one request to api.football-data.org per poll.
+
+        :keyword comp_id: The ID of a competition to watch.
+        :type comp_id: integer
+        :keyword live_interval: Seconds between polls while a match is in
+            play.
+        :type live_interval: float
+        :keyword idle_interval: The longest wait between polls.
+        :type idle_interval: float
+
+        :returns: poller: A Poller object.
+        """
+        if comp_id is None:
+            fetch = self.get_all_fixtures
+        else:
+            fetch = functools.partial(self.get_comp_fixtures, comp_id)
+        return Poller(fetch, live_interval, idle_interval)
+
+    def save_snapshot(self, path, comp_ids=()):
+        """Writes a snapshot file of the list of competitions, everything
+        held for the given competitions, and every other fresh body in the
+        response cache and in the snapshot this client was created with, to
+        be loaded with the snapshot kwarg, e.g. by a worker that should
+        start without sending any requests.
+
+        Sends one request to api.football-data.org for each resource that
+        isn't cached.
+
+        :param path: The file to write.
+        :type path: string
+        :keyword comp_ids: The IDs of the competitions whose teams, fixtures
+            and league table to include.
+        :type comp_ids: list
+        """
+        from pyfootball.snapshot import save_snapshot, competition_keys
+
+        transport = self._transport
+        keys = [endpoints['all_competitions']]
+        for comp_id in comp_ids:
+            keys.extend(competition_keys(comp_id))
+        if transport.cache is not None:
+            keys.extend(key for key, data in transport.cache.items())
+        if transport.snapshot is not None:
+            keys.extend(key for key in transport.snapshot.keys()
+                        if transport.snapshot.get_fresh(key) is not None)
+        save_snapshot(transport, path, list(dict.fromkeys(keys)))
 
 
 if __name__ == '__main__':
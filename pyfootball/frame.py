@@ -0,0 +1,304 @@
+from pyfootball.transport import fetch_json, fetch_json_async, \
+    timed_build, _resolve
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# The API's match statuses, in the order of their codes in the status column.
+STATUSES = ['SCHEDULED', 'TIMED', 'IN_PLAY', 'PAUSED', 'EXTRA_TIME',
+            'PENALTY_SHOOTOUT', 'FINISHED', 'SUSPENDED', 'POSTPONED',
+            'CANCELLED', 'AWARDED']
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+# Stands in for a missing matchday or score.
+MISSING = -1
+
+# Column names and dtypes, in order.
+COLUMNS = [
+    ('id', 'int64'),
+    ('competition_id', 'int64'),
+    ('matchday', 'int16'),
+    ('utc_date', 'int64'),
+    ('status', 'int8'),
+    ('home_team_id', 'int64'),
+    ('away_team_id', 'int64'),
+    ('home_goals', 'int16'),
+    ('away_goals', 'int16'),
+    ('home_goals_half_time', 'int16'),
+    ('away_goals_half_time', 'int16'),
+]
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("FixtureFrame requires numpy; install it with: "
+                          "pip install numpy")
+
+
+def _goals(value):
+    return MISSING if value is None else value
+
+
+def _status_codes(statuses):
+    return [STATUS_CODES[status] for status in statuses]
+
+
+class FixtureFrame(object):
+    # Lets Transport.build share one frame between callers.
+    read_only = True
+
+    def __init__(self, columns, teams=None, meta=None):
+        """A list of fixtures stored column by column in NumPy arrays, one
+        element per fixture, so that season-wide queries run as vectorized
+        array operations instead of Python loops. Requires numpy.
+
+        The columns are listed in ``COLUMNS``. ``utc_date`` holds seconds
+        since the epoch, ``status`` holds indices into ``STATUSES``, and a
+        missing matchday or score is ``MISSING``. Columns are exposed as
+        attributes, as are ``frame['name']``.
+
+        Frames returned by slicing share their columns with this one, and
+        frames returned by a client that has a cache may be shared between
+        callers, so the columns of frames built from fixtures or JSON are
+        read-only NumPy arrays. Methods such as ``filter`` and ``sort``
+        return frames of their own.
+
+        :param columns: An array for every column in ``COLUMNS``.
+        :type columns: dict
+        :keyword teams: The team dicts of the fixtures, keyed on team ID.
+        :type teams: dict
+        :keyword meta: The ``area``, ``competition`` and ``season`` dicts of
+            the first fixture.
+        :type meta: dict
+        """
+        _require_numpy()
+        self.columns = columns
+        self.teams = teams or {}
+        self.meta = meta or {}
+
+    @classmethod
+    def from_json(cls, matches):
+        """Builds a frame straight from the ``matches`` list of a response
+        body, without building Fixture objects.
+
+        :param matches: The fixture data from the API's response.
+        :type matches: list
+        """
+        _require_numpy()
+        n = len(matches)
+        home = [m['homeTeam'] for m in matches]
+        away = [m['awayTeam'] for m in matches]
+        full_time = [m['score']['fullTime'] for m in matches]
+        half_time = [m['score']['halfTime'] for m in matches]
+        dates = np.array([m['utcDate'].rstrip('Z') for m in matches],
+                         dtype='datetime64[s]')
+        values = {
+            'id': (m['id'] for m in matches),
+            'competition_id': (m['competition']['id'] for m in matches),
+            'matchday': (_goals(m['matchday']) for m in matches),
+            'status': _status_codes(m['status'] for m in matches),
+            'home_team_id': (t['id'] for t in home),
+            'away_team_id': (t['id'] for t in away),
+            'home_goals': (_goals(s['home']) for s in full_time),
+            'away_goals': (_goals(s['away']) for s in full_time),
+            'home_goals_half_time': (_goals(s['home']) for s in half_time),
+            'away_goals_half_time': (_goals(s['away']) for s in half_time),
+        }
+        columns = {}
+        for name, dtype in COLUMNS:
+            if name == 'utc_date':
+                columns[name] = dates.astype('int64')
+            else:
+                columns[name] = np.fromiter(values[name], dtype, n)
+            # Frames may be shared between callers; see read_only.
+            columns[name].setflags(write=False)
+        teams = {t['id']: t for t in home + away}
+        meta = {}
+        if matches:
+            meta = {key: matches[0].get(key)
+                    for key in ('area', 'competition', 'season')}
+        return cls(columns, teams, meta)
+
+    @classmethod
+    def from_response(cls, data):
+        """Builds a frame from a response body with a ``matches`` list."""
+        return cls.from_json(data['matches'])
+
+    @classmethod
+    def from_fixtures(cls, fixtures):
+        """Builds a frame from Fixture objects, or any of their variants.
+
+        :param fixtures: The Fixture objects.
+        :type fixtures: list
+        """
+        _require_numpy()
+        matches = [{'id': f.id, 'area': f.area,
+                    'competition': f.competition, 'season': f.season,
+                    'matchday': f.matchday,
+                    'utcDate': f.date.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'status': f.status, 'homeTeam': f.home_team,
+                    'awayTeam': f.away_team, 'score': f.score}
+                   for f in fixtures]
+        return cls.from_json(matches)
+
+    def __len__(self):
+        return len(self.columns['id'])
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['columns'][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __getitem__(self, key):
+        """Returns a column for a column name, and a frame for a slice, a
+        boolean mask or an array of indices. Slices are zero-copy views.
+        """
+        if isinstance(key, str):
+            return self.columns[key]
+        if isinstance(key, int):
+            key = slice(key, key + 1 or None)
+        return FixtureFrame({name: column[key]
+                             for name, column in self.columns.items()},
+                            self.teams, self.meta)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def __repr__(self):
+        return '<FixtureFrame of {} fixtures>'.format(len(self))
+
+    def row(self, i):
+        """Returns the values of one fixture as a dict of Python scalars."""
+        return {name: column[i].item() for name, column in
+                self.columns.items()}
+
+    @property
+    def dates(self):
+        """The ``utc_date`` column as a zero-copy ``datetime64[s]`` view."""
+        return self.columns['utc_date'].view('datetime64[s]')
+
+    @property
+    def statuses(self):
+        """The status of every fixture as a string."""
+        return np.array(STATUSES)[self.columns['status']]
+
+    def view(self, start=None, stop=None):
+        """Returns a zero-copy frame of the fixtures between two positions.
+
+        :keyword start: The first position.
+        :type start: integer
+        :keyword stop: The position after the last.
+        :type stop: integer
+        """
+        return self[start:stop]
+
+    def filter(self, mask=None, status=None, team_id=None, matchday=None,
+               start=None, end=None):
+        """Returns a frame of the fixtures matching every given condition.
+
+        :keyword mask: A boolean array, one element per fixture.
+        :type mask: numpy.ndarray
+        :keyword status: A status, or a list of them.
+        :type status: string or list
+        :keyword team_id: The ID of a team playing either home or away.
+        :type team_id: integer
+        :keyword matchday: A matchday, or a ``(first, last)`` range.
+        :type matchday: integer or tuple
+        :keyword start: The earliest kickoff time (inclusive).
+        :type start: datetime
+        :keyword end: The latest kickoff time (exclusive).
+        :type end: datetime
+        """
+        c = self.columns
+        keep = np.ones(len(self), dtype=bool) if mask is None else mask
+        if status is not None:
+            if isinstance(status, str):
+                status = [status]
+            keep = keep & np.isin(c['status'], _status_codes(status))
+        if team_id is not None:
+            keep = keep & ((c['home_team_id'] == team_id) |
+                           (c['away_team_id'] == team_id))
+        if matchday is not None:
+            if isinstance(matchday, tuple):
+                keep = keep & (c['matchday'] >= matchday[0]) & \
+                    (c['matchday'] <= matchday[1])
+            else:
+                keep = keep & (c['matchday'] == matchday)
+        if start is not None:
+            keep = keep & (self.dates >= np.datetime64(start, 's'))
+        if end is not None:
+            keep = keep & (self.dates < np.datetime64(end, 's'))
+        return self[keep]
+
+    def sort(self, by, descending=False):
+        """Returns a frame sorted on one or more columns.
+
+        :param by: A column name, or a list of them, most significant
+            first.
+        :type by: string or list
+        :keyword descending: Whether to sort in descending order.
+        :type descending: bool
+        """
+        if isinstance(by, str):
+            by = [by]
+        order = np.lexsort([self.columns[name] for name in reversed(by)])
+        if descending:
+            order = order[::-1]
+        return self[order]
+
+    def group_by(self, by):
+        """Groups the fixtures on the values of a column.
+
+        :param by: The column name.
+        :type by: string
+
+        :returns: groups: A dict of frames keyed on the column's values. The
+            frames are zero-copy views of one sorted copy of this frame.
+        """
+        column = self.columns[by]
+        order = np.argsort(column, kind='stable')
+        ordered = self[order]
+        keys, starts = np.unique(ordered.columns[by], return_index=True)
+        stops = list(starts[1:]) + [len(self)]
+        return {key.item(): ordered[start:stop]
+                for key, start, stop in zip(keys, starts, stops)}
+
+    def count_by(self, by):
+        """Returns the number of fixtures for each value of a column, as a
+        dict."""
+        keys, counts = np.unique(self.columns[by], return_counts=True)
+        return dict(zip(keys.tolist(), counts.tolist()))
+
+    def team_name(self, team_id):
+        """Returns the name of a team in this frame."""
+        return self.teams[team_id]['name']
+
+
+def fetch_frame(transport, endpoint):
+    """Fetches a fixture list endpoint and returns it as a FixtureFrame,
+    built with ``Transport.build`` so that a cached body isn't converted
+    twice.
+
+    :param transport: The Transport to use, or None for the default one.
+    :type transport: Transport
+    :param endpoint: The full endpoint URL.
+    :type endpoint: string
+    """
+    resolved = _resolve(transport)
+    with resolved.instrumentation.request(endpoint) as record:
+        data = fetch_json(transport, endpoint)
+        return timed_build(resolved, record, endpoint, data,
+                           FixtureFrame.from_response)
+
+
+async def fetch_frame_async(transport, endpoint):
+    """Same as ``fetch_frame``, but awaitable."""
+    resolved = _resolve(transport)
+    with resolved.instrumentation.request(endpoint) as record:
+        data = await fetch_json_async(transport, endpoint)
+        return timed_build(resolved, record, endpoint, data,
+                           FixtureFrame.from_response)
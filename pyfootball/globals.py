@@ -1,6 +1,7 @@
-api_key = ""
+import re
+
+# Sent by the default Transport, which objects created without one use.
 headers = {}
-prev_response = {}
 
 _base = 'https://api.football-data.org/v4/'
 
@@ -18,17 +19,23 @@ endpoints = {
     'league_table': _base + 'competitions/{}/standings'
 }
 
+_endpoint_patterns = [
+    (name, re.compile(re.escape(url).replace(r'\{\}', '[^/?]+') + '$'))
+    for name, url in endpoints.items()
+]
+
 
-def update_prev_response(r, endpoint):
-    """ Sets the prev_response attribute to contain a dict that includes
-        the response status code and headers of the most recent HTTP
-        request.
+def resolve_endpoint(url):
+    """ Returns the name of the endpoint in ``endpoints`` that the given
+        URL was formatted from, or None if it matches none of them. Any
+        query string is ignored.
 
         Arguments:
-        r -- The response object (of the latest HTTP request).
-        endpoint -- The endpoint used (in the latest HTTP request).
+        url -- The full endpoint URL.
     """
-    global prev_response
-    prev_response = r.headers
-    prev_response['Status-Code'] = r.status_code
-    prev_response['Endpoint'] = endpoint
+    url = url.split('?')[0]
+    for name, pattern in _endpoint_patterns:
+        if pattern.match(url):
+            return name
+    return None
+
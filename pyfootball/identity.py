@@ -0,0 +1,143 @@
+import threading
+
+# The keys of the sub-objects that are interned, and the kind of entity
+# each holds.
+ENTITY_KEYS = {
+    'homeTeam': 'team',
+    'awayTeam': 'team',
+    'team': 'team',
+    'currentTeam': 'team',
+    'winner': 'team',
+    'competition': 'competition',
+    'runningCompetitions': 'competition',
+    'area': 'area',
+    'season': 'season',
+    'currentSeason': 'season',
+}
+
+
+class TeamRef(dict):
+    """The team dict of a fixture, table entry or player, as interned by an
+    IdentityMap: the same object for every model that refers to one team,
+    with attribute access to its fields. It compares equal to an equal
+    dict, but two references to the same team are the same object, so
+    comparing them is an identity check.
+    """
+    __slots__ = ()
+
+    @property
+    def id(self):
+        return self['id']
+
+    @property
+    def name(self):
+        return self.get('name')
+
+    @property
+    def short_name(self):
+        return self.get('shortName')
+
+    @property
+    def tla(self):
+        return self.get('tla')
+
+    @property
+    def crest(self):
+        return self.get('crest')
+
+    def __eq__(self, other):
+        return self is other or dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self['id'])
+
+
+class IdentityMap(object):
+    def __init__(self):
+        """Interns the team, competition, area and season sub-objects of
+        response bodies by ID, so that every model built by one client
+        refers to a single object for each of them instead of its own copy:
+        a season of fixtures holds each team once rather than 38 times.
+        Teams become TeamRef objects.
+
+        Sub-objects with the same ID but other fields, such as the short
+        team dict of a player's ``currentTeam``, are kept apart; one with
+        the same fields but different values replaces the object used from
+        then on. Interned objects are shared and must be treated as
+        read-only.
+        """
+        self._objects = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def __len__(self):
+        return len(self._objects)
+
+    def get(self, kind, entity_id):
+        """Returns the interned objects of one entity, e.g.
+        ``get('team', 57)``, as a list with one per set of fields."""
+        return [value for key, value in list(self._objects.items())
+                if key[0] == kind and key[1] == entity_id]
+
+    def intern(self, kind, value):
+        """Returns the interned object for a sub-object of the given kind,
+        one of the values of ``ENTITY_KEYS``, storing value if it is the
+        first of its kind and ID.
+
+        :param kind: The kind of entity.
+        :type kind: string
+        :param value: The sub-object.
+        :type value: dict
+        """
+        key = (kind, value['id'], tuple(value))
+        existing = self._objects.get(key)
+        if existing is value:
+            return value
+        if existing is not None and existing == value:
+            self.hits += 1
+            return existing
+        self.intern_body(value)
+        if kind == 'team':
+            value = TeamRef(value)
+        with self._lock:
+            self._objects[key] = value
+        return value
+
+    def intern_body(self, data):
+        """Replaces the sub-objects of a response body, at any depth, with
+        their interned objects, in place.
+
+        :param data: The decoded response body, or a part of it.
+        :type data: dict or list
+
+        :returns: data: The same body.
+        """
+        if isinstance(data, list):
+            for item in data:
+                if isinstance(item, (dict, list)):
+                    self.intern_body(item)
+            return data
+        for key, item in data.items():
+            if not isinstance(item, (dict, list)):
+                continue
+            kind = ENTITY_KEYS.get(key)
+            if kind is None:
+                self.intern_body(item)
+            elif isinstance(item, dict):
+                if 'id' in item:
+                    data[key] = self.intern(kind, item)
+                else:
+                    self.intern_body(item)
+            else:
+                for i, entity in enumerate(item):
+                    if isinstance(entity, dict) and 'id' in entity:
+                        item[i] = self.intern(kind, entity)
+        return data
+
+    def clear(self):
+        """Forgets every interned object."""
+        with self._lock:
+            self._objects.clear()
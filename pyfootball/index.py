@@ -0,0 +1,234 @@
+import threading
+from bisect import bisect_left, insort
+
+from pyfootball.models.fixture import Fixture
+
+# The hash indexes, and the attribute of a fixture each is keyed on. A
+# fixture is listed under both of its teams.
+INDEXES = {
+    'team': ('home_team_id', 'away_team_id'),
+    'matchday': ('matchday',),
+    'status': ('status',),
+    'competition': ('competition_id',),
+}
+
+
+def _values(fixture, attrs):
+    values = []
+    for attr in attrs:
+        if attr == 'competition_id':
+            value = (fixture.competition or {}).get('id')
+        else:
+            value = getattr(fixture, attr)
+        if value is not None and value not in values:
+            values.append(value)
+    return values
+
+
+def _sort_key(fixture):
+    return fixture.date, fixture.id
+
+
+class FixtureIndex(object):
+    def __init__(self, fixtures=()):
+        """An in-memory store of fixtures, keyed on ID, with hash indexes
+        on their teams, matchday, status and competition and a sorted index
+        on their kickoff times, so that lookups don't scan every fixture.
+
+        Looking up an indexed value costs O(1) plus the size of the
+        result, and a range of kickoff times O(log n) plus the size of the
+        result. Every list returned is in kickoff order. Adding a fixture
+        that is already stored replaces it, so the index can be kept up to
+        date with ``update``, e.g. from a Poller's callbacks.
+
+        :keyword fixtures: The fixtures to store.
+        :type fixtures: list of Fixture or dict
+        """
+        self._fixtures = {}
+        self._dates = []
+        self._indexes = {name: {} for name in INDEXES}
+        self._lock = threading.RLock()
+        self.update(fixtures)
+
+    @classmethod
+    def from_cache(cls, cache):
+        """Builds an index from the fixtures in the fresh bodies of a
+        ResponseCache: fixture lists and single fixtures.
+
+        :param cache: The cache.
+        :type cache: ResponseCache
+        """
+        fixtures = []
+        for data in cache.bodies():
+            if isinstance(data.get('matches'), list):
+                fixtures.extend(data['matches'])
+            elif 'homeTeam' in data and 'utcDate' in data:
+                fixtures.append(data)
+        return cls(fixtures)
+
+    def __len__(self):
+        return len(self._fixtures)
+
+    def __contains__(self, fixture_id):
+        return fixture_id in self._fixtures
+
+    def __iter__(self):
+        """Iterates over the fixtures in kickoff order."""
+        return iter(self.between())
+
+    def get(self, fixture_id):
+        """Returns the fixture with the given ID, or None."""
+        return self._fixtures.get(fixture_id)
+
+    def add(self, fixture):
+        """Stores a fixture, replacing the one with the same ID.
+
+        :param fixture: The fixture.
+        :type fixture: Fixture or dict
+        """
+        if isinstance(fixture, dict):
+            fixture = Fixture(fixture)
+        with self._lock:
+            if fixture.id in self._fixtures:
+                self._remove(self._fixtures[fixture.id])
+            self._fixtures[fixture.id] = fixture
+            key = _sort_key(fixture)
+            insort(self._dates, key)
+            for name, attrs in INDEXES.items():
+                index = self._indexes[name]
+                for value in _values(fixture, attrs):
+                    insort(index.setdefault(value, []), key)
+
+    def update(self, fixtures):
+        """Stores every fixture of a list. See ``add``."""
+        for fixture in fixtures:
+            self.add(fixture)
+
+    def remove(self, fixture_id):
+        """Removes the fixture with the given ID, if there is one.
+
+        :returns: fixture: The removed fixture, or None.
+        """
+        with self._lock:
+            fixture = self._fixtures.pop(fixture_id, None)
+            if fixture is not None:
+                self._remove(fixture)
+            return fixture
+
+    def _remove(self, fixture):
+        key = _sort_key(fixture)
+        _discard(self._dates, key)
+        for name, attrs in INDEXES.items():
+            index = self._indexes[name]
+            for value in _values(fixture, attrs):
+                keys = index[value]
+                _discard(keys, key)
+                if not keys:
+                    del index[value]
+
+    def _lookup(self, keys):
+        return [self._fixtures[key[1]] for key in keys]
+
+    def _bucket(self, name, value):
+        return self._indexes[name].get(value, [])
+
+    def by_team(self, team_id):
+        """Returns the fixtures of a team, home or away."""
+        with self._lock:
+            return self._lookup(self._bucket('team', team_id))
+
+    def by_matchday(self, matchday):
+        """Returns the fixtures of a matchday."""
+        with self._lock:
+            return self._lookup(self._bucket('matchday', matchday))
+
+    def by_status(self, status):
+        """Returns the fixtures with a status, e.g. ``'IN_PLAY'``."""
+        with self._lock:
+            return self._lookup(self._bucket('status', status))
+
+    def by_competition(self, comp_id):
+        """Returns the fixtures of a competition."""
+        with self._lock:
+            return self._lookup(self._bucket('competition', comp_id))
+
+    def between(self, start=None, end=None, team_id=None):
+        """Returns the fixtures kicking off in a range of times.
+
+        :keyword start: The earliest kickoff time (inclusive).
+        :type start: datetime
+        :keyword end: The latest kickoff time (exclusive).
+        :type end: datetime
+        :keyword team_id: Only return the fixtures of this team.
+        :type team_id: integer
+        """
+        with self._lock:
+            keys = self._dates if team_id is None else \
+                self._bucket('team', team_id)
+            return self._lookup(keys[_range(keys, start, end)])
+
+    def next_fixture(self, team_id, after):
+        """Returns a team's first fixture kicking off at or after a time,
+        or None.
+
+        :param team_id: The team's ID.
+        :type team_id: integer
+        :param after: The time, e.g. ``datetime.utcnow()``.
+        :type after: datetime
+        """
+        with self._lock:
+            keys = self._bucket('team', team_id)
+            i = bisect_left(keys, (after,))
+            return self._fixtures[keys[i][1]] if i < len(keys) else None
+
+    def query(self, team_id=None, matchday=None, status=None,
+              comp_id=None, start=None, end=None):
+        """Returns the fixtures matching every given condition, scanning
+        only the smallest of the matching index entries and checking the
+        other conditions on its fixtures, so that a query costs the size of
+        that entry rather than of every entry it names.
+
+        :keyword team_id: A team playing either home or away.
+        :type team_id: integer
+        :keyword matchday: The matchday.
+        :type matchday: integer
+        :keyword status: The status.
+        :type status: string
+        :keyword comp_id: The competition's ID.
+        :type comp_id: integer
+        :keyword start: The earliest kickoff time (inclusive).
+        :type start: datetime
+        :keyword end: The latest kickoff time (exclusive).
+        :type end: datetime
+        """
+        conditions = [(name, value) for name, value in
+                      (('team', team_id), ('matchday', matchday),
+                       ('status', status), ('competition', comp_id))
+                      if value is not None]
+        with self._lock:
+            keys, others = self._dates, []
+            if conditions:
+                sizes = [len(self._bucket(name, value))
+                         for name, value in conditions]
+                i = sizes.index(min(sizes))
+                keys = self._bucket(*conditions[i])
+                others = conditions[:i] + conditions[i + 1:]
+            fixtures = self._lookup(keys[_range(keys, start, end)])
+            # The other conditions are checked on the fixtures themselves,
+            # so their index entries aren't read.
+            return [fixture for fixture in fixtures
+                    if all(value in _values(fixture, INDEXES[name])
+                           for name, value in others)]
+
+
+def _range(keys, start, end):
+    # The slice of a sorted list of (date, ID) keys within [start, end).
+    first = 0 if start is None else bisect_left(keys, (start,))
+    last = len(keys) if end is None else bisect_left(keys, (end,))
+    return slice(first, last)
+
+
+def _discard(keys, key):
+    i = bisect_left(keys, key)
+    if i < len(keys) and keys[i] == key:
+        del keys[i]
@@ -0,0 +1,332 @@
+import contextvars
+import threading
+import time
+import warnings
+from bisect import bisect_left
+from collections import Counter, namedtuple
+
+from pyfootball.cache import cache_key
+from pyfootball.globals import resolve_endpoint
+from pyfootball.ratelimit import AVAILABLE_HEADER, _header_number
+
+# What served a call: 'miss' for a request, 'hit' for the in-memory cache,
+# 'snapshot' for a snapshot, 'disk' for a fresh disk cache entry,
+# 'revalidated' for a stale one the API confirmed, 'coalesced' for
+# another call's concurrent request, and 'stream' for a streamed request.
+CACHE_OUTCOMES = ('miss', 'hit', 'snapshot', 'disk', 'revalidated',
+                  'coalesced', 'stream')
+
+# The fields of a RequestRecord that hold seconds.
+TIMINGS = ('dns', 'connect', 'ttfb', 'total', 'decode', 'build')
+
+# Upper bounds, in seconds, of the buckets of a Histogram.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+                   2.5, 5.0, 10.0)
+
+RequestRecord = namedtuple('RequestRecord', [
+    'endpoint', 'url', 'status', 'cache', 'dns', 'connect', 'ttfb',
+    'total', 'bytes', 'decode', 'build', 'rate_limit_remaining',
+    'rate_limit_wait', 'retries', 'headers', 'started_at'])
+RequestRecord.__new__.__defaults__ = (None,) * len(RequestRecord._fields)
+RequestRecord.__doc__ = """What a Transport did to serve one call:
+
+* ``endpoint``: the name of the endpoint in ``globals.endpoints``.
+* ``url``: the endpoint URL, with its query string.
+* ``status``: the response status code, or None if no request was sent.
+* ``cache``: one of ``CACHE_OUTCOMES``.
+* ``dns``, ``connect``: seconds spent resolving the host and opening a
+  connection, or None if a pooled connection was reused.
+* ``ttfb``, ``total``: seconds until the response headers and the whole
+  body were received, including any retry. A streamed body is received
+  while its items are consumed.
+* ``bytes``: the size of the response body.
+* ``decode``: seconds spent decoding the body.
+* ``build``: seconds spent building model objects from it.
+* ``rate_limit_remaining``: the requests left in the API's current
+  window, from the ``X-Requests-Available-Minute`` header.
+* ``rate_limit_wait``: seconds spent waiting for the rate limiter.
+* ``retries``: the number of requests sent again after a 429.
+* ``headers``: the response headers.
+* ``started_at``: when the call started, in seconds since the epoch.
+"""
+
+_current = contextvars.ContextVar('pyfootball_request', default=None)
+_connecting = threading.local()
+
+
+class Instrumentation(object):
+    def __init__(self, hooks=()):
+        """Builds a RequestRecord for every call served by a Transport,
+        whether it was answered by a request or by a cache, and passes it
+        to each hook. It also keeps the last response received on each
+        thread, which ``get_prev_response`` returns.
+
+        A hook is any callable that takes a RequestRecord, such as a
+        HistogramExporter. It is called on the thread that made the call,
+        and an exception it raises is turned into a warning.
+
+        :keyword hooks: The hooks.
+        :type hooks: list
+        """
+        self.hooks = list(hooks)
+        self._local = threading.local()
+
+    def add_hook(self, hook):
+        """Adds a hook."""
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """Removes a hook."""
+        self.hooks.remove(hook)
+
+    def start(self, endpoint, params=None):
+        """Returns a new, empty record, as a dict, for a call to an
+        endpoint, to be passed to ``finish``."""
+        record = dict.fromkeys(RequestRecord._fields)
+        url = cache_key(endpoint, params)
+        record.update(endpoint=resolve_endpoint(url), url=url,
+                      started_at=time.time(), retries=0)
+        return record
+
+    def finish(self, record):
+        """Emits a record started with ``start`` to the hooks."""
+        record = RequestRecord(**record)
+        if record.status is not None:
+            self._local.last = record
+        for hook in self.hooks:
+            try:
+                hook(record)
+            except Exception as e:
+                warnings.warn('Instrumentation hook {!r} raised {!r}.'
+                              .format(hook, e), RuntimeWarning)
+
+    def request(self, endpoint, params=None):
+        """Returns a context manager that starts a record for a call and
+        emits it on exit. Within it, further calls to ``request`` on the
+        same context return the same record, so that a call made up of
+        others, like fetching a body and building models from it, is
+        recorded once.
+        """
+        return _Scope(self, endpoint, params)
+
+    def last_response(self):
+        """Returns the headers of the last response received on this
+        thread, with its ``Status-Code`` and ``Endpoint``, or an empty dict
+        if this thread hasn't received one."""
+        from requests.structures import CaseInsensitiveDict
+
+        record = getattr(self._local, 'last', None)
+        if record is None:
+            return {}
+        response = CaseInsensitiveDict(record.headers or {})
+        response['Status-Code'] = record.status
+        response['Endpoint'] = record.url
+        return response
+
+
+class _Scope(object):
+    __slots__ = ('instrumentation', 'endpoint', 'params', 'record', 'token')
+
+    def __init__(self, instrumentation, endpoint, params):
+        self.instrumentation = instrumentation
+        self.endpoint = endpoint
+        self.params = params
+        self.record = None
+        self.token = None
+
+    def __enter__(self):
+        current = _current.get()
+        if current is not None and current[0] is self.instrumentation:
+            return current[1]
+        self.record = self.instrumentation.start(self.endpoint, self.params)
+        self.token = _current.set((self.instrumentation, self.record))
+        return self.record
+
+    def __exit__(self, *exc_info):
+        if self.token is not None:
+            _current.reset(self.token)
+            self.instrumentation.finish(self.record)
+
+
+def sending(record):
+    """Sets the record that connections opened on this thread report
+    their timings to, or None. See ``connections.TimingAdapter``."""
+    _connecting.record = record
+
+
+def observe_response(record, headers, status, size):
+    """Fills in the fields of a record taken from a response."""
+    record['status'] = status
+    record['headers'] = headers
+    record['bytes'] = size
+    record['rate_limit_remaining'] = _header_number(headers,
+                                                    AVAILABLE_HEADER)
+
+
+class Histogram(object):
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Counts observations in buckets with fixed upper bounds, like a
+        Prometheus histogram, so that memory use doesn't grow with the
+        number of observations.
+
+        :keyword buckets: The upper bounds, in increasing order.
+        :type buckets: tuple
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """Counts one value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """Returns ``(upper bound, count of values up to it)`` tuples, the
+        last one for ``float('inf')``."""
+        total, rows = 0, []
+        for bound, count in zip(self.buckets + (float('inf'),),
+                                self.counts):
+            total += count
+            rows.append((bound, total))
+        return rows
+
+    def quantile(self, q):
+        """Estimates a quantile, e.g. 0.95, by interpolating within the
+        bucket it falls in, or returns None if nothing was observed."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        lower, seen = 0.0, 0
+        for bound, count in zip(self.buckets, self.counts):
+            if count and seen + count >= rank:
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return self.buckets[-1]
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+
+class HistogramExporter(object):
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """A hook that keeps, for each endpoint, a Histogram of each of the
+        timings in ``TIMINGS``, the number of calls by status and cache
+        outcome, and the bytes received.
+
+        :keyword buckets: The upper bounds of the histograms' buckets.
+        :type buckets: tuple
+        """
+        self.buckets = buckets
+        self.histograms = {}
+        self.requests = Counter()
+        self.bytes = Counter()
+        self.rate_limit_remaining = None
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        endpoint = record.endpoint or 'unknown'
+        with self._lock:
+            self.requests[(endpoint, record.status, record.cache)] += 1
+            if record.bytes:
+                self.bytes[endpoint] += record.bytes
+            if record.rate_limit_remaining is not None:
+                self.rate_limit_remaining = record.rate_limit_remaining
+            for timing in TIMINGS:
+                value = getattr(record, timing)
+                if value is not None:
+                    key = (endpoint, timing)
+                    histogram = self.histograms.get(key)
+                    if histogram is None:
+                        histogram = self.histograms[key] = \
+                            Histogram(self.buckets)
+                    histogram.observe(value)
+
+    def histogram(self, endpoint, timing='total'):
+        """Returns the Histogram of a timing for an endpoint, or None."""
+        return self.histograms.get((endpoint, timing))
+
+    def summary(self):
+        """Returns the count, mean and estimated median, 95th and 99th
+        percentiles of each timing, keyed on endpoint and timing."""
+        summary = {}
+        with self._lock:
+            for (endpoint, timing), histogram in self.histograms.items():
+                summary.setdefault(endpoint, {})[timing] = {
+                    'count': histogram.count, 'mean': histogram.mean,
+                    'p50': histogram.quantile(0.5),
+                    'p95': histogram.quantile(0.95),
+                    'p99': histogram.quantile(0.99)}
+        return summary
+
+
+def _labels(**labels):
+    return '{' + ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\')
+                         .replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels.items()) + '}'
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class PrometheusExporter(HistogramExporter):
+    def __init__(self, namespace='pyfootball', buckets=DEFAULT_BUCKETS):
+        """A HistogramExporter that renders what it has seen in the
+        Prometheus text format, e.g. to be served on a ``/metrics`` page.
+
+        :keyword namespace: The prefix of the metric names.
+        :type namespace: string
+        :keyword buckets: The upper bounds of the histograms' buckets.
+        :type buckets: tuple
+        """
+        super(PrometheusExporter, self).__init__(buckets)
+        self.namespace = namespace
+
+    def render(self):
+        """Returns the metrics as Prometheus text."""
+        ns = self.namespace
+        lines = []
+        with self._lock:
+            lines += ['# HELP {}_requests_total Calls by endpoint, status '
+                      'and cache outcome.'.format(ns),
+                      '# TYPE {}_requests_total counter'.format(ns)]
+            for (endpoint, status, cache), count in sorted(
+                    self.requests.items(), key=str):
+                lines.append('{}_requests_total{} {}'.format(
+                    ns, _labels(endpoint=endpoint, status=status or '',
+                                cache=cache or ''), count))
+            lines += ['# HELP {}_response_bytes_total Bytes received by '
+                      'endpoint.'.format(ns),
+                      '# TYPE {}_response_bytes_total counter'.format(ns)]
+            for endpoint, size in sorted(self.bytes.items()):
+                lines.append('{}_response_bytes_total{} {}'.format(
+                    ns, _labels(endpoint=endpoint), size))
+            lines += ['# HELP {}_request_seconds Seconds spent on each '
+                      'phase of a call.'.format(ns),
+                      '# TYPE {}_request_seconds histogram'.format(ns)]
+            for (endpoint, phase), histogram in sorted(
+                    self.histograms.items()):
+                for bound, count in histogram.cumulative():
+                    lines.append('{}_request_seconds_bucket{} {}'.format(
+                        ns, _labels(endpoint=endpoint, phase=phase,
+                                    le=_number(bound)), count))
+                labels = _labels(endpoint=endpoint, phase=phase)
+                lines.append('{}_request_seconds_sum{} {}'.format(
+                    ns, labels, _number(histogram.sum)))
+                lines.append('{}_request_seconds_count{} {}'.format(
+                    ns, labels, histogram.count))
+            if self.rate_limit_remaining is not None:
+                lines += ['# HELP {}_rate_limit_remaining Requests left in '
+                          "the API's current window.".format(ns),
+                          '# TYPE {}_rate_limit_remaining gauge'.format(ns),
+                          '{}_rate_limit_remaining {}'.format(
+                              ns, _number(self.rate_limit_remaining))]
+        return '\n'.join(lines) + '\n'
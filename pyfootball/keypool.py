@@ -0,0 +1,124 @@
+import random
+import threading
+import time
+
+from pyfootball.ratelimit import AVAILABLE_HEADER, RESET_HEADER, \
+    DEFAULT_PERIOD, _header_number
+
+# The statuses that take a key out of the pool, after which the request is
+# sent again with another key.
+QUARANTINE_STATUSES = frozenset([403, 429])
+
+# Seconds a key that got a 403 is left out for.
+DEFAULT_QUARANTINE = 300.0
+
+
+class KeyPool(object):
+    def __init__(self, keys, quarantine=DEFAULT_QUARANTINE,
+                 period=DEFAULT_PERIOD, seed=None):
+        """Spreads requests over several API keys, so that a client's
+        throughput is the sum of their quotas. ``choose`` picks a key at
+        random, weighted by the requests it has left in the API's current
+        window according to the headers of its last response.
+
+        A key that gets a 429 is left out until its counter resets, and one
+        that gets a 403 for ``quarantine`` seconds; the Transport then sends
+        the request again with another key. If every key is left out, the
+        one that comes back first is used.
+
+        :param keys: The API keys.
+        :type keys: list
+        :keyword quarantine: Seconds a key that got a 403 is left out for.
+        :type quarantine: float
+        :keyword period: Seconds after which the API's counter resets when
+            it doesn't say otherwise.
+        :type period: float
+        :keyword seed: A seed for the random choice of keys.
+        :type seed: integer
+        """
+        self.keys = list(dict.fromkeys(keys))
+        if not self.keys:
+            raise ValueError("A KeyPool needs at least one API key.")
+        self.quarantine_seconds = quarantine
+        self.period = period
+        self.quarantined = dict.fromkeys(self.keys, 0)
+        self._remaining = dict.fromkeys(self.keys)
+        self._reset_at = dict.fromkeys(self.keys, 0.0)
+        self._until = dict.fromkeys(self.keys, 0.0)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def remaining(self, key):
+        """Returns the requests a key has left in the current window, or
+        None if that isn't known."""
+        if time.monotonic() >= self._reset_at[key]:
+            return None
+        return self._remaining[key]
+
+    def available(self):
+        """Returns the keys that aren't left out."""
+        now = time.monotonic()
+        return [key for key in self.keys if self._until[key] <= now]
+
+    def choose(self):
+        """Returns the key to send a request with."""
+        now = time.monotonic()
+        with self._lock:
+            keys, weights = [], []
+            for key in self.keys:
+                if self._until[key] > now:
+                    continue
+                remaining = self._remaining[key] \
+                    if now < self._reset_at[key] else None
+                keys.append(key)
+                weights.append(remaining)
+            # A key whose budget isn't known yet counts as the fullest one.
+            default = max([weight for weight in weights
+                           if weight is not None] + [1])
+            weights = [default if weight is None else weight
+                       for weight in weights]
+            if not any(weights):
+                # Every key is left out or used up; take the first back.
+                return min(self.keys, key=self._back_at)
+            return self._random.choices(keys, weights)[0]
+
+    def _back_at(self, key):
+        used_up = self._reset_at[key] if self._remaining[key] == 0 else 0.0
+        return max(self._until[key], used_up)
+
+    def update(self, key, headers, status_code=None):
+        """Updates a key's budget from the headers of a response, and
+        leaves it out if the status is one of ``QUARANTINE_STATUSES``.
+
+        :param key: The API key the request was sent with.
+        :type key: string
+        :param headers: The response headers.
+        :type headers: dict
+        :keyword status_code: The response status code.
+        :type status_code: integer
+        """
+        available = _header_number(headers, AVAILABLE_HEADER)
+        reset = _header_number(headers, RESET_HEADER)
+        now = time.monotonic()
+        with self._lock:
+            if available is not None:
+                self._remaining[key] = int(available)
+                self._reset_at[key] = now + (
+                    reset if reset is not None else self.period)
+            if status_code == 429:
+                self._remaining[key] = 0
+                self._reset_at[key] = self._until[key] = now + (
+                    reset if reset is not None else self.period)
+            elif status_code == 403:
+                self._until[key] = now + self.quarantine_seconds
+            else:
+                return
+            self.quarantined[key] += 1
+
+    def release(self, key):
+        """Puts a key that was left out back in the pool."""
+        with self._lock:
+            self._until[key] = 0.0
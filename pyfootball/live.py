@@ -0,0 +1,253 @@
+import calendar
+import threading
+import time
+from collections import namedtuple
+
+from pyfootball.models.fixture import Fixture
+
+# Event types.
+KICKOFF = 'kickoff'
+GOAL = 'goal'
+STATUS_CHANGE = 'status_change'
+FULL_TIME = 'full_time'
+EVENT_TYPES = [KICKOFF, GOAL, STATUS_CHANGE, FULL_TIME]
+
+NOT_STARTED = ['SCHEDULED', 'TIMED']
+LIVE = ['IN_PLAY', 'PAUSED', 'EXTRA_TIME', 'PENALTY_SHOOTOUT']
+
+# Seconds between polls while a match is in play, and the longest wait
+# while none is. The free tier allows 10 requests a minute.
+DEFAULT_LIVE_INTERVAL = 20
+DEFAULT_IDLE_INTERVAL = 3600
+
+
+class LiveEvent(namedtuple('LiveEvent', ['type', 'fixture', 'previous'])):
+    """A change to a fixture between two polls: its type, one of
+    ``EVENT_TYPES``, and the fixture as of this poll and the one before."""
+    __slots__ = ()
+
+    @property
+    def score(self):
+        """The full time score of the fixture as of this poll, as a
+        ``(home, away)`` tuple."""
+        full_time = self.fixture.score['fullTime']
+        return full_time['home'], full_time['away']
+
+
+def _goals(fixture):
+    # A match that hasn't kicked off has no score rather than 0-0.
+    full_time = fixture.score['fullTime']
+    return full_time['home'] or 0, full_time['away'] or 0
+
+
+def _timestamp(date):
+    return calendar.timegm(date.timetuple())
+
+
+def diff(previous, current):
+    """Returns the events between two snapshots of the same fixtures.
+    Fixtures whose ``lastUpdated`` field and score haven't changed are
+    skipped, as are fixtures missing from either snapshot.
+
+    A match leaving ``NOT_STARTED`` for ``LIVE`` is a KICKOFF, one becoming
+    ``FINISHED`` is a FULL_TIME, and any other change of status is a
+    STATUS_CHANGE. Every change of the number of goals, including a goal
+    that is disallowed, is a GOAL; goals come before a FULL_TIME event of
+    the same fixture.
+
+    :param previous: The fixtures of the earlier poll, keyed on ID.
+    :type previous: dict
+    :param current: The fixtures of the later poll, keyed on ID.
+    :type current: dict
+
+    :returns: events: A list of LiveEvent objects.
+    """
+    events = []
+    for fixture_id, fixture in current.items():
+        before = previous.get(fixture_id)
+        if before is None:
+            continue
+        goals = _goals(fixture)
+        if fixture.lastUpdated == before.lastUpdated and \
+                fixture.status == before.status and goals == _goals(before):
+            continue
+        if fixture.status != before.status:
+            if fixture.status in LIVE and before.status in NOT_STARTED:
+                events.append(LiveEvent(KICKOFF, fixture, before))
+            elif fixture.status != 'FINISHED':
+                events.append(LiveEvent(STATUS_CHANGE, fixture, before))
+        if goals != _goals(before):
+            events.append(LiveEvent(GOAL, fixture, before))
+        if fixture.status == 'FINISHED' and before.status != 'FINISHED':
+            events.append(LiveEvent(FULL_TIME, fixture, before))
+    return events
+
+
+def next_interval(fixtures, now, live_interval=DEFAULT_LIVE_INTERVAL,
+                  idle_interval=DEFAULT_IDLE_INTERVAL):
+    """Returns the number of seconds to wait before the next poll: the live
+    interval while a match is in play or due to have kicked off, the time
+    until the next kickoff otherwise, and never more than the idle
+    interval.
+
+    :param fixtures: The fixtures of the last poll.
+    :type fixtures: iterable
+    :param now: The current time, in seconds since the epoch.
+    :type now: float
+    """
+    next_kickoff = None
+    for fixture in fixtures:
+        if fixture.status in LIVE:
+            return live_interval
+        if fixture.status in NOT_STARTED:
+            kickoff = _timestamp(fixture.date)
+            if next_kickoff is None or kickoff < next_kickoff:
+                next_kickoff = kickoff
+    if next_kickoff is None:
+        return idle_interval
+    return min(idle_interval, max(live_interval, next_kickoff - now))
+
+
+class Poller(object):
+    def __init__(self, fetch, live_interval=DEFAULT_LIVE_INTERVAL,
+                 idle_interval=DEFAULT_IDLE_INTERVAL, clock=time.time):
+        """Polls a list of fixtures and reports what changed between polls
+        as LiveEvent objects, to callbacks registered with ``on`` or
+        through the asynchronous iterator returned by ``events``. The wait
+        between polls follows ``next_interval``: short while matches are in
+        play, and until the next kickoff otherwise.
+
+        :param fetch: A function that returns the fixtures to watch, e.g.
+            ``football.get_all_fixtures``. It can be a coroutine function,
+            such as a method of ``AsyncFootball``, when the poller is used
+            asynchronously.
+        :type fetch: callable
+        :keyword live_interval: Seconds between polls while a match is in
+            play.
+        :type live_interval: float
+        :keyword idle_interval: The longest wait between polls.
+        :type idle_interval: float
+        :keyword clock: The function returning the current time.
+        :type clock: callable
+        """
+        self.fetch = fetch
+        self.live_interval = live_interval
+        self.idle_interval = idle_interval
+        self.clock = clock
+        self.snapshot = None
+        self.interval = live_interval
+        self.polls = 0
+        self._callbacks = []
+        self._stopped = threading.Event()
+        # The loop running ``events`` and the asyncio.Event its wait
+        # between polls ends on.
+        self._wakeup = None
+
+    def on(self, callback, event_type=None):
+        """Registers a function that is called with every LiveEvent, or
+        only those of one type, as soon as the poll that found it ends.
+
+        :param callback: The function to call.
+        :type callback: callable
+        :keyword event_type: One of ``EVENT_TYPES``, or None for all.
+        :type event_type: string
+        """
+        if event_type is not None and event_type not in EVENT_TYPES:
+            raise ValueError("Unknown event type {!r}; expected one of "
+                             "{}.".format(event_type, EVENT_TYPES))
+        self._callbacks.append((event_type, callback))
+
+    def update(self, fixtures):
+        """Takes the fixtures of a poll, returns the events since the last
+        one and sets ``interval``. The first poll only sets the snapshot.
+
+        :param fixtures: The fixtures returned by fetch.
+        :type fixtures: list of Fixture or dict
+        """
+        current = {}
+        for fixture in fixtures:
+            if isinstance(fixture, dict):
+                fixture = Fixture(fixture)
+            current[fixture.id] = fixture
+        events = [] if self.snapshot is None else diff(self.snapshot,
+                                                       current)
+        self.snapshot = current
+        self.polls += 1
+        self.interval = next_interval(current.values(), self.clock(),
+                                      self.live_interval, self.idle_interval)
+        for event in events:
+            for event_type, callback in self._callbacks:
+                if event_type is None or event_type == event.type:
+                    callback(event)
+        return events
+
+    def poll(self):
+        """Fetches the fixtures once and returns the events found, after
+        passing them to the callbacks."""
+        return self.update(self.fetch())
+
+    async def poll_async(self):
+        """Same as ``poll``, but awaitable. A blocking fetch function is run
+        in the event loop's default executor."""
+        import asyncio
+
+        if asyncio.iscoroutinefunction(self.fetch):
+            fixtures = await self.fetch()
+        else:
+            loop = asyncio.get_running_loop()
+            fixtures = await loop.run_in_executor(None, self.fetch)
+        return self.update(fixtures)
+
+    def run(self, max_polls=None):
+        """Polls until ``stop`` is called, or max_polls polls have been
+        made, waiting ``interval`` seconds in between. An exception raised
+        by fetch or a callback stops the loop.
+
+        :keyword max_polls: The number of polls to make.
+        :type max_polls: integer
+        """
+        self._stopped.clear()
+        polls = 0
+        while not self._stopped.is_set():
+            self.poll()
+            polls += 1
+            if max_polls is not None and polls >= max_polls:
+                break
+            self._stopped.wait(self.interval)
+
+    def stop(self):
+        """Stops ``run`` or ``events`` after the current poll, or at once if
+        they are waiting for the next one. Can be called from any thread."""
+        self._stopped.set()
+        wakeup = self._wakeup
+        if wakeup is not None:
+            loop, event = wakeup
+            loop.call_soon_threadsafe(event.set)
+
+    async def events(self, max_polls=None):
+        """Polls until ``stop`` is called, or max_polls polls have been
+        made, and yields each event as it is found. Callbacks are called
+        too.
+
+        :keyword max_polls: The number of polls to make.
+        :type max_polls: integer
+        """
+        import asyncio
+
+        self._stopped.clear()
+        stopped = asyncio.Event()
+        self._wakeup = (asyncio.get_running_loop(), stopped)
+        polls = 0
+        try:
+            while not self._stopped.is_set():
+                for event in await self.poll_async():
+                    yield event
+                polls += 1
+                if max_polls is not None and polls >= max_polls:
+                    break
+                try:
+                    await asyncio.wait_for(stopped.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._wakeup = None
@@ -1,56 +1,81 @@
 import traceback
-import requests
-from datetime import datetime
 
-from pyfootball import globals
+from pyfootball.decoding import Field, LazyAttribute, compile_decoder, \
+    lazy_fields, parse_datetime
 from pyfootball.globals import endpoints
+from pyfootball.transport import fetch_models, fetch_models_async, \
+    iter_models
 from .team import Team
 from .fixture import Fixture
 from .standings import Standings
 
+_FIELDS = [
+    Field('id'),
+    Field('area'),
+    Field('name'),
+    Field('code'),
+    Field('type'),
+    Field('emblem'),
+    Field('start_date', 'currentSeason.startDate', parse_datetime),
+    Field('end_date', 'currentSeason.endDate', parse_datetime),
+    Field('current_matchday', 'currentSeason.currentMatchday'),
+    Field('winner', 'currentSeason.winner'),
+    Field('last_updated', 'lastUpdated', parse_datetime),
+]
+_decode = compile_decoder(_FIELDS, 'decode_competition')
+
+
+def _available_seasons(data):
+    return data.get('numberOfAvailableSeasons') or len(data['seasons'])
+
 
 class Competition():
-    def __init__(self, data):
+    def __init__(self, data, transport=None):
         """Takes a dict converted from the JSON response by the API and wraps
         the competition data within an object.
 
         :param data: The competition data from the API's response.
         :type data: dict
+        :keyword transport: The Transport used for this object's requests.
+            Defaults to the process-wide Transport.
+        :type transport: Transport
         """
-        self.id = data['id']
-        self.area = data['area']
-        self.name = data['name']
-        self.code = data['code']
-        self.type = data['type']
-        self.emblem = data['emblem']
-        self.start_date = datetime.strptime(data['currentSeason']['startDate'], '%Y-%m-%d')
-        self.end_date = datetime.strptime(data['currentSeason']['endDate'], '%Y-%m-%d')
-        self.current_matchday = data['currentSeason']['currentMatchday']
-        self.winner = data['currentSeason']['winner']
-        self.numberOfAvailableSeasons = data.get('numberOfAvailableSeasons') or len(data['seasons'])
-        self.last_updated = datetime.strptime(data['lastUpdated'],
-                                              '%Y-%m-%dT%H:%M:%SZ')
+        _decode(self, data)
+        self.numberOfAvailableSeasons = _available_seasons(data)
+        self._transport = transport
         self._teams_ep = endpoints['comp_teams'].format(self.id)
         self._fixtures_ep = endpoints['comp_fixtures'].format(self.id)
         self._league_table_ep = endpoints['league_table'].format(self.id)
 
-    def get_fixtures(self):
+    def get_fixtures(self, as_frame=False):
         """Return a list of Fixture objects representing the fixtures in this
         competition for the current season.
 
         Sends one request to api.football-data.org.
 
+        :keyword as_frame: Whether to return a FixtureFrame instead of a
+            list. Requires numpy.
+        :type as_frame: bool
+
         :returns: fixture_list: A list of Fixture objects.
         """
-        r = requests.get(self._fixtures_ep, headers=globals.headers)
-        globals.update_prev_response(r, self._fixtures_ep)
-        r.raise_for_status()
+        if as_frame:
+            from pyfootball.frame import fetch_frame
+            return fetch_frame(self._transport, self._fixtures_ep)
+        return fetch_models(self._transport, self._fixtures_ep, Fixture,
+                            'matches')
 
-        data = r.json()
-        fixture_list = []
-        for fixture in data['matches']:
-            fixture_list.append(Fixture(fixture))
-        return fixture_list
+    def iter_fixtures(self):
+        """Same as ``get_fixtures``, but yields the Fixture objects one at a
+        time while the response is streamed, without holding them all in
+        memory.
+
+        Sends one request to api.football-data.org.
+
+        :returns: fixture_iter: An iterator of Fixture objects.
+        """
+        return iter_models(self._transport, self._fixtures_ep, Fixture,
+                           'matches')
 
     def get_teams(self):
         """Return a list of Team objects representing the teams in this
@@ -60,15 +85,8 @@ class Competition():
 
         :returns: team_list: A list of Team objects.
         """
-        r = requests.get(self._teams_ep, headers=globals.headers)
-        globals.update_prev_response(r, self._teams_ep)
-        r.raise_for_status()
-
-        data = r.json()
-        team_list = []
-        for tm in data['teams']:
-            team_list.append(Team(tm))
-        return team_list
+        return fetch_models(self._transport, self._teams_ep, Team,
+                            'teams', bind=True)
 
     def get_league_table(self):
         """Return the league table for this competition.
@@ -77,8 +95,77 @@ class Competition():
 
         :returns: LeagueTable: A LeagueTable object.
         """
-        r = requests.get(self._league_table_ep, headers=globals.headers)
-        globals.update_prev_response(r, self._league_table_ep)
-        r.raise_for_status()
+        return fetch_models(self._transport, self._league_table_ep, Standings)
+
+    def save_snapshot(self, path):
+        """Writes a snapshot file of this competition, its teams, fixtures
+        and league table, to be loaded with Football's snapshot kwarg.
+
+        Sends up to four requests to api.football-data.org, one for each
+        resource that isn't cached.
+
+        :param path: The file to write.
+        :type path: string
+        """
+        from pyfootball.snapshot import save_snapshot, competition_keys
+        save_snapshot(self._transport, path, competition_keys(self.id))
+
+    async def get_fixtures_async(self, as_frame=False):
+        """Awaitable version of ``get_fixtures``.
+
+        Sends one request to api.football-data.org.
 
-        return Standings(r.json())
+        :keyword as_frame: Whether to return a FixtureFrame instead of a
+            list. Requires numpy.
+        :type as_frame: bool
+
+        :returns: fixture_list: A list of Fixture objects.
+        """
+        if as_frame:
+            from pyfootball.frame import fetch_frame_async
+            return await fetch_frame_async(self._transport,
+                                           self._fixtures_ep)
+        return await fetch_models_async(self._transport, self._fixtures_ep,
+                                        Fixture, 'matches')
+
+    async def get_teams_async(self):
+        """Awaitable version of ``get_teams``.
+
+        Sends one request to api.football-data.org.
+
+        :returns: team_list: A list of Team objects.
+        """
+        return await fetch_models_async(self._transport, self._teams_ep,
+                                        Team, 'teams', bind=True)
+
+    async def get_league_table_async(self):
+        """Awaitable version of ``get_league_table``.
+
+        Sends one request to api.football-data.org.
+
+        :returns: LeagueTable: A LeagueTable object.
+        """
+        return await fetch_models_async(self._transport,
+                                        self._league_table_ep, Standings)
+
+
+@lazy_fields(_FIELDS)
+class LazyCompetition(Competition):
+    """A Competition that keeps a reference to its raw dict and decodes
+    each attribute the first time it is read.
+    """
+    numberOfAvailableSeasons = LazyAttribute(
+        'numberOfAvailableSeasons',
+        lambda self: _available_seasons(self._data))
+    _teams_ep = LazyAttribute(
+        '_teams_ep', lambda self: endpoints['comp_teams'].format(self.id))
+    _fixtures_ep = LazyAttribute(
+        '_fixtures_ep',
+        lambda self: endpoints['comp_fixtures'].format(self.id))
+    _league_table_ep = LazyAttribute(
+        '_league_table_ep',
+        lambda self: endpoints['league_table'].format(self.id))
+
+    def __init__(self, data, transport=None):
+        self._data = data
+        self._transport = transport
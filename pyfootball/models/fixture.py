@@ -1,8 +1,37 @@
 import traceback
-from datetime import datetime
 
+from pyfootball.decoding import Field, LazyAttribute, compile_decoder, \
+    lazy_fields, parse_datetime, shared_fields
+
+_FIELDS = [
+    Field('area'),
+    Field('competition'),
+    Field('season'),
+    Field('id'),
+    Field('date', 'utcDate', parse_datetime),
+    Field('status'),
+    Field('matchday'),
+    Field('stage'),
+    Field('group'),
+    Field('lastUpdated'),
+    Field('home_team', 'homeTeam'),
+    Field('home_team_id', 'homeTeam.id'),
+    Field('home_team_name', 'homeTeam.name'),
+    Field('away_team', 'awayTeam'),
+    Field('away_team_id', 'awayTeam.id'),
+    Field('away_team_name', 'awayTeam.name'),
+    Field('score'),
+    Field('odds'),
+    Field('referees'),
+]
+# Sub-objects that repeat across the fixtures of a season.
+_SHARED = ['area', 'competition', 'season', 'status', 'stage', 'group',
+           'home_team', 'home_team_name', 'away_team', 'away_team_name']
+
+
+class _FixtureBase(object):
+    __slots__ = ()
 
-class Fixture(object):
     def __init__(self, data):
         """Takes a dict converted from the JSON response by the API and wraps
         the fixture data within an object.
@@ -10,36 +39,56 @@ class Fixture(object):
         :param data: The fixture data from the API's response.
         :type data: dict
         """
-        self.area = data['area']
-        self.competition = data['competition']
-        self.season = data['season']
-        self.id = data['id']
-        self.date = datetime.strptime(data['utcDate'], '%Y-%m-%dT%H:%M:%SZ')
-        self.status = data['status']
-        self.matchday = data['matchday']
-        self.stage = data['stage']
-        self.group = data['group']
-        self.lastUpdated = data['lastUpdated']
-        self.home_team = data['homeTeam']
-        self.home_team_id = self.home_team['id']
-        self.home_team_name = self.home_team['name']
-        self.away_team = data['awayTeam']
-        self.away_team_id = self.away_team['id']
-        self.away_team_name = self.away_team['name']
-        self.score = data['score']
-        self.odds = data['odds']
-        self.referees = data['referees']
+        self._decode(data)
+        self.winner = self._get_winner()
 
+    def _get_winner(self):
         if self.status == 'FINISHED':
             if self.score['winner'] == 'HOME_TEAM':
-                self.winner = self.home_team_name
+                return self.home_team_name
             elif self.score['winner'] == 'AWAY_TEAM':
-                self.winner = self.away_team_name
+                return self.away_team_name
             else:
-                self.winner = 'DRAW'
-        else:
-            self.winner = None
+                return 'DRAW'
+        return None
 
     def __repr__(self):
         return f"[{self.date}] {self.home_team_name} vs {self.away_team_name}"
 
+
+def _raw_winner(data):
+    # Same as _FixtureBase._get_winner, without decoding other attributes.
+    if data['status'] != 'FINISHED':
+        return None
+    winner = data['score']['winner']
+    if winner == 'HOME_TEAM':
+        return data['homeTeam']['name']
+    elif winner == 'AWAY_TEAM':
+        return data['awayTeam']['name']
+    return 'DRAW'
+
+
+class Fixture(_FixtureBase):
+    _decode = compile_decoder(_FIELDS, 'decode_fixture')
+
+
+class CompactFixture(_FixtureBase):
+    """A Fixture without a per-instance ``__dict__``, whose nested area,
+    team, competition and season dicts are shared with every other
+    compact model holding equal ones. It has the same attributes as
+    Fixture, and they must be treated as read-only.
+    """
+    __slots__ = tuple(field.attr for field in _FIELDS) + ('winner',)
+    _decode = compile_decoder(shared_fields(_FIELDS, _SHARED),
+                              'decode_compact_fixture')
+
+
+@lazy_fields(_FIELDS)
+class LazyFixture(Fixture):
+    """A Fixture that keeps a reference to its raw dict and decodes each
+    attribute, including ``winner``, the first time it is read.
+    """
+    winner = LazyAttribute('winner', lambda self: _raw_winner(self._data))
+
+    def __init__(self, data):
+        self._data = data
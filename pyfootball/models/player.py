@@ -1,5 +1,19 @@
 import traceback
-from datetime import datetime
+
+from pyfootball.decoding import Field, compile_decoder, lazy_fields, \
+    parse_date, shared_fields
+
+_FIELDS = [
+    Field('id'),
+    Field('name'),
+    Field('position'),
+    Field('date_of_birth', 'dateOfBirth', parse_date),
+    Field('nationality'),
+    Field('shirt_number', 'shirtNumber', default=None),
+    Field('lastUpdated', default=None),
+    Field('currentTeam', default=None),
+]
+_decode = compile_decoder(_FIELDS, 'decode_player')
 
 
 class Player():
@@ -10,12 +24,27 @@ class Player():
         :param data: The player data from the API's response.
         :type data: dict
         """
-        self.id = data['id']
-        self.name = data['name']
-        self.position = data['position']
-        self.date_of_birth = datetime.strptime(data['dateOfBirth'],
-                                               '%Y-%m-%d').date()
-        self.nationality = data['nationality']
-        self.shirt_number = data.get('shirtNumber')
-        self.lastUpdated = data.get('lastUpdated')
-        self.currentTeam = data.get('currentTeam')
+        _decode(self, data)
+
+
+class CompactPlayer(object):
+    """A Player without a per-instance ``__dict__``, whose position,
+    nationality and current team are shared with every other compact model
+    holding equal ones. It has the same attributes as Player.
+    """
+    __slots__ = tuple(field.attr for field in _FIELDS)
+    _decode = compile_decoder(
+        shared_fields(_FIELDS, ['position', 'nationality', 'currentTeam']),
+        'decode_compact_player')
+
+    def __init__(self, data):
+        self._decode(data)
+
+
+@lazy_fields(_FIELDS)
+class LazyPlayer(Player):
+    """A Player that keeps a reference to its raw dict and decodes each
+    attribute the first time it is read.
+    """
+    def __init__(self, data):
+        self._data = data
@@ -1,5 +1,28 @@
 import traceback
 
+from pyfootball.decoding import Field, LazyAttribute, compile_decoder, \
+    lazy_fields, shared_fields, share
+
+_STANDING_FIELDS = [
+    Field('position'),
+    Field('team'),
+    Field('team_id', 'team.id'),
+    Field('team_name', 'team.name'),
+    Field('team_shortName', 'team.shortName'),
+    Field('team_tla', 'team.tla'),
+    Field('team_crest', 'team.crest'),
+    Field('games_played', 'playedGames'),
+    Field('form'),
+    Field('wins', 'won'),
+    Field('draws', 'draw'),
+    Field('losses', 'lost'),
+    Field('points'),
+    Field('goals', 'goalsFor'),
+    Field('goals_against', 'goalsAgainst'),
+    Field('goal_difference', 'goalDifference'),
+]
+_decode_standing = compile_decoder(_STANDING_FIELDS, 'decode_standing')
+
 
 class Standings(object):
     def __init__(self, data):
@@ -20,6 +43,73 @@ class Standings(object):
         elif self.competition['type'] == 'LEAGUE_CUP':
             self.total_standings = data['standings']    # TODO fix for LEAGUE_CUP type
 
+    @classmethod
+    def from_fixtures(cls, fixtures, tie_breaks=None, points=(3, 1, 0)):
+        """Computes the league table from a competition's fixtures instead
+        of requesting it. See ``pyfootball.tables.compute_standings``.
+
+        :param fixtures: The competition's fixtures.
+        :type fixtures: list of Fixture or FixtureFrame
+
+        :returns: Standings: A Standings object.
+        """
+        # Imported here because the table engine builds Standings objects.
+        from pyfootball.tables import compute_standings
+        standings = compute_standings(fixtures, tie_breaks, points, cls=cls)
+        # Tracked on the first call to apply, so that building a table
+        # that is never updated costs nothing more.
+        standings._untracked = (fixtures, tie_breaks, points)
+        return standings
+
+    def track(self, fixtures, tie_breaks=None, points=(3, 1, 0)):
+        """Records the results this table already counts, so that later
+        changes to them passed to ``apply`` are applied as corrections. A
+        table returned by ``from_fixtures`` tracks its fixtures already.
+
+        :param fixtures: Fixtures of the league's season.
+        :type fixtures: list of Fixture or FixtureFrame
+        :keyword tie_breaks: The rules that order teams when the table is
+            updated, as in ``from_fixtures``.
+        :type tie_breaks: list
+        :keyword points: The points for a win, a draw and a loss.
+        :type points: tuple
+        """
+        from pyfootball.tables import TableUpdater
+        self._untracked = None
+        self._updater = TableUpdater(self, tie_breaks, points)
+        self._updater.track(fixtures)
+
+    def apply(self, fixture):
+        """Updates the table in place for a change to a fixture: a new
+        result, a corrected score, or a match that finished. Only the rows
+        of the fixture's teams are recomputed, and moved to their new
+        positions. See ``pyfootball.tables.TableUpdater``. Every call to
+        ``get_league_table`` returns a table of its own, even from a client
+        with a cache, so other callers' tables are left as they are.
+
+        :param fixture: The fixture, in its current state.
+        :type fixture: Fixture or dict
+
+        :returns: changed: Whether the table changed.
+        """
+        updater = self.__dict__.get('_updater')
+        if updater is None:
+            untracked = self.__dict__.get('_untracked')
+            if untracked is not None:
+                self.track(*untracked)
+            else:
+                from pyfootball.tables import TableUpdater
+                self._updater = TableUpdater(self)
+            updater = self._updater
+        return updater.apply(fixture)
+
+    def apply_many(self, fixtures):
+        """Calls ``apply`` for each fixture, in order.
+
+        :returns: changed: The number of fixtures that changed the table.
+        """
+        return sum(self.apply(fixture) for fixture in fixtures)
+
     def create_standings_list(self, data):
         _standings_list = []
         for pos in data['table']:
@@ -31,19 +121,69 @@ class Standings(object):
             """A private LeagueTable class that stores information about
             a given position in the table.
             """
-            self.position = data['position']
-            self.team = data['team']
-            self.team_id = self.team['id']
-            self.team_name = self.team['name']
-            self.team_shortName = self.team['shortName']
-            self.team_tla = self.team['tla']
-            self.team_crest = self.team['crest']
-            self.games_played = data['playedGames']
-            self.form = data['form']
-            self.wins = data['won']
-            self.draws = data['draw']
-            self.losses = data['lost']
-            self.points = data['points']
-            self.goals = data['goalsFor']
-            self.goals_against = data['goalsAgainst']
-            self.goal_difference = data['goalDifference']
\ No newline at end of file
+            _decode_standing(self, data)
+
+
+class CompactStanding(object):
+    """A Standings.Standing without a per-instance ``__dict__``, whose team
+    dict is shared with every other compact model holding an equal one. It
+    has the same attributes as Standings.Standing.
+    """
+    __slots__ = tuple(field.attr for field in _STANDING_FIELDS)
+    _decode = compile_decoder(
+        shared_fields(_STANDING_FIELDS, ['team', 'team_name',
+                                         'team_shortName', 'team_tla',
+                                         'team_crest', 'form']),
+        'decode_compact_standing')
+
+    def __init__(self, data):
+        self._decode(data)
+
+
+class CompactStandings(Standings):
+    """Standings whose table entries are CompactStanding objects, and whose
+    area, competition and season dicts are shared.
+    """
+    Standing = CompactStanding
+
+    def __init__(self, data):
+        super(CompactStandings, self).__init__(data)
+        self.area = share(self.area)
+        self.competition = share(self.competition)
+        self.season = share(self.season)
+
+
+@lazy_fields(_STANDING_FIELDS)
+class LazyStanding(Standings.Standing):
+    """A Standings.Standing that keeps a reference to its raw dict and
+    decodes each attribute the first time it is read.
+    """
+    def __init__(self, data):
+        self._data = data
+
+
+_TABLES = ['total_standings', 'home_standings', 'away_standings']
+
+
+def _lazy_table(index):
+    def get(self):
+        if self.competition['type'] == 'LEAGUE':
+            return self.create_standings_list(self._data['standings'][index])
+        elif self.competition['type'] == 'LEAGUE_CUP' and index == 0:
+            return self._data['standings']
+        raise AttributeError(_TABLES[index])
+    return get
+
+
+@lazy_fields([Field('area'), Field('competition'), Field('season')])
+class LazyStandings(Standings):
+    """Standings that keep a reference to their raw dict and build each
+    table, of LazyStanding objects, the first time it is read.
+    """
+    Standing = LazyStanding
+    total_standings = LazyAttribute(_TABLES[0], _lazy_table(0))
+    home_standings = LazyAttribute(_TABLES[1], _lazy_table(1))
+    away_standings = LazyAttribute(_TABLES[2], _lazy_table(2))
+
+    def __init__(self, data):
+        self._data = data
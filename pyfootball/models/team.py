@@ -1,56 +1,78 @@
 import traceback
-import requests
 
-from pyfootball import globals
+from pyfootball.decoding import Field, LazyAttribute, compile_decoder, \
+    lazy_fields
 from pyfootball.globals import endpoints
+from pyfootball.transport import fetch_models, fetch_models_async, \
+    iter_models
 from .player import Player
 from .fixture import Fixture
 
+_FIELDS = [
+    Field('id'),
+    Field('name'),
+    Field('short_name', 'shortName'),
+    Field('code', 'tla'),
+    Field('crest_url', 'crest'),
+    Field('address'),
+    Field('website'),
+    Field('founded'),
+    Field('clubColors'),
+    Field('venue'),
+    Field('runningCompetitions'),
+    Field('coach'),
+    Field('squad'),
+    Field('staff'),
+    Field('lastUpdated'),
+]
+_decode = compile_decoder(_FIELDS, 'decode_team')
+
 
 class Team(object):
-    def __init__(self, data):
+    def __init__(self, data, transport=None):
         """Takes a dict converted from the JSON response by the API and wraps
         the team data within an object.
 
         :param data: The team data from the API's response.
         :type data: dict
+        :keyword transport: The Transport used for this object's requests.
+            Defaults to the process-wide Transport.
+        :type transport: Transport
         """
-        self.id = data['id']
-        self.name = data['name']
-        self.short_name = data['shortName']
-        self.code = data['tla']
-        self.crest_url = data['crest']
-        self.address = data['address']
-        self.website = data['website']
-        self.founded = data['founded']
-        self.clubColors = data['clubColors']
-        self.venue = data['venue']
-        self.runningCompetitions = data['runningCompetitions']
-        self.coach = data['coach']
-        self.squad = data['squad']
-        self.staff = data['staff']
-        self.lastUpdated = data['lastUpdated']
-
+        _decode(self, data)
+        self._transport = transport
         self._fixtures_ep = endpoints['team_fixtures'].format(self.id)
         self._players_ep = endpoints['team'].format(self.id)
 
-    def get_fixtures(self):
+    def get_fixtures(self, as_frame=False):
         """Return a list of Fixture objects representing this season's
         fixtures for the current team.
 
         Sends one request to api.football-data.org.
 
+        :keyword as_frame: Whether to return a FixtureFrame instead of a
+            list. Requires numpy.
+        :type as_frame: bool
+
         :returns: fixture_list: A list of Fixture objects.
         """
-        r = requests.get(self._fixtures_ep, headers=globals.headers)
-        globals.update_prev_response(r, self._fixtures_ep)
-        r.raise_for_status()
+        if as_frame:
+            from pyfootball.frame import fetch_frame
+            return fetch_frame(self._transport, self._fixtures_ep)
+        return fetch_models(self._transport, self._fixtures_ep, Fixture,
+                            'matches')
+
+    def iter_fixtures(self):
+        """Same as ``get_fixtures``, but yields the Fixture objects one at a
+        time while the response is streamed, without holding them all in
+        memory.
+
+        Sends one request to api.football-data.org.
 
-        data = r.json()
-        fixture_list = []
-        for fixture in data['matches']:
-            fixture_list.append(Fixture(fixture))
-        return fixture_list
+        :returns: fixture_iter: An iterator of Fixture objects.
+        """
+        return iter_models(self._transport, self._fixtures_ep, Fixture,
+                           'matches')
 
     def get_players(self):
         """Return a list of Player objects representing players on the current
@@ -60,12 +82,49 @@ class Team(object):
 
         :returns: player_list: A list of Player objects.
         """
-        r = requests.get(self._players_ep, headers=globals.headers)
-        globals.update_prev_response(r, self._players_ep)
-        r.raise_for_status()
-
-        data = r.json()
-        player_list = []
-        for player in data['squad']:
-            player_list.append(Player(player))
-        return player_list
+        return fetch_models(self._transport, self._players_ep, Player,
+                            'squad')
+
+    async def get_fixtures_async(self, as_frame=False):
+        """Awaitable version of ``get_fixtures``.
+
+        Sends one request to api.football-data.org.
+
+        :keyword as_frame: Whether to return a FixtureFrame instead of a
+            list. Requires numpy.
+        :type as_frame: bool
+
+        :returns: fixture_list: A list of Fixture objects.
+        """
+        if as_frame:
+            from pyfootball.frame import fetch_frame_async
+            return await fetch_frame_async(self._transport,
+                                           self._fixtures_ep)
+        return await fetch_models_async(self._transport, self._fixtures_ep,
+                                        Fixture, 'matches')
+
+    async def get_players_async(self):
+        """Awaitable version of ``get_players``.
+
+        Sends one request to api.football-data.org.
+
+        :returns: player_list: A list of Player objects.
+        """
+        return await fetch_models_async(self._transport, self._players_ep,
+                                        Player, 'squad')
+
+
+@lazy_fields(_FIELDS)
+class LazyTeam(Team):
+    """A Team that keeps a reference to its raw dict and decodes each
+    attribute the first time it is read.
+    """
+    _fixtures_ep = LazyAttribute(
+        '_fixtures_ep',
+        lambda self: endpoints['team_fixtures'].format(self.id))
+    _players_ep = LazyAttribute(
+        '_players_ep', lambda self: endpoints['team'].format(self.id))
+
+    def __init__(self, data, transport=None):
+        self._data = data
+        self._transport = transport
@@ -0,0 +1,184 @@
+import threading
+import time
+
+AVAILABLE_HEADER = 'X-Requests-Available-Minute'
+RESET_HEADER = 'X-RequestCounter-Reset'
+
+DEFAULT_PERIOD = 60.0
+DEFAULT_PACE_BELOW = 0.25
+
+
+def _header_number(headers, name):
+    value = headers.get(name)
+    if not isinstance(value, (str, int, float)):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class TokenBucket(object):
+    def __init__(self, period=DEFAULT_PERIOD, pace_below=DEFAULT_PACE_BELOW):
+        """Tracks the request budget of a single API key. The bucket is
+        filled from the ``X-Requests-Available-Minute`` and
+        ``X-RequestCounter-Reset`` headers of every response and refilled
+        once the API's counter resets.
+
+        Until the first response with those headers arrives the budget is
+        unknown and requests are never delayed. Once fewer than
+        ``pace_below`` of the tokens are left, the remaining ones are spread
+        evenly over the time left until the counter resets instead of being
+        spent in one burst.
+
+        :keyword period: Seconds after which the counter resets when the
+            API doesn't say otherwise.
+        :type period: float
+        :keyword pace_below: Fraction of the capacity below which requests
+            are spaced out.
+        :type pace_below: float
+        """
+        self.period = period
+        self.pace_below = pace_below
+        self.capacity = None
+        self.tokens = None
+        self.reset_at = None
+        self._next_slot = 0.0
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        if self.reset_at is not None and now >= self.reset_at:
+            # A capacity of zero means none has been seen yet.
+            self.tokens = self.capacity or None
+            elapsed = now - self.reset_at
+            self.reset_at += self.period * (1 + elapsed // self.period)
+            self._next_slot = 0.0
+
+    def _delay(self, now):
+        self._refill(now)
+        if self.tokens is None:
+            return 0.0
+        if self.tokens < 1:
+            return self.reset_at - now
+        if self.tokens <= self.capacity * self.pace_below:
+            return max(0.0, self._next_slot - now)
+        return 0.0
+
+    def _take(self, now):
+        delay = self._delay(now)
+        if delay > 0:
+            return delay
+        if self.tokens is not None:
+            self.tokens -= 1
+            if self.reset_at is not None and self.tokens > 0:
+                interval = (self.reset_at - now) / (self.tokens + 1)
+                self._next_slot = now + interval
+        return 0.0
+
+    def try_acquire(self):
+        """Takes one token if a request may be sent right now, without
+        blocking.
+
+        :returns: delay: 0 if a token was taken, otherwise the number of
+            seconds to wait before trying again.
+        """
+        with self._cond:
+            return self._take(time.monotonic())
+
+    def acquire(self):
+        """Blocks until a request may be sent without exceeding the budget,
+        then takes one token.
+
+        :returns: waited: The number of seconds spent waiting.
+        """
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                delay = self._take(time.monotonic())
+                if delay <= 0:
+                    break
+                self._cond.wait(delay)
+        return time.monotonic() - start
+
+    def update(self, headers, status_code=None):
+        """Updates the budget from the headers of a response.
+
+        :param headers: The response headers.
+        :type headers: dict
+        :keyword status_code: The response status code. A 429 empties the
+            bucket until the counter resets.
+        :type status_code: integer
+        """
+        available = _header_number(headers, AVAILABLE_HEADER)
+        reset = _header_number(headers, RESET_HEADER)
+        if available is None and status_code != 429:
+            return
+
+        with self._cond:
+            now = time.monotonic()
+            reset_at = now + (reset if reset is not None else self.period)
+            if status_code == 429:
+                self.tokens = 0
+            elif (self.tokens is None or self.reset_at is None
+                  or reset_at > self.reset_at + 1):
+                # The API's counter has rolled over since the last response.
+                self.tokens = int(available)
+            else:
+                self.tokens = min(self.tokens, int(available))
+            if available is not None:
+                self.capacity = max(self.capacity or 0, int(available))
+            self.reset_at = reset_at
+            self._cond.notify_all()
+
+
+class RateLimiter(object):
+    def __init__(self, period=DEFAULT_PERIOD, pace_below=DEFAULT_PACE_BELOW):
+        """Keeps one TokenBucket per API key, so that every client using
+        the same key draws from the same budget.
+
+        :keyword period: See TokenBucket.
+        :type period: float
+        :keyword pace_below: See TokenBucket.
+        :type pace_below: float
+        """
+        self.period = period
+        self.pace_below = pace_below
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, key):
+        """Returns the TokenBucket for an API key, creating it if needed.
+
+        :param key: The API key.
+        :type key: string
+
+        :returns: TokenBucket: The key's bucket.
+        """
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.setdefault(
+                    key, TokenBucket(self.period, self.pace_below))
+        return bucket
+
+    def acquire(self, key):
+        """Blocks until a request may be sent with the given key.
+
+        :returns: waited: The number of seconds spent waiting.
+        """
+        return self.bucket(key).acquire()
+
+    def try_acquire(self, key):
+        """Takes a token for the given key if one is available right now.
+
+        :returns: delay: 0 if a token was taken, otherwise the number of
+            seconds to wait before trying again.
+        """
+        return self.bucket(key).try_acquire()
+
+    def update(self, key, headers, status_code=None):
+        """Updates the key's budget from the headers of a response."""
+        self.bucket(key).update(headers, status_code)
+
+
+default_limiter = RateLimiter()
@@ -0,0 +1,102 @@
+import threading
+
+
+class _Call(object):
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    def __init__(self):
+        """Deduplicates concurrent calls across threads: while a call for a
+        key is in flight, further calls for the same key wait for it and
+        receive its result (or exception) instead of making their own.
+
+        ``coalesced`` counts the calls that were served this way.
+        """
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args):
+        """Calls ``fn(*args)``, unless a call for key is already in flight,
+        in which case its result is waited for and returned.
+
+        :param key: Identifies calls that can share a result.
+        :type key: string
+        :param fn: The function to call.
+        :type fn: callable
+
+        :returns: The result of the call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+
+class AsyncSingleFlight(object):
+    def __init__(self):
+        """The asyncio counterpart of SingleFlight, deduplicating concurrent
+        calls made on one event loop.
+        """
+        self.coalesced = 0
+        self._calls = {}
+
+    async def do(self, key, fn, *args):
+        """Awaits ``fn(*args)``, unless a call for key is already in flight,
+        in which case its result is awaited and returned. A caller that is
+        cancelled stops waiting, but the call goes on for the others, and is
+        only cancelled once no caller is waiting for it.
+
+        :param key: Identifies calls that can share a result.
+        :type key: string
+        :param fn: The coroutine function to call.
+        :type fn: callable
+
+        :returns: The result of the call.
+        """
+        import asyncio
+
+        call = self._calls.get(key)
+        if call is None:
+            # fn runs in a task of its own, so that cancelling the caller
+            # that started it doesn't cancel the callers waiting for it.
+            task = asyncio.ensure_future(fn(*args))
+            call = self._calls[key] = [task, 0]
+            task.add_done_callback(
+                lambda task: self._calls.pop(key, None)
+                if self._calls.get(key) is call else None)
+        else:
+            self.coalesced += 1
+        task = call[0]
+        call[1] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            call[1] -= 1
+            # The last caller gave up waiting; nobody needs the result.
+            if call[1] == 0 and not task.done():
+                task.cancel()
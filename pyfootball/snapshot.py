@@ -0,0 +1,265 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+from pyfootball.cache import DEFAULT_TTLS, DEFAULT_LIVE_TTL, resource_ttl, \
+    cache_key
+from pyfootball.diskcache import payload_version
+from pyfootball.globals import endpoints
+from pyfootball.transport import fetch_json, _resolve
+
+MAGIC = b'PYFBSNAP'
+FORMAT_VERSION = 1
+
+# The magic bytes, the format version, the number of entries, the offset of
+# the index and the time the snapshot was written.
+_HEADER = struct.Struct('<8sHxxIQd')
+
+SnapshotEntry = namedtuple('SnapshotEntry', ['key', 'offset', 'length',
+                                             'compressed', 'fetched_at',
+                                             'version'])
+
+
+def _encode(data):
+    return json.dumps(data, separators=(',', ':')).encode()
+
+
+def _version(data):
+    # The same fingerprint as payload_version, encoding the body only when
+    # it has no lastUpdated fields.
+    return payload_version(data, b'' if _has_stamps(data) else
+                           _encode(data))
+
+
+def _has_stamps(data):
+    if data.get('lastUpdated'):
+        return True
+    return any(isinstance(item, dict) and item.get('lastUpdated')
+               for value in data.values() if isinstance(value, list)
+               for item in value)
+
+
+def write_snapshot(path, bodies, compress=True):
+    """Writes response bodies to a snapshot file, replacing it atomically.
+
+    The file starts with a fixed-size header, followed by each body as
+    compact JSON, zlib-compressed if that makes it smaller, and ends with a
+    JSON index of the bodies' keys, offsets and fetch times.
+
+    :param path: The file to write.
+    :type path: string
+    :param bodies: The decoded bodies, keyed on their cache keys, as
+        ``(data, fetched_at)`` tuples with fetched_at in seconds since the
+        epoch.
+    :type bodies: dict
+    :keyword compress: Whether to compress the bodies.
+    :type compress: bool
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(b'\0' * _HEADER.size)
+            index = []
+            for key, (data, fetched_at) in bodies.items():
+                raw = _encode(data)
+                body, compressed = raw, False
+                if compress:
+                    packed = zlib.compress(raw, 6)
+                    if len(packed) < len(raw):
+                        body, compressed = packed, True
+                index.append([key, f.tell(), len(body), compressed,
+                              fetched_at, payload_version(data, raw)])
+                f.write(body)
+            index_offset = f.tell()
+            f.write(json.dumps(index, separators=(',', ':')).encode())
+            f.seek(0)
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(index),
+                                 index_offset, time.time()))
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class Snapshot(object):
+    def __init__(self, path, ttls=None, live_ttl=DEFAULT_LIVE_TTL,
+                 max_age=None):
+        """A snapshot file opened through a memory map, so that only its
+        index is read up front and each body is decoded the first time it
+        is asked for. A Transport with a snapshot answers ``get_json`` from
+        it while the body is fresh, and only requests what has gone stale
+        since the snapshot was written.
+
+        :param path: The snapshot file, written by ``write_snapshot``.
+        :type path: string
+        :keyword ttls: TTLs in seconds that override ``DEFAULT_TTLS``,
+            keyed on the names in ``globals.endpoints``.
+        :type ttls: dict
+        :keyword live_ttl: The TTL of fixture resources while a match is
+            in play.
+        :type live_ttl: integer
+        :keyword max_age: Seconds every body stays fresh, overriding the
+            TTLs, e.g. ``float('inf')`` to never send a request for a body
+            in the snapshot.
+        :type max_age: float
+        """
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.live_ttl = live_ttl
+        self.max_age = max_age
+        self._decoded = {}
+        self._lock = threading.Lock()
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, count, index_offset, self.created_at = \
+                _HEADER.unpack_from(self._map)
+        except struct.error:
+            magic = version = None
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("{} isn't a pyfootball snapshot.".format(path))
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError("{} has snapshot format version {}; expected "
+                             "{}.".format(path, version, FORMAT_VERSION))
+        index = json.loads(self._map[index_offset:].decode())
+        self.entries = {row[0]: SnapshotEntry(*row) for row in index}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def keys(self):
+        """Returns the cache keys of the bodies in the snapshot."""
+        return list(self.entries)
+
+    def fetched_at(self, key, data):
+        """Returns the time, in seconds since the epoch, at which the body
+        for a key was fetched, if data was decoded from it, else None.
+
+        :param key: The cache key.
+        :type key: string
+        :param data: A decoded response body.
+        :type data: dict
+        """
+        if self._decoded.get(key) is not data:
+            return None
+        return self.entries[key].fetched_at
+
+    def get(self, key):
+        """Returns the decoded body for a key, or None if the snapshot
+        doesn't have it. A body is decoded once and then shared, so it
+        should be treated as read-only.
+
+        :param key: The cache key.
+        :type key: string
+        """
+        data = self._decoded.get(key)
+        if data is not None:
+            return data
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        body = self._map[entry.offset:entry.offset + entry.length]
+        if entry.compressed:
+            body = zlib.decompress(body)
+        with self._lock:
+            return self._decoded.setdefault(key, json.loads(body))
+
+    def get_fresh(self, key, now=None):
+        """Same as ``get``, but returns None if the body has gone stale
+        since it was fetched."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        data = self.get(key)
+        if self.max_age is not None:
+            ttl = self.max_age
+        else:
+            ttl = resource_ttl(key, data, self.ttls, self.live_ttl)
+        now = time.time() if now is None else now
+        return data if entry.fetched_at + ttl > now else None
+
+    def revalidate(self, key, data, fetched_at=None):
+        """Takes a body just fetched for a key and, if it holds the same
+        data as the snapshot's, returns the snapshot's body instead, so that
+        it isn't decoded twice, and counts it as fetched when data was.
+
+        :param key: The cache key.
+        :type key: string
+        :param data: The fetched body.
+        :type data: dict
+        :keyword fetched_at: The time, in seconds since the epoch, at which
+            data was fetched, or None for now.
+        :type fetched_at: float
+        """
+        entry = self.entries.get(key)
+        if entry is None or _version(data) != entry.version:
+            return data
+        if fetched_at is None:
+            fetched_at = time.time()
+        self.entries[key] = entry._replace(
+            fetched_at=max(entry.fetched_at, fetched_at))
+        return self.get(key)
+
+    def close(self):
+        """Unmaps the file."""
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def competition_keys(comp_id):
+    """Returns the cache keys of everything a snapshot holds for one
+    competition: the competition, its teams, fixtures and league table."""
+    return [cache_key(endpoints[name].format(comp_id))
+            for name in ('competition', 'comp_teams', 'comp_fixtures',
+                         'league_table')]
+
+
+def save_snapshot(transport, path, keys):
+    """Fetches the given endpoints with a Transport, from its caches where
+    they are fresh, and writes them to a snapshot file.
+
+    :param transport: The Transport to fetch with, or None for the default
+        one.
+    :type transport: Transport
+    :param path: The file to write.
+    :type path: string
+    :param keys: The endpoint URLs.
+    :type keys: list
+    """
+    bodies = {}
+    resolved = _resolve(transport)
+    for key in keys:
+        data = fetch_json(transport, key)
+        bodies[key] = (data, _fetched_at(resolved, key, data))
+    write_snapshot(path, bodies)
+
+
+def _fetched_at(transport, key, data):
+    # A body served by the snapshot the Transport was loaded with or by one
+    # of its caches keeps the time it was fetched, so that it doesn't look
+    # fresher than it is. The memory cache comes last, as it may hold a body
+    # it was given by one of the others.
+    for source in (transport.snapshot, transport.disk_cache,
+                   transport.cache):
+        if source is not None:
+            fetched_at = source.fetched_at(key, data)
+            if fetched_at is not None:
+                return fetched_at
+    return time.time()
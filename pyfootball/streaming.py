@@ -0,0 +1,100 @@
+import codecs
+import json
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+
+
+class _Reader(object):
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        # Drop what has been consumed so the buffer only ever holds the
+        # value being parsed.
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+        for chunk in self._chunks:
+            if isinstance(chunk, bytes):
+                chunk = self._text.decode(chunk)
+            if chunk:
+                self._buf += chunk
+                return True
+        self._eof = True
+        return False
+
+    def _skip_whitespace(self):
+        while True:
+            while self._pos < len(self._buf) and \
+                    self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document")
+
+    def peek(self):
+        self._skip_whitespace()
+        return self._buf[self._pos]
+
+    def next(self, expected):
+        char = self.peek()
+        if char not in expected:
+            raise ValueError("Expected one of {!r} at offset {} but "
+                             "found {!r}".format(expected, self._pos, char))
+        self._pos += 1
+        return char
+
+    def value(self):
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            else:
+                # A number at the end of the buffer may continue in the
+                # next chunk.
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            self._fill()
+
+
+def iter_items(chunks, key):
+    """Yields the items of the array stored under ``key`` in a JSON object,
+    decoding them one at a time as the chunks of the document arrive, so
+    that only the item being decoded is held in memory rather than the whole
+    document. Values under other keys are decoded and discarded, and
+    whatever follows the array is not read.
+
+    :param chunks: The document as an iterable of bytes or str chunks.
+    :type chunks: iterable
+    :param key: The top-level key of the array.
+    :type key: string
+    """
+    reader = _Reader(chunks)
+    reader.next('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        name = reader.value()
+        reader.next(':')
+        if name == key:
+            reader.next('[')
+            if reader.peek() == ']':
+                return
+            while True:
+                yield reader.value()
+                if reader.next(',]') == ']':
+                    return
+        reader.value()
+        if reader.next(',}') == '}':
+            return
@@ -0,0 +1,434 @@
+import calendar
+from bisect import bisect_left
+
+from pyfootball.frame import FixtureFrame, STATUS_CODES, np, _require_numpy
+from pyfootball.models.fixture import Fixture
+from pyfootball.models.standings import Standings, _TABLES
+
+# Points for a win, a draw and a loss.
+DEFAULT_POINTS = (3, 1, 0)
+FORM_LENGTH = 5
+
+# The order of teams level on points in the Premier League.
+DEFAULT_TIE_BREAKS = ['points', 'goal_difference', 'goals_for']
+
+# Tie-break rules. Each maps to a per-team statistic and whether a higher
+# value ranks first. The head_to_head_* rules only count the matches
+# between teams level on points.
+TIE_BREAKS = {
+    'points': ('points', True),
+    'goal_difference': ('goal_difference', True),
+    'goals_for': ('goals_for', True),
+    'goals_against': ('goals_against', False),
+    'wins': ('won', True),
+    'away_goals_for': ('away_goals_for', True),
+    'head_to_head_points': ('h2h_points', True),
+    'head_to_head_goal_difference': ('h2h_goal_difference', True),
+    'head_to_head_goals_for': ('h2h_goals_for', True),
+}
+
+# Statuses whose score counts towards the table.
+COUNTED_STATUSES = ['FINISHED', 'AWARDED']
+
+_TABLE_TYPES = ['TOTAL', 'HOME', 'AWAY']
+_FORM_LETTERS = np.array(['L', 'D', 'W']) if np is not None else None
+
+
+class _Records(object):
+    # One row per team per match: the team's index, the opponent's index,
+    # goals for and against, and the match's kickoff time and ID.
+    def __init__(self, team, opponent, goals_for, goals_against, date,
+                 match_id, home):
+        self.team = team
+        self.opponent = opponent
+        self.goals_for = goals_for
+        self.goals_against = goals_against
+        self.date = date
+        self.match_id = match_id
+        self.home = home
+
+    @classmethod
+    def concat(cls, *records):
+        return cls(*[np.concatenate([getattr(r, name) for r in records])
+                     for name in ('team', 'opponent', 'goals_for',
+                                  'goals_against', 'date', 'match_id',
+                                  'home')])
+
+
+def _to_frame(fixtures):
+    if isinstance(fixtures, FixtureFrame):
+        return fixtures
+    return FixtureFrame.from_fixtures(fixtures)
+
+
+def _records(frame, team_ids):
+    counted = np.isin(frame.status, [STATUS_CODES[status]
+                                     for status in COUNTED_STATUSES])
+    counted &= (frame.home_goals != -1) & (frame.away_goals != -1)
+    f = frame[counted]
+    home = np.searchsorted(team_ids, f.home_team_id)
+    away = np.searchsorted(team_ids, f.away_team_id)
+    hg = f.home_goals.astype('int64')
+    ag = f.away_goals.astype('int64')
+    n = len(f)
+    home_records = _Records(home, away, hg, ag, f.utc_date, f.id,
+                            np.ones(n, dtype=bool))
+    away_records = _Records(away, home, ag, hg, f.utc_date, f.id,
+                            np.zeros(n, dtype=bool))
+    return home_records, away_records
+
+
+def _stats(records, n_teams, points):
+    def count(weights=None):
+        return np.bincount(records.team, weights=weights,
+                           minlength=n_teams).astype('int64')
+
+    gf, ga = records.goals_for, records.goals_against
+    stats = {
+        'played': count(),
+        'won': count(gf > ga),
+        'draw': count(gf == ga),
+        'lost': count(gf < ga),
+        'goals_for': count(gf),
+        'goals_against': count(ga),
+        'away_goals_for': count(np.where(records.home, 0, gf)),
+    }
+    stats['goal_difference'] = stats['goals_for'] - stats['goals_against']
+    stats['points'] = (stats['won'] * points[0] + stats['draw'] * points[1] +
+                       stats['lost'] * points[2])
+
+    # Head-to-head statistics, over the matches between teams level on
+    # points.
+    level = stats['points'][records.team] == \
+        stats['points'][records.opponent]
+    h2h_gf, h2h_ga = np.where(level, gf, 0), np.where(level, ga, 0)
+    stats['h2h_points'] = (count(level & (gf > ga)) * points[0] +
+                           count(level & (gf == ga)) * points[1] +
+                           count(level & (gf < ga)) * points[2])
+    stats['h2h_goals_for'] = count(h2h_gf)
+    stats['h2h_goal_difference'] = stats['h2h_goals_for'] - count(h2h_ga)
+    return stats
+
+
+def _form(records, n_teams):
+    # The results of each team's last FORM_LENGTH matches, latest first.
+    order = np.lexsort((-records.match_id, -records.date, records.team))
+    team = records.team[order]
+    result = np.sign(records.goals_for - records.goals_against)[order] + 1
+    starts = np.searchsorted(team, np.arange(n_teams))
+    rank = np.arange(len(team)) - starts[team]
+    recent = rank < FORM_LENGTH
+    letters = _FORM_LETTERS[result[recent]]
+    forms = [[] for i in range(n_teams)]
+    for t, letter in zip(team[recent].tolist(), letters.tolist()):
+        forms[t].append(letter)
+    return [','.join(form) or None for form in forms]
+
+
+def _ranking(stats, tie_breaks, names):
+    keys = [names]
+    for rule in reversed(tie_breaks):
+        try:
+            stat, descending = TIE_BREAKS[rule]
+        except KeyError:
+            raise ValueError("Unknown tie-break rule {!r}; expected one of "
+                             "{}.".format(rule, sorted(TIE_BREAKS)))
+        keys.append(-stats[stat] if descending else stats[stat])
+    return np.lexsort(keys)
+
+
+def _table(records, teams, tie_breaks, points):
+    n_teams = len(teams)
+    stats = _stats(records, n_teams, points)
+    forms = _form(records, n_teams)
+    names = np.array([team['name'] for team in teams])
+    table = []
+    for position, t in enumerate(_ranking(stats, tie_breaks, names).tolist(),
+                                 1):
+        table.append({
+            'position': position,
+            'team': teams[t],
+            'playedGames': int(stats['played'][t]),
+            'form': forms[t],
+            'won': int(stats['won'][t]),
+            'draw': int(stats['draw'][t]),
+            'lost': int(stats['lost'][t]),
+            'points': int(stats['points'][t]),
+            'goalsFor': int(stats['goals_for'][t]),
+            'goalsAgainst': int(stats['goals_against'][t]),
+            'goalDifference': int(stats['goal_difference'][t]),
+        })
+    return table
+
+
+def compute_table_data(fixtures, tie_breaks=None, points=DEFAULT_POINTS):
+    """Computes the body the API returns for a competition's league table
+    from the competition's fixtures. See ``compute_standings``.
+
+    :returns: data: The league table data, with the area, competition and
+        season of the first fixture.
+    """
+    _require_numpy()
+    frame = _to_frame(fixtures)
+    tie_breaks = DEFAULT_TIE_BREAKS if tie_breaks is None else tie_breaks
+    team_ids = np.unique(np.concatenate([frame.home_team_id,
+                                         frame.away_team_id]))
+    teams = [frame.teams[team_id] for team_id in team_ids.tolist()]
+    home, away = _records(frame, team_ids)
+    standings = []
+    for table_type, records in zip(_TABLE_TYPES, [_Records.concat(home, away),
+                                                  home, away]):
+        standings.append({
+            'stage': 'REGULAR_SEASON',
+            'type': table_type,
+            'group': None,
+            'table': _table(records, teams, tie_breaks, points),
+        })
+    data = dict(frame.meta)
+    data['competition'] = dict(data.get('competition') or {}, type='LEAGUE')
+    data['standings'] = standings
+    return data
+
+
+def compute_standings(fixtures, tie_breaks=None, points=DEFAULT_POINTS,
+                      cls=Standings):
+    """Computes a competition's league table from its fixtures, without
+    sending a request. The total, home and away tables have the shape of
+    those returned by ``Football.get_league_table``, and only the scores of
+    finished matches count. Requires numpy.
+
+    :param fixtures: Every fixture of the competition's season, or at least
+        one per team so that every team is listed.
+    :type fixtures: list of Fixture or FixtureFrame
+    :keyword tie_breaks: The rules that order teams, most significant
+        first, from the keys of ``TIE_BREAKS``. Teams still level are
+        ordered by name. Defaults to ``DEFAULT_TIE_BREAKS``.
+    :type tie_breaks: list
+    :keyword points: The points for a win, a draw and a loss.
+    :type points: tuple
+    :keyword cls: The class of the returned object.
+    :type cls: type
+
+    :returns: Standings: A Standings object.
+    """
+    return cls(compute_table_data(fixtures, tie_breaks, points))
+
+
+# The Standing attributes that TableUpdater ranks on, for each tie-break
+# rule it supports.
+_ROW_STATS = {
+    'points': 'points',
+    'goal_difference': 'goal_difference',
+    'goals_for': 'goals',
+    'goals_against': 'goals_against',
+    'wins': 'wins',
+}
+_RESULT_LETTERS = {1: 'W', 0: 'D', -1: 'L'}
+_RESULT_ATTRS = {1: 'wins', 0: 'draws', -1: 'losses'}
+
+
+def _result(fixture):
+    # The (home ID, away ID, home goals, away goals, kickoff, match ID) of a
+    # fixture whose score counts towards the table, or None.
+    if fixture.status not in COUNTED_STATUSES:
+        return None
+    full_time = fixture.score['fullTime']
+    if full_time['home'] is None or full_time['away'] is None:
+        return None
+    return (fixture.home_team_id, fixture.away_team_id, full_time['home'],
+            full_time['away'], calendar.timegm(fixture.date.timetuple()),
+            fixture.id)
+
+
+def _results(fixtures):
+    if isinstance(fixtures, FixtureFrame):
+        counted = fixtures.filter(status=COUNTED_STATUSES)
+        c = counted.columns
+        for result in zip(c['home_team_id'].tolist(),
+                          c['away_team_id'].tolist(),
+                          c['home_goals'].tolist(),
+                          c['away_goals'].tolist(),
+                          c['utc_date'].tolist(), c['id'].tolist()):
+            if result[2] != -1 and result[3] != -1:
+                yield result
+        return
+    for fixture in fixtures:
+        if isinstance(fixture, dict):
+            fixture = Fixture(fixture)
+        result = _result(fixture)
+        if result is not None:
+            yield result
+
+
+class TableUpdater(object):
+    def __init__(self, standings, tie_breaks=None, points=DEFAULT_POINTS):
+        """Keeps the tables of a Standings object up to date as results come
+        in, adjusting only the rows of the two teams of each changed match
+        and moving them to their new positions. Used through
+        ``Standings.track`` and ``Standings.apply``; doesn't require numpy.
+
+        A result is a match whose status is in ``COUNTED_STATUSES``. Every
+        result the tables already count should be passed to ``track`` so
+        that later changes to it are applied as corrections; a result that
+        wasn't is treated as new, and as the latest of both teams' matches
+        when their form is updated.
+
+        :param standings: The league's Standings object, updated in place.
+        :type standings: Standings
+        :keyword tie_breaks: The rules that order teams, as in
+            ``compute_standings``. The head-to-head rules aren't supported.
+        :type tie_breaks: list
+        :keyword points: The points for a win, a draw and a loss.
+        :type points: tuple
+        """
+        if standings.competition['type'] != 'LEAGUE':
+            raise ValueError("Only league tables can be updated.")
+        self.tie_breaks = DEFAULT_TIE_BREAKS if tie_breaks is None \
+            else tie_breaks
+        for rule in self.tie_breaks:
+            if rule not in _ROW_STATS and rule != 'away_goals_for':
+                raise ValueError("Tie-break rule {!r} can't be updated "
+                                 "incrementally; expected one of {}.".format(
+                                     rule,
+                                     sorted(_ROW_STATS) + ['away_goals_for']))
+        self.points = dict(zip((1, 0, -1), points))
+        self.tables = [getattr(standings, name) for name in _TABLES]
+        self.rows = [{row.team_id: row for row in table}
+                     for table in self.tables]
+        # The results each table counts, keyed on match ID, per team.
+        self.results = {}
+        self.history = [{team_id: {} for team_id in rows}
+                        for rows in self.rows]
+        # The form each table had before any tracked result, which trails
+        # the form of the tracked results.
+        self.base_form = [{team_id: (row.form or '').split(',')
+                           if row.form else []
+                           for team_id, row in rows.items()}
+                          for rows in self.rows]
+        for i, table in enumerate(self.tables):
+            table.sort(key=lambda row, i=i: self._key(i, row))
+            self._number(table, 0, len(table))
+        self.keys = [[self._key(i, row) for row in table]
+                     for i, table in enumerate(self.tables)]
+
+    def _key(self, i, row):
+        key = []
+        for rule in self.tie_breaks:
+            if rule == 'away_goals_for':
+                value = 0 if i == 1 else \
+                    self.rows[2][row.team_id].goals
+            else:
+                value = getattr(row, _ROW_STATS[rule])
+            key.append(value if rule == 'goals_against' else -value)
+        key.append(row.team_name)
+        return key
+
+    @staticmethod
+    def _number(table, start, stop):
+        for position in range(start, stop):
+            table[position].position = position + 1
+
+    def track(self, fixtures):
+        """Records results the tables already count, without changing
+        them. The form of every team is then taken from its tracked results
+        instead of the form the tables had.
+
+        :param fixtures: Fixtures of the league's season; those without a
+            result are skipped.
+        :type fixtures: list of Fixture or FixtureFrame
+        """
+        for result in _results(fixtures):
+            self.results[result[5]] = result
+            self._record(result, 1, count=False)
+        for i, history in enumerate(self.history):
+            for team_id in history:
+                self.base_form[i][team_id] = []
+                self._set_form(i, team_id)
+
+    def apply(self, fixture):
+        """Applies the current state of a fixture to the tables: a new
+        result is added, a corrected score replaces the old one, and a
+        result that no longer counts, e.g. an annulled match, is removed.
+
+        :param fixture: The fixture.
+        :type fixture: Fixture or dict
+
+        :returns: changed: Whether the tables changed.
+        """
+        if isinstance(fixture, dict):
+            fixture = Fixture(fixture)
+        new = _result(fixture)
+        old = self.results.get(fixture.id)
+        if new == old:
+            return False
+        for result in (old, new):
+            if result is not None and (result[0] not in self.rows[0] or
+                                       result[1] not in self.rows[0]):
+                raise ValueError("Fixture {} is between teams that aren't "
+                                 "in the table.".format(fixture.id))
+        if old is not None:
+            del self.results[fixture.id]
+            self._record(old, -1)
+        if new is not None:
+            self.results[fixture.id] = new
+            self._record(new, 1)
+        teams = {result[0] for result in (old, new) if result} | \
+            {result[1] for result in (old, new) if result}
+        for i in range(len(self.tables)):
+            for team_id in teams:
+                self._set_form(i, team_id)
+            self._move(i, [self.rows[i][team_id] for team_id in teams])
+        return True
+
+    def _record(self, result, sign, count=True):
+        # Adds a result to (or with a sign of -1, removes it from) the
+        # teams' histories and, if count is true, their rows.
+        home, away, home_goals, away_goals, date, match_id = result
+        for team_id, goals, against, venue in (
+                (home, home_goals, away_goals, 1),
+                (away, away_goals, home_goals, 2)):
+            outcome = (goals > against) - (goals < against)
+            for i in (0, venue):
+                history = self.history[i][team_id]
+                if sign > 0:
+                    history[match_id] = (date, match_id,
+                                         _RESULT_LETTERS[outcome])
+                else:
+                    del history[match_id]
+                if not count:
+                    continue
+                row = self.rows[i][team_id]
+                row.games_played += sign
+                attr = _RESULT_ATTRS[outcome]
+                setattr(row, attr, getattr(row, attr) + sign)
+                row.points += sign * self.points[outcome]
+                row.goals += sign * goals
+                row.goals_against += sign * against
+                row.goal_difference += sign * (goals - against)
+
+    def _set_form(self, i, team_id):
+        recent = sorted(self.history[i][team_id].values(),
+                        reverse=True)[:FORM_LENGTH]
+        letters = [result[2] for result in recent] + \
+            self.base_form[i][team_id]
+        self.rows[i][team_id].form = ','.join(letters[:FORM_LENGTH]) or None
+
+    def _move(self, i, rows):
+        # Takes the rows out, then puts each back where its new key sorts,
+        # and renumbers the positions in between.
+        table, keys = self.tables[i], self.keys[i]
+        start = stop = None
+        for row in rows:
+            old = table.index(row)
+            del table[old]
+            del keys[old]
+            start = old if start is None else min(start, old)
+            stop = old if stop is None else max(stop, old)
+        for row in rows:
+            key = self._key(i, row)
+            new = bisect_left(keys, key)
+            keys.insert(new, key)
+            table.insert(new, row)
+            start, stop = min(start, new), max(stop, new)
+        self._number(table, start, min(stop + len(rows), len(table)))
+
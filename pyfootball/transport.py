@@ -0,0 +1,524 @@
+import contextvars
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+from pyfootball import globals
+from pyfootball.ratelimit import default_limiter
+from pyfootball.instrumentation import Instrumentation, observe_response, \
+    sending
+from pyfootball.keypool import QUARANTINE_STATUSES
+from pyfootball.singleflight import SingleFlight
+from pyfootball.streaming import DEFAULT_CHUNK_SIZE, iter_items
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = (5, 30)
+DEFAULT_MODEL_MEMO_SIZE = 256
+
+_default_transport = None
+_default_transport_lock = threading.Lock()
+
+
+def __getattr__(name):
+    # requests takes longer to import than the rest of the package, so it
+    # is imported when the first session is created, or read from here.
+    if name == 'requests':
+        import requests
+        return requests
+    raise AttributeError("module {!r} has no attribute {!r}".format(
+        __name__, name))
+
+
+class Transport(object):
+    def __init__(self, headers=None, pool_size=DEFAULT_POOL_SIZE,
+                 timeout=DEFAULT_TIMEOUT, rate_limiter=default_limiter,
+                 base_url=None, cache=None, disk_cache=None,
+                 single_flight=True, model_classes=None, identity_map=None,
+                 snapshot=None, hooks=None, key_pool=None):
+        """Wraps a pooled, keep-alive ``requests.Session`` that is shared by
+        a ``Football`` instance and every model object it builds, so that
+        consecutive requests reuse open connections instead of paying for a
+        new TCP and TLS handshake each time.
+
+        :keyword headers: Default headers sent with every request. If None,
+            ``globals.headers`` is read at request time instead.
+        :type headers: dict
+        :keyword pool_size: The number of connections kept alive per host.
+        :type pool_size: integer
+        :keyword timeout: Seconds to wait for the server, either a single
+            number or a ``(connect, read)`` tuple.
+        :type timeout: float or tuple
+        :keyword rate_limiter: The RateLimiter that paces requests per API
+            key, shared by every Transport by default. None disables it.
+        :type rate_limiter: RateLimiter
+        :keyword base_url: A URL that replaces the football-data.org base URL
+            of every endpoint, e.g. to talk to a local test server.
+        :type base_url: string
+        :keyword cache: A ResponseCache consulted by ``get_json`` before
+            sending a request. None disables caching.
+        :type cache: ResponseCache
+        :keyword disk_cache: A DiskCache consulted by ``get_json`` after
+            the in-memory cache. None disables it.
+        :type disk_cache: DiskCache
+        :keyword single_flight: Whether concurrent ``get_json`` calls for
+            the same URL share one request. Their count is kept in
+            ``single_flight.coalesced``.
+        :type single_flight: bool
+        :keyword model_classes: Classes that ``build`` uses in place of the
+            regular model classes, keyed on the class they replace, e.g.
+            ``{Fixture: CompactFixture}``.
+        :type model_classes: dict
+        :keyword identity_map: An IdentityMap that ``build`` interns the
+            team, competition, area and season sub-objects of each body
+            with before building models from it. None disables it.
+        :type identity_map: IdentityMap
+        :keyword snapshot: A Snapshot consulted by ``get_json`` after the
+            in-memory cache. Stale bodies are requested again, and if they
+            haven't changed the snapshot's body is returned. None disables
+            it.
+        :type snapshot: Snapshot
+        :keyword hooks: Callables passed a RequestRecord for every call, see
+            ``instrumentation``. More can be added with
+            ``instrumentation.add_hook``.
+        :type hooks: list
+        :keyword key_pool: A KeyPool that picks the API key of each request
+            in place of the ``X-Auth-Token`` header. A request answered with
+            a 429 or 403 is sent again with another key.
+        :type key_pool: KeyPool
+        """
+        self.headers = headers
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.base_url = base_url
+        self.cache = cache
+        self.disk_cache = disk_cache
+        self.single_flight = SingleFlight() if single_flight else None
+        self.model_classes = model_classes or {}
+        self.identity_map = identity_map
+        self.snapshot = snapshot
+        self.instrumentation = Instrumentation(hooks or ())
+        self.key_pool = key_pool
+        self._built = OrderedDict()
+        self._built_lock = threading.Lock()
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """The pooled ``requests.Session``, created on first use."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._new_session()
+        return self._session
+
+    def _new_session(self):
+        import requests
+        from pyfootball.connections import TimingAdapter
+
+        session = requests.Session()
+        adapter = TimingAdapter(pool_connections=self.pool_size,
+                                pool_maxsize=self.pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def url(self, endpoint):
+        """Returns the URL that is actually requested for an endpoint."""
+        if self.base_url and endpoint.startswith(globals._base):
+            return self.base_url + endpoint[len(globals._base):]
+        return endpoint
+
+    def request_headers(self, headers=None):
+        """Returns the headers sent with a request, merging the default
+        headers with the given ones."""
+        request_headers = dict(self.headers if self.headers is not None
+                               else globals.headers)
+        if headers:
+            request_headers.update(headers)
+        return request_headers
+
+    def get(self, endpoint, params=None, headers=None, stream=False):
+        """Sends a GET request to the given endpoint over the pooled session
+        and returns the response. Raises an ``HTTPError`` if the response
+        status code is 4XX or 5XX.
+
+        The request waits for the rate limiter first, and is sent once more
+        after the counter resets if the API still answers with a 429. With a
+        KeyPool, it is sent again with another key after a 429 or 403.
+
+        :param endpoint: The full endpoint URL.
+        :type endpoint: string
+        :keyword params: Query string parameters.
+        :type params: dict
+        :keyword headers: Extra headers for this request only.
+        :type headers: dict
+        :keyword stream: Whether to leave the body unread, to be consumed
+            with ``Response.iter_content``.
+        :type stream: bool
+
+        :returns: response: The ``requests.Response`` object.
+        """
+        with self.instrumentation.request(endpoint, params) as record:
+            return self._get(endpoint, params, headers, stream, record)
+
+    def _get(self, endpoint, params, headers, stream, record):
+        request_headers = self.request_headers(headers)
+        key = request_headers.get('X-Auth-Token', '')
+        limiter = self.rate_limiter
+        pool = self.key_pool
+        attempts = 2 if pool is None else len(pool) + 1
+        start = time.perf_counter()
+        wait = 0.0
+        sending(record)
+        try:
+            for attempt in range(attempts):
+                if pool is not None:
+                    key = request_headers['X-Auth-Token'] = pool.choose()
+                if limiter is not None:
+                    wait_start = time.perf_counter()
+                    limiter.acquire(key)
+                    wait += time.perf_counter() - wait_start
+                # The body is always streamed, so that the time to the
+                # headers can be told apart from the time to the whole body.
+                r = self.session.get(self.url(endpoint), params=params,
+                                     headers=request_headers,
+                                     timeout=self.timeout, stream=True)
+                if not self._should_retry(key, r.headers, r.status_code) \
+                        or attempt == attempts - 1:
+                    break
+                r.close()
+                record['retries'] += 1
+        finally:
+            sending(None)
+        record['ttfb'] = time.perf_counter() - start - wait
+        if not stream:
+            r.content
+        record['total'] = time.perf_counter() - start - wait
+        record['rate_limit_wait'] = wait if limiter is not None else None
+        observe_response(record, r.headers, r.status_code,
+                         None if stream else len(r.content))
+        if record['cache'] is None:
+            record['cache'] = 'stream' if stream else 'miss'
+        r.raise_for_status()
+        return r
+
+    def _should_retry(self, key, headers, status_code):
+        # Updates the rate limiter and key pool from a response, and
+        # returns whether the request should be sent again.
+        if self.rate_limiter is not None:
+            self.rate_limiter.update(key, headers, status_code)
+        if self.key_pool is not None:
+            self.key_pool.update(key, headers, status_code)
+            return status_code in QUARANTINE_STATUSES
+        return self.rate_limiter is not None and status_code == 429
+
+    def get_json(self, endpoint, params=None):
+        """Same as ``get``, but returns the decoded JSON body. If the
+        Transport has a cache, a fresh cached body is returned without
+        sending a request, and a stale one in the disk cache is revalidated.
+        Concurrent calls for the same URL share one request.
+
+        :param endpoint: The full endpoint URL.
+        :type endpoint: string
+        :keyword params: Query string parameters.
+        :type params: dict
+
+        :returns: data: The decoded response body.
+        """
+        with self.instrumentation.request(endpoint, params) as record:
+            key = record['url']
+            if self.cache is not None:
+                data = self.cache.get(key)
+                if data is not None:
+                    record['cache'] = 'hit'
+                    return data
+            if self.snapshot is not None:
+                data = self.snapshot.get_fresh(key)
+                if data is not None:
+                    record['cache'] = 'snapshot'
+                    return data
+
+            if self.single_flight is None:
+                return self._fetch_json(key, endpoint, params, record)
+            data = self.single_flight.do(key, self._fetch_json, key,
+                                         endpoint, params, record)
+            if record['cache'] is None:
+                # Another call's request answered this one.
+                record['cache'] = 'coalesced'
+            return data
+
+    def _fetch_json(self, key, endpoint, params, record):
+        start = time.perf_counter()
+        fetched_at = None
+        if self.disk_cache is None:
+            r = self.get(endpoint, params=params)
+            start = time.perf_counter()
+            data, size = r.json(), len(r.content)
+        else:
+            data, headers, entry = self.disk_cache.lookup(key)
+            if data is None:
+                r = self.get(endpoint, params=params, headers=headers)
+                start = time.perf_counter()
+                data, reused = self.disk_cache.resolve(
+                    key, entry, r.status_code, r.content, r.headers)
+                size = len(r.content)
+                if reused:
+                    record['cache'] = 'revalidated'
+            else:
+                size = len(entry.body)
+                fetched_at = entry.fetched_at
+                record['cache'] = 'disk'
+        record['decode'] = time.perf_counter() - start
+
+        if self.snapshot is not None:
+            data = self.snapshot.revalidate(key, data, fetched_at)
+        if self.cache is not None:
+            # A body from the disk cache keeps the time it was fetched.
+            self.cache.set(key, data, size, fetched_at)
+        return data
+
+    def iter_json(self, endpoint, key, params=None,
+                  chunk_size=DEFAULT_CHUNK_SIZE):
+        """Sends a GET request to the given endpoint and yields the items of
+        the array under ``key`` in the response body, decoding them one at
+        a time as the body is received so that memory use doesn't grow with
+        the size of the response.
+
+        A fresh body in the in-memory cache or the snapshot is used without
+        a request, but streamed responses are neither cached nor shared
+        between concurrent callers.
+
+        :param endpoint: The full endpoint URL.
+        :type endpoint: string
+        :param key: The top-level key of the array.
+        :type key: string
+        :keyword params: Query string parameters.
+        :type params: dict
+        :keyword chunk_size: The number of bytes read from the socket at a
+            time.
+        :type chunk_size: integer
+        """
+        # The record isn't set as the current one: a generator's context is
+        # its caller's between items.
+        instrumentation = self.instrumentation
+        record = instrumentation.start(endpoint, params)
+        data = None
+        if self.cache is not None:
+            data = self.cache.get(record['url'])
+            record['cache'] = 'hit'
+        if data is None and self.snapshot is not None:
+            data = self.snapshot.get_fresh(record['url'])
+            record['cache'] = 'snapshot'
+        if data is not None:
+            instrumentation.finish(record)
+            yield from data[key]
+            return
+
+        record['cache'] = None
+        try:
+            r = self._get(endpoint, params, None, True, record)
+        except Exception:
+            instrumentation.finish(record)
+            raise
+        start = time.perf_counter() - record['total']
+        chunks = _counted(r.iter_content(chunk_size), record)
+        try:
+            yield from iter_items(chunks, key)
+        finally:
+            r.close()
+            record['total'] = time.perf_counter() - start
+            instrumentation.finish(record)
+
+    def build(self, endpoint, data, cls, key=None, **kwargs):
+        """Builds a cls object from a response body, or a list of them from
+        ``data[key]``, substituting the class given for it in
+        ``model_classes`` if there is one, and interning the body's
+        sub-objects if the Transport has an IdentityMap.
+
+        Model objects can be changed by their callers, so they are built anew
+        on every call. Only the results of classes (or their constructors)
+        whose class has a true ``read_only`` attribute, such as FixtureFrame,
+        are shared: if the Transport has a cache and returned the very same
+        body for the endpoint last time, the object built from it then is
+        returned instead of being rebuilt.
+
+        :param endpoint: The endpoint the body was fetched from.
+        :type endpoint: string
+        :param data: The decoded response body.
+        :type data: dict
+        :param cls: The model class.
+        :type cls: type
+        :keyword key: The key of the list to build objects from.
+        :type key: string
+
+        :returns: The model object, or a list of them.
+        """
+        cls = self.model_classes.get(cls, cls)
+        # FixtureFrame.from_response is passed as a bound classmethod.
+        owner = getattr(cls, '__self__', cls)
+        memoize = getattr(owner, 'read_only', False) and (
+            self.cache is not None or self.disk_cache is not None or
+            self.snapshot is not None)
+        memo_key = (endpoint, cls, key)
+        if memoize:
+            with self._built_lock:
+                memo = self._built.get(memo_key)
+            if memo is not None and memo[0] is data:
+                return list(memo[1]) if key is not None else memo[1]
+
+        if self.identity_map is not None:
+            self.identity_map.intern_body(data)
+        if key is None:
+            models = cls(data, **kwargs)
+        else:
+            models = []
+            for item in data[key]:
+                models.append(cls(item, **kwargs))
+
+        if memoize:
+            with self._built_lock:
+                self._built[memo_key] = (data, models)
+                self._built.move_to_end(memo_key)
+                while len(self._built) > DEFAULT_MODEL_MEMO_SIZE:
+                    self._built.popitem(last=False)
+            if key is not None:
+                return list(models)
+        return models
+
+    def close(self):
+        """Closes every pooled connection."""
+        if self._session is not None:
+            self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _counted(chunks, record):
+    record['bytes'] = 0
+    for chunk in chunks:
+        record['bytes'] += len(chunk)
+        yield chunk
+
+
+def get_default_transport():
+    """Returns the process-wide Transport used by model objects that were
+    created without one, creating it on first use. It sends the headers in
+    ``globals.headers``, which no client sets; objects returned by a client
+    use the client's Transport instead.
+
+    :returns: Transport: The default Transport object.
+    """
+    global _default_transport
+    if _default_transport is None:
+        with _default_transport_lock:
+            if _default_transport is None:
+                _default_transport = Transport()
+    return _default_transport
+
+
+def _resolve(transport):
+    return transport or get_default_transport()
+
+
+def fetch_json(transport, endpoint):
+    """Fetches an endpoint with the given Transport, or with the default one
+    if transport is None, and returns the decoded JSON body.
+
+    :param transport: The Transport to use.
+    :type transport: Transport
+    :param endpoint: The full endpoint URL.
+    :type endpoint: string
+
+    :returns: data: The decoded response body.
+    """
+    transport = _resolve(transport)
+    if getattr(transport, 'is_async', False):
+        raise TypeError("This object was created by an asynchronous " +
+                        "client; use the *_async variant of this method.")
+    return transport.get_json(endpoint)
+
+
+async def fetch_json_async(transport, endpoint):
+    """Same as ``fetch_json``, but awaitable. A blocking Transport is run in
+    the event loop's default executor.
+    """
+    transport = _resolve(transport)
+    if getattr(transport, 'is_async', False):
+        return await transport.get_json(endpoint)
+    import asyncio
+
+    # The executor doesn't carry the context over, which holds the record
+    # of the call.
+    call = functools.partial(contextvars.copy_context().run,
+                             transport.get_json, endpoint)
+    return await asyncio.get_running_loop().run_in_executor(None, call)
+
+
+def fetch_models(transport, endpoint, cls, key=None, bind=False):
+    """Fetches an endpoint and builds model objects from the response body
+    with ``Transport.build``.
+
+    :param transport: The Transport to use, or None for the default one.
+    :type transport: Transport
+    :param endpoint: The full endpoint URL.
+    :type endpoint: string
+    :param cls: The model class.
+    :type cls: type
+    :keyword key: The key of the list to build objects from.
+    :type key: string
+    :keyword bind: Whether to pass the transport on to the objects, so that
+        their own requests use it too.
+    :type bind: bool
+
+    :returns: The model object, or a list of them.
+    """
+    kwargs = {'transport': transport} if bind else {}
+    resolved = _resolve(transport)
+    with resolved.instrumentation.request(endpoint) as record:
+        data = fetch_json(transport, endpoint)
+        return timed_build(resolved, record, endpoint, data, cls, key,
+                           **kwargs)
+
+
+async def fetch_models_async(transport, endpoint, cls, key=None, bind=False):
+    """Same as ``fetch_models``, but awaitable."""
+    kwargs = {'transport': transport} if bind else {}
+    resolved = _resolve(transport)
+    with resolved.instrumentation.request(endpoint) as record:
+        data = await fetch_json_async(transport, endpoint)
+        return timed_build(resolved, record, endpoint, data, cls, key,
+                           **kwargs)
+
+
+def timed_build(resolved, record, endpoint, data, cls, key=None, **kwargs):
+    """Calls ``build`` on a resolved Transport and records the time it took
+    as the ``build`` time of a call."""
+    start = time.perf_counter()
+    models = resolved.build(endpoint, data, cls, key, **kwargs)
+    record['build'] = time.perf_counter() - start
+    return models
+
+
+def iter_models(transport, endpoint, cls, key, bind=False):
+    """Same as ``fetch_models`` for a list of objects, but yields them one
+    at a time while the response body is streamed with
+    ``Transport.iter_json``.
+    """
+    kwargs = {'transport': transport} if bind else {}
+    transport = _resolve(transport)
+    if getattr(transport, 'is_async', False):
+        raise TypeError("This object was created by an asynchronous " +
+                        "client; iterating isn't supported.")
+    cls = transport.model_classes.get(cls, cls)
+    identity_map = transport.identity_map
+    for item in transport.iter_json(endpoint, key):
+        if identity_map is not None:
+            identity_map.intern_body(item)
+        yield cls(item, **kwargs)
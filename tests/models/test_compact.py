@@ -0,0 +1,85 @@
+import copy
+import json
+import unittest
+from unittest.mock import Mock, patch
+
+from tests import resources
+from pyfootball.decoding import SharedValues
+from pyfootball.football import Football
+from pyfootball.models.fixture import Fixture, CompactFixture
+from pyfootball.models.player import Player, CompactPlayer
+from pyfootball.models.standings import Standings, CompactStandings, \
+    CompactStanding
+
+
+def _attrs(obj, names):
+    return {name: getattr(obj, name) for name in names}
+
+
+class TestCompactModels(unittest.TestCase):
+    def test_same_attributes(self):
+        for regular, compact, data in [
+                (Fixture, CompactFixture, resources.FIXTURE_V4),
+                (Player, CompactPlayer, resources.PLAYER_V4),
+                (Standings.Standing, CompactStanding,
+                 resources.LEAGUE_TABLE_V4['standings'][0]['table'][0])]:
+            expected = vars(regular(data))
+            obj = compact(data)
+            self.assertFalse(hasattr(obj, '__dict__'))
+            self.assertEqual(_attrs(obj, expected), expected)
+
+    def test_shared_sub_objects(self):
+        matches = json.loads(json.dumps(resources.FIXTURES_V4['matches']))
+        first, second = [CompactFixture(m) for m in matches[:2]]
+        self.assertIs(first.competition, second.competition)
+        self.assertIs(first.season, second.season)
+        again = CompactFixture(copy.deepcopy(matches[0]))
+        self.assertIs(again.home_team, first.home_team)
+        self.assertIs(again.area, first.area)
+        # Scores rarely repeat, so they aren't kept in the table.
+        self.assertIsNot(again.score, first.score)
+        self.assertEqual(again.score, first.score)
+
+    def test_standings(self):
+        table = CompactStandings(resources.LEAGUE_TABLE_V4)
+        self.assertIsInstance(table.total_standings[0], CompactStanding)
+        self.assertEqual(table.total_standings[0].team_name,
+                         Standings(resources.LEAGUE_TABLE_V4)
+                         .total_standings[0].team_name)
+
+    def test_shared_values(self):
+        values = SharedValues(max_entries=2)
+        team = {'id': 57, 'name': 'Arsenal FC'}
+        self.assertIs(values.share(dict(team)), values.share(dict(team)))
+        # Only dicts with an ID are kept.
+        score = {'home': 1, 'away': 0}
+        self.assertIs(values.share(score), score)
+        self.assertIsNot(values.share(dict(score)), values.share(score))
+        self.assertEqual(len(values), 1)
+        # A changed entity replaces the stored one.
+        renamed = dict(team, name='Arsenal')
+        self.assertIs(values.share(renamed), renamed)
+        self.assertIs(values.share(dict(renamed)), renamed)
+        self.assertIsNot(values.share({'id': 57.0}), values.share(team))
+        # A full table starts over.
+        values.share({'id': 1})
+        self.assertEqual(len(values), 2)
+        values.share({'id': 2})
+        self.assertEqual(len(values), 1)
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_football(self, mock_get):
+        response = Mock(status_code=200, headers={}, content=b'')
+        response.json.return_value = resources.FIXTURES_V4
+        mock_get.return_value = response
+        f = Football(api_key='key', rate_limiter=None, models='compact')
+        fixtures = f.get_comp_fixtures(2021)
+        self.assertIsInstance(fixtures[0], CompactFixture)
+        response.json.return_value = resources.LEAGUE_TABLE_V4
+        self.assertIsInstance(f.get_league_table(2021), CompactStandings)
+        with self.assertRaises(ValueError):
+            Football(api_key='key', models='tiny')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import copy
+import unittest
+from unittest.mock import Mock, patch
+
+from tests import resources
+from pyfootball.football import Football
+from pyfootball.models.competition import Competition, LazyCompetition
+from pyfootball.models.fixture import Fixture, LazyFixture
+from pyfootball.models.player import Player, LazyPlayer
+from pyfootball.models.standings import Standings, LazyStandings, \
+    LazyStanding
+from pyfootball.models.team import Team, LazyTeam
+
+
+class TestLazyModels(unittest.TestCase):
+    def test_same_attributes(self):
+        for regular, lazy, data in [
+                (Fixture, LazyFixture, resources.FIXTURE_V4),
+                (Player, LazyPlayer, resources.PLAYER_V4),
+                (Team, LazyTeam, resources.TEAM_V4),
+                (Competition, LazyCompetition, resources.COMPETITION_V4),
+                (Standings.Standing, LazyStanding,
+                 resources.LEAGUE_TABLE_V4['standings'][0]['table'][0])]:
+            expected = vars(regular(data))
+            obj = lazy(data)
+            self.assertIsInstance(obj, regular)
+            for name, value in expected.items():
+                self.assertEqual(getattr(obj, name), value, name)
+
+    def test_decodes_on_first_access(self):
+        fixture = LazyFixture(copy.deepcopy(resources.FIXTURE_V4))
+        self.assertEqual(set(vars(fixture)), {'_data'})
+        self.assertEqual(fixture.winner, 'Arsenal FC')
+        self.assertEqual(set(vars(fixture)), {'_data', 'winner'})
+        date = fixture.date
+        self.assertIs(fixture.date, date)
+        fixture.status = 'POSTPONED'
+        self.assertEqual(fixture.status, 'POSTPONED')
+
+        broken = LazyFixture({'id': 1})
+        self.assertEqual(broken.id, 1)
+        with self.assertRaises(KeyError):
+            broken.date
+
+    def test_standings(self):
+        table = LazyStandings(resources.LEAGUE_TABLE_V4)
+        self.assertEqual(set(vars(table)), {'_data'})
+        regular = Standings(resources.LEAGUE_TABLE_V4)
+        for name in ('total_standings', 'home_standings', 'away_standings'):
+            self.assertEqual([s.points for s in getattr(table, name)],
+                             [s.points for s in getattr(regular, name)])
+        self.assertIsInstance(table.total_standings[0], LazyStanding)
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_football(self, mock_get):
+        response = Mock(status_code=200, headers={}, content=b'')
+        response.json.return_value = resources.COMPETITION_V4
+        mock_get.return_value = response
+        f = Football(api_key='key', rate_limiter=None, models='lazy')
+        comp = f.get_competition(2021)
+        self.assertIsInstance(comp, LazyCompetition)
+        response.json.return_value = resources.FIXTURES_V4
+        fixtures = comp.get_fixtures()
+        self.assertIsInstance(fixtures[0], LazyFixture)
+        self.assertEqual(mock_get.call_args[0][0],
+                         Competition(resources.COMPETITION_V4)._fixtures_ep)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -41,7 +41,7 @@ class TestTeamAfterInit(unittest.TestCase):
             else:  # Strings
                 self.assertIsInstance(val, str)
 
-    @patch('pyfootball.models.team.requests.get')
+    @patch('pyfootball.transport.requests.Session.get')
     def test_get_fixtures(self, mock_get):
         mock_response = mock_get.return_value
         mock_response.status_code = 200
@@ -52,7 +52,7 @@ class TestTeamAfterInit(unittest.TestCase):
         for fixture in fixtures:
             self.assertIsInstance(fixture, Fixture)
 
-    @patch('pyfootball.models.team.requests.get')
+    @patch('pyfootball.transport.requests.Session.get')
     def test_get_players(self, mock_get):
         mock_response = mock_get.return_value
         mock_response.status_code = 200
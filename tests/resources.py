@@ -442,4 +442,274 @@ LEAGUE_TABLE = {
         "losses": 0
       }
     }]
-    }
\ No newline at end of file
+    }
+
+# v4 API payloads, in the shape the current models expect.
+
+AREA_V4 = {"id": 2072, "name": "England", "code": "ENG",
+           "flag": "https://crests.football-data.org/770.svg"}
+
+COMPETITION_REF_V4 = {"id": 2021, "name": "Premier League", "code": "PL",
+                      "type": "LEAGUE",
+                      "emblem": "https://crests.football-data.org/PL.png"}
+
+SEASON_V4 = {"id": 1564, "startDate": "2023-08-11",
+             "endDate": "2024-05-19", "currentMatchday": 2, "winner": None}
+
+COMPETITION_V4 = {
+    "area": AREA_V4,
+    "id": 2021,
+    "name": "Premier League",
+    "code": "PL",
+    "type": "LEAGUE",
+    "emblem": "https://crests.football-data.org/PL.png",
+    "currentSeason": SEASON_V4,
+    "seasons": [SEASON_V4],
+    "lastUpdated": "2023-08-19T07:33:21Z"
+}
+
+COMPETITIONS_V4 = {
+    "count": 1,
+    "filters": {"client": "TEST"},
+    "competitions": [dict(COMPETITION_V4, numberOfAvailableSeasons=125)]
+}
+
+
+def _team_v4(team_id, name, short_name, tla):
+    return {
+        "area": AREA_V4,
+        "id": team_id,
+        "name": name,
+        "shortName": short_name,
+        "tla": tla,
+        "crest": "https://crests.football-data.org/{}.png".format(team_id),
+        "address": "{} Ground, England".format(short_name),
+        "website": "http://www.{}.com".format(tla.lower()),
+        "founded": 1880,
+        "clubColors": "Red / White",
+        "venue": "{} Stadium".format(short_name),
+        "runningCompetitions": [COMPETITION_REF_V4],
+        "coach": {"id": 100 + team_id, "name": "Coach {}".format(tla),
+                  "nationality": "England"},
+        "squad": [
+            {"id": 1000 * team_id + n, "name": "Player {}".format(n),
+             "position": "Midfield", "dateOfBirth": "1995-01-0{}".format(n),
+             "nationality": "England"}
+            for n in range(1, 4)
+        ],
+        "staff": [],
+        "lastUpdated": "2023-08-18T08:45:12Z"
+    }
+
+
+TEAM_V4 = _team_v4(57, "Arsenal FC", "Arsenal", "ARS")
+
+COMP_TEAMS_V4 = {
+    "count": 4,
+    "competition": COMPETITION_REF_V4,
+    "season": SEASON_V4,
+    "teams": [
+        TEAM_V4,
+        _team_v4(61, "Chelsea FC", "Chelsea", "CHE"),
+        _team_v4(64, "Liverpool FC", "Liverpool", "LIV"),
+        _team_v4(65, "Manchester City FC", "Man City", "MCI"),
+    ]
+}
+
+PLAYER_V4 = {
+    "id": 7784,
+    "name": "Bukayo Saka",
+    "firstName": "Bukayo",
+    "lastName": "Saka",
+    "dateOfBirth": "2001-09-05",
+    "nationality": "England",
+    "position": "Right Winger",
+    "shirtNumber": 7,
+    "lastUpdated": "2023-08-18T08:45:12Z",
+    "currentTeam": {"id": 57, "name": "Arsenal FC"}
+}
+
+
+def _fixture_v4(fixture_id, matchday, date, home, away, status,
+                full_time=(None, None), half_time=(None, None)):
+    home_goals, away_goals = full_time
+    if status != 'FINISHED' or home_goals is None:
+        winner = None
+    elif home_goals > away_goals:
+        winner = 'HOME_TEAM'
+    elif home_goals < away_goals:
+        winner = 'AWAY_TEAM'
+    else:
+        winner = 'DRAW'
+    return {
+        "area": AREA_V4,
+        "competition": COMPETITION_REF_V4,
+        "season": SEASON_V4,
+        "id": fixture_id,
+        "utcDate": date,
+        "status": status,
+        "matchday": matchday,
+        "stage": "REGULAR_SEASON",
+        "group": None,
+        "lastUpdated": "2023-08-19T07:33:21Z",
+        "homeTeam": {"id": home[0], "name": home[1], "shortName": home[1],
+                     "tla": home[2], "crest": ""},
+        "awayTeam": {"id": away[0], "name": away[1], "shortName": away[1],
+                     "tla": away[2], "crest": ""},
+        "score": {
+            "winner": winner,
+            "duration": "REGULAR",
+            "fullTime": {"home": home_goals, "away": away_goals},
+            "halfTime": {"home": half_time[0], "away": half_time[1]}
+        },
+        "odds": {"msg": "Activate Odds-Package in User-Panel to retrieve odds."},
+        "referees": []
+    }
+
+
+_ARS = (57, "Arsenal FC", "ARS")
+_CHE = (61, "Chelsea FC", "CHE")
+_LIV = (64, "Liverpool FC", "LIV")
+_MCI = (65, "Manchester City FC", "MCI")
+
+FIXTURE_V4 = _fixture_v4(435943, 1, "2023-08-12T12:00:00Z", _ARS, _CHE,
+                         "FINISHED", (2, 1), (1, 0))
+
+FIXTURES_V4 = {
+    "filters": {"season": "2023"},
+    "resultSet": {"count": 6, "first": "2023-08-12", "last": "2023-08-19",
+                  "played": 4},
+    "competition": COMPETITION_REF_V4,
+    "matches": [
+        FIXTURE_V4,
+        _fixture_v4(435944, 1, "2023-08-12T14:00:00Z", _LIV, _MCI,
+                    "FINISHED", (1, 1), (0, 1)),
+        _fixture_v4(435945, 2, "2023-08-19T14:00:00Z", _CHE, _LIV,
+                    "FINISHED", (0, 3), (0, 1)),
+        _fixture_v4(435946, 2, "2023-08-19T14:00:00Z", _MCI, _ARS,
+                    "FINISHED", (2, 2), (1, 1)),
+        _fixture_v4(435947, 3, "2023-08-26T14:00:00Z", _ARS, _LIV,
+                    "IN_PLAY", (1, 0), (1, 0)),
+        _fixture_v4(435948, 3, "2023-08-26T16:30:00Z", _CHE, _MCI,
+                    "TIMED"),
+    ]
+}
+
+
+def _standing_v4(position, team, played, won, draw, lost, goals_for,
+                 goals_against, form):
+    return {
+        "position": position,
+        "team": {"id": team[0], "name": team[1], "shortName": team[1],
+                 "tla": team[2], "crest": ""},
+        "playedGames": played,
+        "form": form,
+        "won": won,
+        "draw": draw,
+        "lost": lost,
+        "points": 3 * won + draw,
+        "goalsFor": goals_for,
+        "goalsAgainst": goals_against,
+        "goalDifference": goals_for - goals_against
+    }
+
+
+LEAGUE_TABLE_V4 = {
+    "filters": {"season": "2023"},
+    "area": AREA_V4,
+    "competition": COMPETITION_REF_V4,
+    "season": SEASON_V4,
+    "standings": [
+        {"stage": "REGULAR_SEASON", "type": "TOTAL", "group": None,
+         "table": [
+             _standing_v4(1, _LIV, 2, 1, 1, 0, 4, 1, "W,D"),
+             _standing_v4(2, _ARS, 2, 1, 1, 0, 4, 3, "D,W"),
+             _standing_v4(3, _MCI, 2, 0, 2, 0, 3, 3, "D,D"),
+             _standing_v4(4, _CHE, 2, 0, 0, 2, 1, 5, "L,L"),
+         ]},
+        {"stage": "REGULAR_SEASON", "type": "HOME", "group": None,
+         "table": [
+             _standing_v4(1, _ARS, 1, 1, 0, 0, 2, 1, "W"),
+             _standing_v4(2, _MCI, 1, 0, 1, 0, 2, 2, "D"),
+             _standing_v4(3, _LIV, 1, 0, 1, 0, 1, 1, "D"),
+             _standing_v4(4, _CHE, 1, 0, 0, 1, 0, 3, "L"),
+         ]},
+        {"stage": "REGULAR_SEASON", "type": "AWAY", "group": None,
+         "table": [
+             _standing_v4(1, _LIV, 1, 1, 0, 0, 3, 0, "W"),
+             _standing_v4(2, _ARS, 1, 0, 1, 0, 2, 2, "D"),
+             _standing_v4(3, _MCI, 1, 0, 1, 0, 1, 1, "D"),
+             _standing_v4(4, _CHE, 1, 0, 0, 1, 1, 2, "L"),
+         ]},
+    ]
+}
+
+
+def season_v4(n_teams=20, seed=0, played_matchdays=None):
+    """Returns the matches of a double round-robin season between n_teams
+    teams, with random scores. Matches on matchdays after played_matchdays
+    are TIMED and have no score."""
+    import random
+    from datetime import datetime, timedelta
+    rng = random.Random(seed)
+    teams = [(1000 + i, "Team {:02d} FC".format(i), "T{:02d}".format(i))
+             for i in range(n_teams)]
+    rounds = []
+    rotation = list(range(n_teams))
+    for r in range(n_teams - 1):
+        pairs = [(rotation[i], rotation[n_teams - 1 - i])
+                 for i in range(n_teams // 2)]
+        rounds.append([(a, b) if r % 2 else (b, a) for a, b in pairs])
+        rotation = [rotation[0], rotation[-1]] + rotation[1:-1]
+    rounds += [[(b, a) for a, b in pairs] for pairs in rounds]
+    if played_matchdays is None:
+        played_matchdays = len(rounds)
+
+    matches = []
+    for matchday, pairs in enumerate(rounds, 1):
+        date = (datetime(2023, 8, 12, 15) + timedelta(weeks=matchday - 1)) \
+            .strftime('%Y-%m-%dT%H:%M:%SZ')
+        for home, away in pairs:
+            fixture_id = 500000 + len(matches)
+            if matchday <= played_matchdays:
+                full_time = (rng.randint(0, 4), rng.randint(0, 3))
+                half_time = (min(full_time[0], 1), min(full_time[1], 1))
+                matches.append(_fixture_v4(fixture_id, matchday, date,
+                                           teams[home], teams[away],
+                                           "FINISHED", full_time, half_time))
+            else:
+                matches.append(_fixture_v4(fixture_id, matchday, date,
+                                           teams[home], teams[away],
+                                           "TIMED"))
+    return matches
+
+
+def seasons_v4(n_seasons=10, comp_ids=(2021,), n_teams=20,
+               played_matchdays=None, first_year=2014):
+    """Returns the matches of n_seasons seasons of each of the
+    competitions, starting with the one that starts in first_year. Each
+    competition has its own teams and every match its own ID. Matches on
+    matchdays after played_matchdays are TIMED, as in ``season_v4``."""
+    matches = []
+    for c, comp_id in enumerate(comp_ids):
+        competition = dict(COMPETITION_REF_V4, id=comp_id,
+                           name="Competition {}".format(comp_id))
+        for s in range(n_seasons):
+            year = first_year + s
+            season = dict(SEASON_V4, id=comp_id * 100 + s,
+                          startDate="{}-08-11".format(year),
+                          endDate="{}-05-19".format(year + 1),
+                          currentMatchday=2 * n_teams - 2)
+            for match in season_v4(n_teams, c * 1000 + s,
+                                   played_matchdays):
+                date = str(int(match['utcDate'][:4]) - 2023 + year) + \
+                    match['utcDate'][4:]
+                home = dict(match['homeTeam'],
+                            id=match['homeTeam']['id'] + c * 100)
+                away = dict(match['awayTeam'],
+                            id=match['awayTeam']['id'] + c * 100)
+                matches.append(dict(match, id=len(matches) + 1,
+                                    competition=competition, season=season,
+                                    utcDate=date, homeTeam=home,
+                                    awayTeam=away))
+    return matches
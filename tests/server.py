@@ -0,0 +1,312 @@
+"""A local stand-in for api.football-data.org that serves the routes of
+``globals.endpoints`` from generated data, so that the client's real
+behavior over HTTP (connection reuse, concurrency, streaming, rate limits
+and revalidation) can be tested and benchmarked offline.
+
+    with FootballDataServer(latency=0.01, rate_limit=30) as server:
+        transport = Transport(base_url=server.url, rate_limiter=None)
+        f = Football(api_key='key', transport=transport)
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from tests import resources
+from pyfootball.frame import FixtureFrame
+from pyfootball.globals import _base, resolve_endpoint
+from pyfootball.ratelimit import AVAILABLE_HEADER, RESET_HEADER
+from pyfootball.tables import compute_table_data
+
+# The IDs given to the generated competitions, in order.
+COMP_IDS = [2021, 2014, 2002, 2019, 2015, 2016, 2017, 2003]
+
+
+def _body(data):
+    raw = json.dumps(data, separators=(',', ':')).encode()
+    return raw, '"{}"'.format(hashlib.sha1(raw).hexdigest())
+
+
+def _player(player, team):
+    first, last = player['name'].split(' ', 1)
+    return dict(resources.PLAYER_V4, id=player['id'], name=player['name'],
+                firstName=first, lastName=last,
+                dateOfBirth=player['dateOfBirth'],
+                position=player['position'],
+                currentTeam={'id': team['id'], 'name': team['name']})
+
+
+def build_routes(n_competitions=2, n_teams=20, played_matchdays=None):
+    """Returns the response bodies of every route, keyed on their paths
+    relative to the base URL: the competitions, one season of fixtures for
+    each, its teams, their players and the league tables.
+
+    :keyword n_competitions: The number of competitions.
+    :type n_competitions: integer
+    :keyword n_teams: The number of teams in each competition, which sets
+        the size of the payloads: a competition has ``n * (n - 1)``
+        fixtures.
+    :type n_teams: integer
+    :keyword played_matchdays: The number of matchdays that have been
+        played; later fixtures are TIMED.
+    :type played_matchdays: integer
+    """
+    comp_ids = COMP_IDS[:n_competitions]
+    matches = resources.seasons_v4(1, comp_ids, n_teams, played_matchdays,
+                                   first_year=2023)
+    routes = {'matches/': {'filters': {}, 'resultSet': {
+        'count': len(matches)}, 'matches': matches}}
+    competitions = []
+    for comp_id in comp_ids:
+        comp_matches = [m for m in matches
+                        if m['competition']['id'] == comp_id]
+        reference, season = comp_matches[0]['competition'], \
+            comp_matches[0]['season']
+        competition = dict(resources.COMPETITION_V4, currentSeason=season,
+                           seasons=[season], **reference)
+        competitions.append(dict(competition, numberOfAvailableSeasons=1))
+        teams = {}
+        for m in comp_matches:
+            for team in (m['homeTeam'], m['awayTeam']):
+                if team['id'] not in teams:
+                    teams[team['id']] = dict(resources._team_v4(
+                        team['id'], team['name'], team['shortName'],
+                        team['tla']), runningCompetitions=[reference])
+        prefix = 'competitions/{}'.format(comp_id)
+        routes[prefix] = competition
+        routes[prefix + '/teams'] = {
+            'count': len(teams), 'competition': reference,
+            'season': season, 'teams': list(teams.values())}
+        routes[prefix + '/matches'] = {
+            'filters': {'season': '2023'},
+            'resultSet': {'count': len(comp_matches)},
+            'competition': reference, 'matches': comp_matches}
+        try:
+            routes[prefix + '/standings'] = compute_table_data(
+                FixtureFrame.from_json(comp_matches))
+        except ImportError:
+            # Without numpy there are no league tables.
+            pass
+        for team_id, team in teams.items():
+            team_matches = [m for m in comp_matches if team_id in
+                            (m['homeTeam']['id'], m['awayTeam']['id'])]
+            routes['teams/{}'.format(team_id)] = team
+            routes['teams/{}/matches/'.format(team_id)] = {
+                'filters': {}, 'resultSet': {'count': len(team_matches)},
+                'matches': team_matches}
+            for player in team['squad']:
+                prefix = 'persons/{}'.format(player['id'])
+                routes[prefix] = _player(player, team)
+                routes[prefix + '/matches'] = {
+                    'filters': {}, 'person': routes[prefix],
+                    'matches': team_matches}
+    routes['competitions/'] = {'count': len(competitions), 'filters': {},
+                               'competitions': competitions}
+    for m in matches:
+        routes['matches/{}'.format(m['id'])] = m
+    return routes
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without TCP_NODELAY the
+    # body waits for the client's delayed ACK on a kept-alive connection.
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.server.stand_in._connected()
+
+    def do_GET(self):
+        status, headers, body = self.server.stand_in.respond(
+            self.path, self.headers)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        chunk_size = self.server.stand_in.chunk_size
+        for start in range(0, len(body), chunk_size):
+            self.wfile.write(body[start:start + chunk_size])
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    # Room for every connection of a concurrent batch; a full backlog
+    # drops connections, which the client retries only after a second.
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class FootballDataServer(object):
+    def __init__(self, n_competitions=2, n_teams=20, played_matchdays=None,
+                 latency=0.0, rate_limit=None, reset_seconds=60,
+                 api_key=None, chunk_size=64 * 1024):
+        """An HTTP server on localhost, run on a background thread, that
+        answers the client's requests like the API does. Pass ``url`` as
+        the ``base_url`` of a Transport to send requests to it.
+
+        It sends ``ETag`` headers and answers ``If-None-Match`` with a 304,
+        records the path and status of every request in ``requests``, and
+        counts the connections it accepts, the requests it throttles and
+        the requests sent with each key in ``keys``. Its latency, rate limit
+        and chunk size can be changed while it runs, as can ``routes``.
+
+        :keyword n_competitions: The number of competitions.
+        :type n_competitions: integer
+        :keyword n_teams: The number of teams in each competition. See
+            ``build_routes``.
+        :type n_teams: integer
+        :keyword played_matchdays: The number of matchdays played.
+        :type played_matchdays: integer
+        :keyword latency: Seconds to wait before each response.
+        :type latency: float
+        :keyword rate_limit: The number of requests allowed per window,
+            announced in the ``X-Requests-Available-Minute`` header; once
+            they are used up, requests get a 429 until the window resets.
+            Each key has its own window. None for no limit.
+        :type rate_limit: integer
+        :keyword reset_seconds: The length of a rate limit window, sent in
+            the ``X-RequestCounter-Reset`` header.
+        :type reset_seconds: float
+        :keyword api_key: The only key accepted in ``X-Auth-Token``, or a
+            set of them; None accepts any.
+        :type api_key: string or set
+        :keyword chunk_size: The size of the writes each body is sent in.
+        :type chunk_size: integer
+        """
+        self.routes = build_routes(n_competitions, n_teams,
+                                   played_matchdays)
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.reset_seconds = reset_seconds
+        self.api_key = api_key
+        self.chunk_size = chunk_size
+        self.requests = []
+        self.connections = 0
+        self.throttled = 0
+        self.keys = Counter()
+        self._bodies = {}
+        self._windows = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        """The base URL to send requests to, in place of the API's."""
+        host, port = self._server.server_address
+        return 'http://{}:{}/{}'.format(host, port,
+                                        _base.split('/', 3)[3])
+
+    def start(self):
+        """Starts serving on a free port."""
+        self._server = _Server(('127.0.0.1', 0), _Handler)
+        self._server.stand_in = self
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops serving and closes the listening socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _connected(self):
+        with self._lock:
+            self.connections += 1
+
+    def _encoded(self, path):
+        data = self.routes[path]
+        cached = self._bodies.get(path)
+        if cached is None or cached[0] is not data:
+            cached = self._bodies[path] = (data,) + _body(data)
+        return cached[1], cached[2]
+
+    def _throttle(self, key):
+        # Returns the rate limit headers of a request with a key, and
+        # whether it is over the limit.
+        if self.rate_limit is None:
+            return {}, False
+        with self._lock:
+            now = time.monotonic()
+            available, reset_at = self._windows.get(key, (None, None))
+            if reset_at is None or now >= reset_at:
+                available = self.rate_limit
+                reset_at = now + self.reset_seconds
+            over = available == 0
+            if over:
+                self.throttled += 1
+            else:
+                available -= 1
+            self._windows[key] = available, reset_at
+            headers = {AVAILABLE_HEADER: str(available),
+                       RESET_HEADER: str(max(0, int(
+                           reset_at - now + 0.999)))}
+        return headers, over
+
+    def respond(self, path, headers):
+        """Returns the status, headers and body of the response to a GET
+        request, and records it in ``requests``.
+
+        :param path: The request path, with its query string.
+        :type path: string
+        :param headers: The request headers.
+        :type headers: dict
+        """
+        response = self._respond(path, headers)
+        with self._lock:
+            self.requests.append((path, response[0]))
+        return response
+
+    def _respond(self, path, headers):
+        if self.latency:
+            time.sleep(self.latency)
+        key = headers.get('X-Auth-Token')
+        with self._lock:
+            self.keys[key] += 1
+        response_headers, over = self._throttle(key)
+        response_headers['Content-Type'] = 'application/json'
+        accepted = {self.api_key} if isinstance(self.api_key, str) \
+            else self.api_key
+        if accepted is not None and key not in accepted:
+            return 403, response_headers, _body(
+                {'message': 'The resource you are looking for is '
+                            'restricted.', 'errorCode': 403})[0]
+        if over:
+            return 429, response_headers, _body(
+                {'message': 'You reached your request limit.',
+                 'errorCode': 429})[0]
+
+        split = urlsplit(path)
+        prefix = '/' + _base.split('/', 3)[3]
+        route = split.path[len(prefix):] \
+            if split.path.startswith(prefix) else None
+        if route not in self.routes or \
+                resolve_endpoint(_base + route) is None:
+            return 404, response_headers, _body(
+                {'message': 'The resource you are looking for does not '
+                            'exist.', 'errorCode': 404})[0]
+        body, etag = self._encoded(route)
+        limit = parse_qs(split.query).get('limit')
+        if limit and 'matches' in self.routes[route]:
+            data = dict(self.routes[route])
+            data['matches'] = data['matches'][:int(limit[0])]
+            body, etag = _body(data)
+        response_headers['ETag'] = etag
+        if headers.get('If-None-Match') == etag:
+            return 304, response_headers, b''
+        return 200, response_headers, body
@@ -0,0 +1,212 @@
+import asyncio
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from tests import resources
+from pyfootball.diskcache import DiskCache
+from pyfootball.models.competition import Competition
+from pyfootball.models.fixture import Fixture
+from pyfootball.models.player import Player
+from pyfootball.models.standings import Standings
+from pyfootball.models.team import Team
+
+try:
+    from pyfootball.aio import AsyncFootball, AsyncTransport
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+ROUTES = {
+    '/competitions/': resources.COMPETITIONS_V4,
+    '/competitions/2021': resources.COMPETITION_V4,
+    '/competitions/2021/teams': resources.COMP_TEAMS_V4,
+    '/competitions/2021/matches': resources.FIXTURES_V4,
+    '/competitions/2021/standings': resources.LEAGUE_TABLE_V4,
+    '/matches/': resources.FIXTURES_V4,
+    '/matches/435943': resources.FIXTURE_V4,
+    '/teams/57/matches/': resources.FIXTURES_V4,
+    '/persons/7784': resources.PLAYER_V4,
+    '/persons/7784/matches': resources.FIXTURES_V4,
+}
+for _team in resources.COMP_TEAMS_V4['teams']:
+    ROUTES['/teams/{}'.format(_team['id'])] = _team
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight,
+                                       server.in_flight)
+        time.sleep(server.latency)
+        payload = ROUTES.get(self.path.split('?')[0])
+        body = json.dumps(payload).encode() if payload else b'{}'
+        self.send_response(200 if payload else 404)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with server.lock:
+            server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+class TestAsyncFootball(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        cls.server.daemon_threads = True
+        cls.server.lock = threading.Lock()
+        cls.server.in_flight = 0
+        cls.server.max_in_flight = 0
+        cls.server.latency = 0
+        cls.thread = threading.Thread(target=cls.server.serve_forever,
+                                      daemon=True)
+        cls.thread.start()
+        cls.base_url = 'http://127.0.0.1:{}/'.format(cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.latency = 0
+        self.server.max_in_flight = 0
+
+    def _client(self, max_concurrency=10):
+        transport = AsyncTransport(base_url=self.base_url, rate_limiter=None,
+                                   max_concurrency=max_concurrency)
+        return AsyncFootball(api_key='key', transport=transport)
+
+    def test_methods(self):
+        async def run():
+            async with self._client() as f:
+                comp = await f.get_competition(2021)
+                self.assertIsInstance(comp, Competition)
+                comps = await f.get_all_competitions()
+                self.assertIsInstance(comps[0], Competition)
+                table = await f.get_league_table(2021)
+                self.assertIsInstance(table, Standings)
+                fixtures = await f.get_comp_fixtures(2021)
+                self.assertEqual(len(fixtures), 6)
+                teams = await f.get_competition_teams(2021)
+                self.assertIsInstance(teams[0], Team)
+                fixture = await f.get_fixture(435943)
+                self.assertEqual(fixture.winner, 'Arsenal FC')
+                self.assertIsInstance((await f.get_all_fixtures())[0],
+                                      Fixture)
+                team = await f.get_team(57)
+                self.assertEqual(team.name, 'Arsenal FC')
+                players = await f.get_team_players(57)
+                self.assertIsInstance(players[0], Player)
+                self.assertIsInstance((await f.get_team_fixtures(57))[0],
+                                      Fixture)
+                player = await f.get_player(7784)
+                self.assertEqual(player.shirt_number, 7)
+                self.assertIsInstance(
+                    (await f.get_player_matches(7784, 5))[0], Fixture)
+                self.assertEqual(f.get_prev_response()['Status-Code'], 200)
+
+                self.assertEqual(len(await comp.get_fixtures_async()), 6)
+                self.assertEqual(len(await comp.get_teams_async()), 4)
+                self.assertIsInstance(await comp.get_league_table_async(),
+                                      Standings)
+                self.assertEqual(len(await team.get_fixtures_async()), 6)
+                self.assertEqual(len(await team.get_players_async()), 3)
+                with self.assertRaises(TypeError):
+                    team.get_players()
+        asyncio.run(run())
+
+    def test_http_error(self):
+        async def run():
+            async with self._client() as f:
+                with self.assertRaises(requests.exceptions.HTTPError):
+                    await f.get_team(1)
+        asyncio.run(run())
+
+    def test_bounded_concurrency(self):
+        self.server.latency = 0.05
+        team_ids = [57, 61, 64, 65] * 10
+
+        async def run():
+            f = self._client(max_concurrency=8)
+            try:
+                return await asyncio.gather(*[f.get_team(team_id)
+                                              for team_id in team_ids])
+            finally:
+                await f.close()
+
+        start = time.monotonic()
+        teams = asyncio.run(run())
+        elapsed = time.monotonic() - start
+        self.assertEqual([t.id for t in teams], team_ids)
+        self.assertLessEqual(self.server.max_in_flight, 8)
+        self.assertGreater(self.server.max_in_flight, 1)
+        # 40 requests sequentially would take at least 2 seconds.
+        self.assertLess(elapsed, 1.5)
+
+    def test_disk_cache_off_the_loop(self):
+        directory = tempfile.mkdtemp()
+        threads = []
+
+        class Recording(DiskCache):
+            def lookup(self, key):
+                threads.append(threading.current_thread())
+                return super(Recording, self).lookup(key)
+
+            def resolve(self, *args):
+                threads.append(threading.current_thread())
+                return super(Recording, self).resolve(*args)
+
+        async def run():
+            transport = AsyncTransport(base_url=self.base_url,
+                                       rate_limiter=None,
+                                       disk_cache=Recording(directory))
+            async with AsyncFootball(api_key='key',
+                                     transport=transport) as f:
+                first = await f.get_team(57)
+                again = await f.get_team(57)
+                self.assertEqual(first.name, again.name)
+
+        try:
+            asyncio.run(run())
+        finally:
+            shutil.rmtree(directory)
+        # Lookups for the key check and two team calls, one resolve each
+        # for the two requests.
+        self.assertEqual(len(threads), 5)
+        self.assertNotIn(threading.main_thread(), threads)
+
+    def test_batch(self):
+        async def run():
+            async with self._client() as f:
+                results = await f.get_teams([57, 1, 61])
+                self.assertEqual([r.id for r in results], [57, 1, 61])
+                self.assertEqual([r.ok for r in results],
+                                 [True, False, True])
+                players = await f.get_team_players_many([57, 61])
+                self.assertIsInstance(players[1].result[0], Player)
+                ids = [r.id async for r in f.get_players([7784, 1],
+                                                         ordered=False)]
+                self.assertEqual(sorted(ids), [1, 7784])
+                fixtures = await f.get_fixtures([435943])
+                self.assertEqual(fixtures[0].result.id, 435943)
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
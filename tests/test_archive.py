@@ -0,0 +1,157 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from tests import resources
+from pyfootball.archive import FixtureArchive, ArchivedFixture, np
+from pyfootball.frame import FixtureFrame
+from pyfootball.models.fixture import Fixture, _FIELDS
+from pyfootball.models.standings import Standings
+
+ATTRS = [field.attr for field in _FIELDS] + ['winner']
+
+
+def scan(fixtures, condition):
+    # The IDs a linear scan finds, in kickoff order.
+    return [f.id for f in sorted((f for f in fixtures if condition(f)),
+                                 key=lambda f: (f.date, f.id))]
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestFixtureArchive(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'archive')
+        self.matches = resources.seasons_v4(n_seasons=3,
+                                            comp_ids=(2021, 2014))
+        self.fixtures = [Fixture(m) for m in self.matches]
+        self.archive = FixtureArchive(self.path)
+        self.assertEqual(self.archive.append(self.matches), 2280)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_views(self):
+        archive = self.archive
+        self.assertEqual(len(archive), 2280)
+        for row in (0, 500, 2279):
+            view, fixture = archive[row], self.fixtures[row]
+            self.assertIsInstance(view, ArchivedFixture)
+            for attr in ATTRS:
+                self.assertEqual(getattr(view, attr), getattr(fixture, attr),
+                                 attr)
+            self.assertEqual(repr(view), repr(fixture))
+        self.assertIs(archive[0].home_team, archive[0].home_team)
+        self.assertEqual(archive.get(1000).id, 1000)
+        self.assertIsNone(archive.get(99999))
+        with self.assertRaises(IndexError):
+            archive[2280]
+        self.assertEqual(archive[-1].id, 2280)
+
+    def test_missing_values(self):
+        match = resources.season_v4(played_matchdays=0)[0]
+        match = dict(match, id=1, matchday=None, lastUpdated=None)
+        archive = FixtureArchive(os.path.join(self.directory, 'timed'))
+        archive.append([match])
+        view, fixture = archive[0], Fixture(match)
+        for attr in ATTRS:
+            self.assertEqual(getattr(view, attr), getattr(fixture, attr),
+                             attr)
+        self.assertIsNone(view.group)
+        self.assertEqual(archive.frame().home_goals.tolist(), [-1])
+
+    def test_append_only(self):
+        reader = FixtureArchive(self.path)
+        self.assertEqual(len(reader), 2280)
+        self.assertEqual(self.archive.append(self.matches[:10]), 0)
+
+        more = resources.seasons_v4(n_seasons=4, comp_ids=(2021,))[-380:]
+        for match in more:
+            match['id'] += 10000
+        fixtures = [Fixture(m) for m in more]
+        self.assertEqual(self.archive.append(fixtures), 380)
+        self.assertEqual(len(self.archive), 2660)
+        self.assertEqual(len(reader), 2280)
+        reader.refresh()
+        self.assertEqual(len(reader), 2660)
+        self.assertEqual(reader[-1].home_team, fixtures[-1].home_team)
+        self.assertEqual(reader[-1].date, fixtures[-1].date)
+
+        # Shared sub-objects are stored once.
+        with open(os.path.join(self.path, 'meta.json')) as f:
+            meta = json.load(f)
+        self.assertEqual(meta['rows'], 2660)
+        self.assertLess(meta['strings'], 200)
+
+    def test_append_in_chunks(self):
+        with open(os.path.join(self.path, 'meta.json')) as f:
+            strings = json.load(f)['strings']
+        more = [dict(m, id=m['id'] + 10000) for m in self.matches[-20:]]
+        # IDs and strings are looked up a few rows at a time.
+        with patch('pyfootball.archive._SCAN_ROWS', 7):
+            self.assertEqual(self.archive.append(self.matches[::50]), 0)
+            self.assertEqual(
+                self.archive.append(self.matches[-5:] + more), 20)
+        with open(os.path.join(self.path, 'meta.json')) as f:
+            self.assertEqual(json.load(f)['strings'], strings)
+        self.assertEqual(self.archive[-1].home_team,
+                         self.fixtures[-1].home_team)
+
+    def test_string_cache_is_bounded(self):
+        archive = FixtureArchive(self.path, string_cache_size=8)
+        for view in archive.query(comp_id=2021, season=2016):
+            view.home_team, view.score
+        self.assertEqual(archive._decoded.cache_info().currsize, 8)
+        self.assertEqual(archive[0].home_team, self.fixtures[0].home_team)
+
+    def test_select(self):
+        archive, fixtures = self.archive, self.fixtures
+        self.assertEqual(
+            [f.id for f in archive.query(comp_id=2014, season=2015,
+                                         team_id=1103)],
+            scan(fixtures, lambda f: f.competition['id'] == 2014 and
+                 f.season['startDate'].startswith('2015') and
+                 1103 in (f.home_team_id, f.away_team_id)))
+        self.assertEqual(len(archive.select(season=(2014, 2015))), 1520)
+        self.assertEqual(len(archive.select(comp_id=[2021, 2014])), 2280)
+        self.assertEqual(len(archive.select(status='TIMED')), 0)
+        start, end = datetime(2015, 1, 1), datetime(2015, 2, 1)
+        self.assertEqual(list(archive.select(start=start, end=end) + 1),
+                         scan(fixtures, lambda f: start <= f.date < end))
+        self.assertEqual(len(archive.select(matchday=(1, 2), season=2016)),
+                         40)
+
+    def test_frame(self):
+        frame = self.archive.frame(comp_id=2021, season=2016)
+        expected = FixtureFrame.from_json(
+            [m for m in self.matches if m['competition']['id'] == 2021 and
+             m['season']['startDate'].startswith('2016')])
+        self.assertEqual(len(frame), 380)
+        for name, column in expected.columns.items():
+            self.assertEqual(frame[name].tolist(), column.tolist(), name)
+        self.assertEqual(frame.teams, expected.teams)
+        self.assertEqual(frame.meta, expected.meta)
+
+    def test_standings(self):
+        season = [f for f in self.fixtures if f.competition['id'] == 2014
+                  and f.season['startDate'].startswith('2016')]
+        table = Standings.from_fixtures(
+            self.archive.query(comp_id=2014, season=2016))
+        expected = Standings.from_fixtures(season)
+        self.assertEqual(
+            [(s.team_id, s.points) for s in table.total_standings],
+            [(s.team_id, s.points) for s in expected.total_standings])
+
+    def test_invalid(self):
+        with open(os.path.join(self.path, 'meta.json'), 'w') as f:
+            json.dump({'version': 99, 'rows': 0, 'strings': 0}, f)
+        with self.assertRaisesRegex(ValueError, 'version 99'):
+            FixtureArchive(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+import requests
+
+from tests import resources
+from pyfootball.football import Football
+from pyfootball.models.player import Player
+from pyfootball.models.team import Team
+
+TEAMS = {team['id']: team for team in resources.COMP_TEAMS_V4['teams']}
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _get(self, url, **kwargs):
+        response = Mock(headers={}, content=b'')
+        response.raise_for_status.side_effect = None
+        if url.endswith('/competitions/'):
+            response.json.return_value = resources.COMPETITIONS_V4
+            return response
+
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        item_id = int(url.rstrip('/').split('/')[-1])
+        # Arsenal answers last, so completion order differs from input.
+        time.sleep(0.08 if item_id == 57 else 0.02)
+        with self.lock:
+            self.in_flight -= 1
+
+        if '/teams/' in url:
+            payload = TEAMS.get(item_id)
+        else:
+            payload = resources.PLAYER_V4 if item_id == 7784 else None
+        response.json.return_value = payload
+        if payload is None:
+            response.raise_for_status.side_effect = \
+                requests.exceptions.HTTPError('404')
+        return response
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_ordered_results(self, mock_get):
+        mock_get.side_effect = self._get
+        f = Football(api_key='key', rate_limiter=None)
+        results = f.get_teams([57, 61, 1, 64, 65])
+        self.assertEqual([r.id for r in results], [57, 61, 1, 64, 65])
+        self.assertEqual([r.ok for r in results],
+                         [True, True, False, True, True])
+        self.assertIsInstance(results[0].result, Team)
+        self.assertEqual(results[1].result.id, 61)
+        self.assertIsInstance(results[2].error,
+                              requests.exceptions.HTTPError)
+        self.assertIsNone(results[2].result)
+        self.assertGreater(self.max_in_flight, 1)
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_bounded_workers(self, mock_get):
+        mock_get.side_effect = self._get
+        f = Football(api_key='key', rate_limiter=None)
+        results = f.get_team_players_many(list(TEAMS) * 4, max_workers=3)
+        self.assertTrue(all(r.ok for r in results))
+        self.assertIsInstance(results[0].result[0], Player)
+        self.assertLessEqual(self.max_in_flight, 3)
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_completion_order(self, mock_get):
+        mock_get.side_effect = self._get
+        f = Football(api_key='key', rate_limiter=None)
+        results = f.get_teams([57, 65], ordered=False)
+        self.assertEqual([r.id for r in results], [65, 57])
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_players_and_fixtures(self, mock_get):
+        mock_get.side_effect = self._get
+        f = Football(api_key='key', rate_limiter=None)
+        players = f.get_players([7784, 1])
+        self.assertEqual(players[0].result.shirt_number, 7)
+        self.assertFalse(players[1].ok)
+        self.assertFalse(f.get_fixtures([1])[0].ok)
+        self.assertEqual(f.get_fixtures([]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks import suite
+
+
+def results(**values):
+    return {'meta': {}, 'results': {
+        name: suite.metric(value, 'ms' if name.endswith('latency')
+                           else 'objects/s', 'lower'
+                           if name.endswith('latency') else 'higher')
+        for name, value in values.items()}}
+
+
+class TestSuite(unittest.TestCase):
+    def test_compare(self):
+        before = results(models_fixture=1000.0, team_latency=10.0,
+                         gone_latency=1.0)
+        after = results(models_fixture=850.0, team_latency=9.0)
+        rows = suite.compare(before, after)
+        self.assertEqual([row[0] for row in rows],
+                         ['models_fixture', 'team_latency'])
+        name, a, b, change, regressed = rows[0]
+        self.assertAlmostEqual(change, -0.15)
+        self.assertTrue(regressed)
+        self.assertAlmostEqual(rows[1][3], 0.1)
+        self.assertFalse(rows[1][4])
+        self.assertFalse(suite.compare(before, after, threshold=0.2)[0][4])
+
+    def test_run_and_compare(self):
+        data = suite.run([lambda: {'models.Fixture': suite.metric(
+            2.0, 'objects/s', 'higher')}])
+        self.assertEqual(data['results']['models.Fixture']['value'], 2.0)
+        fd, path = tempfile.mkstemp(suffix='.json')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+            self.assertEqual(suite.main(['compare', path, path]), 0)
+        finally:
+            os.unlink(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
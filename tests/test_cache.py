@@ -0,0 +1,112 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from tests import resources
+from pyfootball.cache import ResponseCache, cache_key
+from pyfootball.football import Football
+from pyfootball.globals import endpoints
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache()
+
+    def test_cache_key_sorts_params(self):
+        self.assertEqual(cache_key('u', {'b': 2, 'a': 1}),
+                         cache_key('u', {'a': 1, 'b': 2}))
+        self.assertEqual(cache_key('u?limit=3', {'a': 1}), 'u?limit=3&a=1')
+        self.assertEqual(cache_key('u'), 'u')
+
+    def test_ttl_by_resource(self):
+        team = endpoints['team'].format(57)
+        fixtures = endpoints['comp_fixtures'].format(2021)
+        self.assertEqual(self.cache.ttl(team, resources.TEAM_V4), 60 * 60)
+        # FIXTURES_V4 contains a match that is IN_PLAY.
+        self.assertEqual(self.cache.ttl(fixtures, resources.FIXTURES_V4),
+                         self.cache.live_ttl)
+        finished = dict(resources.FIXTURES_V4,
+                        matches=resources.FIXTURES_V4['matches'][:4])
+        self.assertEqual(self.cache.ttl(fixtures, finished), 5 * 60)
+        self.assertEqual(self.cache.ttl('https://example.org/', {}), 0)
+
+    def test_hits_and_misses(self):
+        key = endpoints['team'].format(57)
+        self.assertIsNone(self.cache.get(key))
+        self.cache.set(key, resources.TEAM_V4, 100)
+        self.assertIs(self.cache.get(key), resources.TEAM_V4)
+        self.assertEqual(self.cache.stats(),
+                         {'hits': 1, 'misses': 1, 'evictions': 0,
+                          'entries': 1, 'bytes': 100})
+
+    def test_expiry(self):
+        cache = ResponseCache(ttls={'team': 0.05})
+        key = endpoints['team'].format(57)
+        cache.set(key, resources.TEAM_V4, 100)
+        time.sleep(0.06)
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(cache.size, 0)
+
+    def test_expiry_counts_from_fetch_time(self):
+        cache = ResponseCache(ttls={'team': 60})
+        key = endpoints['team'].format(57)
+        cache.set(key, resources.TEAM_V4, 100, fetched_at=time.time() - 50)
+        self.assertLess(cache._entries[key][2] - time.monotonic(), 11)
+        cache.set(key, resources.TEAM_V4, 100, fetched_at=time.time() - 70)
+        self.assertIsNone(cache.get(key))
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_bytes=250)
+        keys = [endpoints['team'].format(i) for i in range(3)]
+        cache.set(keys[0], {'id': 0}, 100)
+        cache.set(keys[1], {'id': 1}, 100)
+        cache.get(keys[0])
+        cache.set(keys[2], {'id': 2}, 100)
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNotNone(cache.get(keys[2]))
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.size, 200)
+
+    def test_oversized_body_not_stored(self):
+        cache = ResponseCache(max_bytes=10)
+        cache.set(endpoints['team'].format(1), {}, 11)
+        self.assertEqual(len(cache), 0)
+
+
+class TestCachedFootball(unittest.TestCase):
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_repeated_calls_hit_cache(self, mock_get):
+        mock_get.return_value.headers = {}
+        mock_get.return_value.content = b'x' * 10
+        f = Football(api_key='key', cache=True)
+
+        mock_get.return_value.json.return_value = resources.TEAM_V4
+        team = f.get_team(57)
+        players = team.get_players()
+        self.assertEqual(len(players), 3)
+        self.assertEqual(f.get_team(57).name, team.name)
+
+        # One request validates the key, one fetches the team.
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(f._transport.cache.hits, 2)
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_cached_models_are_not_shared(self, mock_get):
+        mock_get.return_value.headers = {}
+        mock_get.return_value.content = b'x' * 10
+        mock_get.return_value.json.return_value = resources.FIXTURES_V4
+        f = Football(api_key='key', cache=True)
+        first = f.get_comp_fixtures(2021)
+        second = f.get_comp_fixtures(2021)
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertIsNot(first[0], second[0])
+        first[0].status = 'POSTPONED'
+        self.assertNotEqual(second[0].status, 'POSTPONED')
+
+        mock_get.return_value.json.return_value = resources.TEAM_V4
+        self.assertIsNot(f.get_team(57), f.get_team(57))
+
+
+if __name__ == '__main__':
+    unittest.main()
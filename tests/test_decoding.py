@@ -0,0 +1,71 @@
+import unittest
+from datetime import date, datetime
+
+from tests import resources
+from pyfootball.decoding import Field, compile_decoder, parse_date, \
+    parse_datetime
+from pyfootball.models.competition import Competition
+from pyfootball.models.fixture import Fixture
+from pyfootball.models.player import Player
+
+
+class _Obj(object):
+    pass
+
+
+class TestParsers(unittest.TestCase):
+    def test_parse_datetime(self):
+        for value, fmt in [('2023-08-11T19:00:00Z', '%Y-%m-%dT%H:%M:%SZ'),
+                           ('1999-12-31T23:59:59Z', '%Y-%m-%dT%H:%M:%SZ'),
+                           ('2023-08-11', '%Y-%m-%d')]:
+            self.assertEqual(parse_datetime(value),
+                             datetime.strptime(value, fmt))
+        self.assertIs(parse_datetime('2023-08-11T19:00:00Z'),
+                      parse_datetime('2023-08-11T19:00:00Z'))
+        self.assertEqual(parse_date('1994-05-03'), date(1994, 5, 3))
+
+    def test_invalid(self):
+        for value in ['2023-13-11T19:00:00Z', '2023-08-11 19:00:00',
+                      '2023/08/11', '2023-08-1xT19:00:00Z', '']:
+            with self.assertRaises(ValueError):
+                parse_datetime(value)
+
+
+class TestCompileDecoder(unittest.TestCase):
+    def test_fields(self):
+        decode = compile_decoder([
+            Field('id'),
+            Field('home', 'teams.home.name'),
+            Field('away', 'teams.away.name', str.upper),
+            Field('kickoff', 'utcDate', parse_datetime),
+            Field('missing', 'notThere', default=0),
+            Field('null', 'nothing', parse_datetime, default=None),
+        ])
+        obj = _Obj()
+        decode(obj, {'id': 1, 'utcDate': '2023-08-11T19:00:00Z',
+                     'teams': {'home': {'name': 'Burnley'},
+                               'away': {'name': 'Man City'}}})
+        self.assertEqual(obj.id, 1)
+        self.assertEqual(obj.home, 'Burnley')
+        self.assertEqual(obj.away, 'MAN CITY')
+        self.assertEqual(obj.kickoff, datetime(2023, 8, 11, 19))
+        self.assertEqual(obj.missing, 0)
+        self.assertIsNone(obj.null)
+        with self.assertRaises(KeyError):
+            decode(_Obj(), {'id': 1})
+
+    def test_models(self):
+        fixture = Fixture(resources.FIXTURE_V4)
+        self.assertEqual(fixture.date, datetime.strptime(
+            resources.FIXTURE_V4['utcDate'], '%Y-%m-%dT%H:%M:%SZ'))
+        self.assertEqual(fixture.home_team_id, 57)
+        self.assertEqual(fixture.winner, 'Arsenal FC')
+        player = Player(resources.PLAYER_V4)
+        self.assertIsInstance(player.date_of_birth, date)
+        comp = Competition(resources.COMPETITION_V4)
+        self.assertIsInstance(comp.start_date, datetime)
+        self.assertIsInstance(comp.last_updated, datetime)
+
+
+if __name__ == '__main__':
+    unittest.main()
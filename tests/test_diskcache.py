@@ -0,0 +1,176 @@
+import json
+import multiprocessing
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from tests import resources
+from pyfootball.diskcache import DiskCache, payload_version
+from pyfootball.football import Football
+from pyfootball.globals import endpoints
+
+
+def _response(payload, status_code=200, headers=None):
+    body = json.dumps(payload).encode() if payload is not None else b''
+    return Mock(status_code=status_code, content=body,
+                headers=headers or {},
+                json=Mock(return_value=payload))
+
+
+def _write_entries(path, worker):
+    cache = DiskCache(path)
+    for i in range(50):
+        key = endpoints['team'].format(worker * 1000 + i)
+        cache.set(key, {'id': i}, b'{"id": %d}' % i, {})
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.key = endpoints['team'].format(57)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_survives_restart(self):
+        body = json.dumps(resources.TEAM_V4).encode()
+        DiskCache(self.path).set(self.key, resources.TEAM_V4, body,
+                                 {'ETag': '"abc"'})
+
+        cache = DiskCache(self.path)
+        data, headers, entry = cache.lookup(self.key)
+        self.assertEqual(data, resources.TEAM_V4)
+        self.assertEqual(entry.headers['etag'], '"abc"')
+        self.assertEqual(cache.hits, 1)
+
+    def test_stale_entry_sends_validators(self):
+        cache = DiskCache(self.path, ttls={'team': 0})
+        cache.set(self.key, resources.TEAM_V4, b'{}',
+                  {'ETag': '"abc"', 'Last-Modified': 'yesterday'})
+        data, headers, entry = cache.lookup(self.key)
+        self.assertIsNone(data)
+        self.assertEqual(headers, {'If-None-Match': '"abc"',
+                                   'If-Modified-Since': 'yesterday'})
+
+    def test_304_reuses_decoded_body(self):
+        cache = DiskCache(self.path, ttls={'team': 0})
+        body = json.dumps(resources.TEAM_V4).encode()
+        cache.set(self.key, resources.TEAM_V4, body, {'ETag': '"abc"'})
+        data, headers, entry = cache.lookup(self.key)
+        resolved, reused = cache.resolve(self.key, entry, 304, b'', {})
+        self.assertIs(resolved, resources.TEAM_V4)
+        self.assertTrue(reused)
+        self.assertEqual(cache.revalidations, 1)
+
+    def test_unchanged_last_updated_reuses_decoded_body(self):
+        cache = DiskCache(self.path, ttls={'team': 0})
+        body = json.dumps(resources.TEAM_V4).encode()
+        cache.set(self.key, resources.TEAM_V4, body, {})
+        data, headers, entry = cache.lookup(self.key)
+        self.assertEqual(headers, {})
+
+        refetched = dict(resources.TEAM_V4, website='http://example.org')
+        resolved, reused = cache.resolve(self.key, entry, 200,
+                                         json.dumps(refetched).encode(), {})
+        self.assertIs(resolved, resources.TEAM_V4)
+        self.assertTrue(reused)
+
+        updated = dict(resources.TEAM_V4, lastUpdated='2023-09-01T00:00:00Z')
+        resolved, reused = cache.resolve(self.key, entry, 200,
+                                         json.dumps(updated).encode(), {})
+        self.assertEqual(resolved, updated)
+        self.assertFalse(reused)
+
+    def test_payload_version(self):
+        body = json.dumps(resources.FIXTURES_V4).encode()
+        version = payload_version(resources.FIXTURES_V4, body)
+        matches = [dict(m) for m in resources.FIXTURES_V4['matches']]
+        matches[3]['lastUpdated'] = '2023-08-20T00:00:00Z'
+        changed = dict(resources.FIXTURES_V4, matches=matches)
+        self.assertNotEqual(version, payload_version(changed, body))
+        self.assertEqual(payload_version({}, b'a'),
+                         payload_version({}, b'a'))
+        self.assertNotEqual(payload_version({}, b'a'),
+                            payload_version({}, b'b'))
+
+    def test_shared_between_processes(self):
+        ctx = multiprocessing.get_context('spawn')
+        workers = [ctx.Process(target=_write_entries, args=(self.path, i))
+                   for i in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+        self.assertEqual(DiskCache(self.path).stats()['entries'], 150)
+
+
+class TestDiskCachedFootball(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_restart_and_revalidation(self, mock_get):
+        mock_get.return_value = _response(resources.FIXTURES_V4,
+                                          headers={'ETag': '"v1"'})
+        f = Football(api_key='key', disk_cache=self.path)
+        first = f.get_comp_fixtures(2021)
+        self.assertEqual(mock_get.call_count, 2)
+
+        # A new client in a "restarted" process is served from disk.
+        f = Football(api_key='key', disk_cache=DiskCache(self.path))
+        self.assertEqual(len(f.get_comp_fixtures(2021)), len(first))
+        self.assertEqual(mock_get.call_count, 3)
+
+        # Once stale, the entry is revalidated and the body is reused, but
+        # callers still get models of their own.
+        disk_cache = DiskCache(self.path, ttls={'comp_fixtures': 0},
+                               live_ttl=0)
+        f = Football(api_key='key', disk_cache=disk_cache)
+        fixtures = f.get_comp_fixtures(2021)
+        mock_get.return_value = _response(None, status_code=304)
+        again = f.get_comp_fixtures(2021)
+        args, kwargs = mock_get.call_args
+        self.assertEqual(kwargs['headers']['If-None-Match'], '"v1"')
+        self.assertIsNot(again, fixtures)
+        for old, new in zip(fixtures, again):
+            self.assertIsNot(old, new)
+            self.assertEqual(old.id, new.id)
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_memory_cache_keeps_disk_age(self, mock_get):
+        mock_get.return_value = _response(resources.TEAM_V4)
+        key = endpoints['team'].format(57)
+        disk_cache = DiskCache(self.path)
+        Football(api_key='key', disk_cache=disk_cache).get_team(57)
+        # Fetched 50 minutes into its hour.
+        disk_cache._connect().execute(
+            'UPDATE responses SET fetched_at = fetched_at - 3000')
+        f = Football(api_key='key', cache=True,
+                     disk_cache=DiskCache(self.path))
+        f.get_team(57)
+        self.assertEqual(mock_get.call_count, 3)
+        expires = f.transport.cache._entries[key][2]
+        self.assertLess(expires - time.monotonic(), 601)
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_unchanged_200_is_revalidated(self, mock_get):
+        mock_get.return_value = _response(resources.TEAM_V4)
+        records = []
+        f = Football(api_key='key', disk_cache=DiskCache(
+            self.path, ttls={'team': 0}))
+        f.transport.instrumentation.add_hook(records.append)
+        f.get_team(57)
+        f.get_team(57)
+        self.assertEqual([(record.status, record.cache)
+                          for record in records],
+                         [(200, 'miss'), (200, 'revalidated')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,7 +8,7 @@ from pyfootball.models.competition import Competition
 
 
 class TestFootball(unittest.TestCase):
-    @patch('pyfootball.football.requests.get')
+    @patch('pyfootball.transport.requests.Session.get')
     def test_constructor_invalid_kwarg(self, mock_get):
         with self.assertRaises(requests.exceptions.HTTPError):
             http_err = requests.exceptions.HTTPError()
@@ -16,7 +16,7 @@ class TestFootball(unittest.TestCase):
             mock_response.raise_for_status.side_effect = http_err
             Football(api_key="some_bogus_key")
 
-    @patch('pyfootball.football.requests.get')
+    @patch('pyfootball.transport.requests.Session.get')
     def test_constructor_envvar(self, mock_get):
         try:
             mock_response = mock_get.return_value
@@ -0,0 +1,117 @@
+import unittest
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+from tests import resources
+from pyfootball.football import Football
+from pyfootball.models.fixture import Fixture
+
+try:
+    import numpy as np
+    from pyfootball.frame import FixtureFrame, MISSING, STATUS_CODES
+except ImportError:
+    np = None
+
+MATCHES = resources.FIXTURES_V4['matches']
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestFixtureFrame(unittest.TestCase):
+    def setUp(self):
+        self.frame = FixtureFrame.from_json(MATCHES)
+
+    def test_columns(self):
+        frame = self.frame
+        self.assertEqual(len(frame), 6)
+        self.assertEqual(frame.id.tolist(), [m['id'] for m in MATCHES])
+        self.assertEqual(frame['home_team_id'].tolist(),
+                         [m['homeTeam']['id'] for m in MATCHES])
+        self.assertEqual(frame.home_goals[0], 2)
+        self.assertEqual(frame.home_goals_half_time[0], 1)
+        self.assertEqual(frame.home_goals[-1], MISSING)
+        self.assertEqual(frame.status[0], STATUS_CODES['FINISHED'])
+        self.assertEqual(frame.statuses[4], 'IN_PLAY')
+        self.assertEqual(frame.dates[0].item(),
+                         datetime.strptime(MATCHES[0]['utcDate'],
+                                           '%Y-%m-%dT%H:%M:%SZ'))
+        self.assertEqual(frame.team_name(57), 'Arsenal FC')
+        self.assertEqual(frame.row(0)['id'], MATCHES[0]['id'])
+
+    def test_from_fixtures(self):
+        frame = FixtureFrame.from_fixtures([Fixture(m) for m in MATCHES])
+        for name, column in self.frame.columns.items():
+            self.assertEqual(frame[name].tolist(), column.tolist())
+
+    def test_views_share_memory(self):
+        view = self.frame.view(1, 3)
+        self.assertEqual(len(view), 2)
+        self.assertTrue(np.shares_memory(view.id, self.frame.id))
+        self.assertTrue(np.shares_memory(self.frame.dates,
+                                         self.frame.utc_date))
+        self.assertEqual(len(self.frame[2]), 1)
+
+    def test_filter(self):
+        frame = self.frame
+        finished = frame.filter(status='FINISHED')
+        self.assertEqual(len(finished), 4)
+        self.assertEqual(len(frame.filter(status=['IN_PLAY', 'TIMED'])), 2)
+        arsenal = frame.filter(team_id=57)
+        expected = [m['id'] for m in MATCHES if 57 in
+                    (m['homeTeam']['id'], m['awayTeam']['id'])]
+        self.assertEqual(arsenal.id.tolist(), expected)
+        self.assertEqual(len(frame.filter(matchday=(1, 2))),
+                         len([m for m in MATCHES if m['matchday'] <= 2]))
+        self.assertEqual(len(frame.filter(mask=frame.home_goals > 1,
+                                          status='FINISHED')),
+                         len([m for m in MATCHES
+                              if m['status'] == 'FINISHED' and
+                              m['score']['fullTime']['home'] > 1]))
+        start = datetime.strptime(MATCHES[2]['utcDate'],
+                                  '%Y-%m-%dT%H:%M:%SZ')
+        later = frame.filter(start=start)
+        self.assertTrue((later.dates >= np.datetime64(start)).all())
+        self.assertEqual(len(frame.filter(start=start, end=start)), 0)
+
+    def test_sort_and_group(self):
+        frame = self.frame.sort(['matchday', 'id'], descending=True)
+        self.assertEqual(frame.matchday.tolist(),
+                         sorted(frame.matchday.tolist(), reverse=True))
+        groups = self.frame.group_by('matchday')
+        self.assertEqual(sorted(groups),
+                         sorted(set(m['matchday'] for m in MATCHES)))
+        for matchday, group in groups.items():
+            self.assertTrue((group.matchday == matchday).all())
+        self.assertEqual(sum(len(g) for g in groups.values()), 6)
+        self.assertEqual(self.frame.count_by('matchday'),
+                         {k: len(g) for k, g in groups.items()})
+
+    def test_empty(self):
+        frame = FixtureFrame.from_json([])
+        self.assertEqual(len(frame), 0)
+        self.assertEqual(len(frame.filter(status='FINISHED')), 0)
+        self.assertEqual(frame.group_by('matchday'), {})
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_football(self, mock_get):
+        response = Mock(status_code=200, headers={}, content=b'')
+        response.json.return_value = resources.FIXTURES_V4
+        mock_get.return_value = response
+        f = Football(api_key='key', rate_limiter=None, cache=True)
+        frame = f.get_comp_fixtures(2021, as_frame=True)
+        self.assertIsInstance(frame, FixtureFrame)
+        self.assertEqual(len(frame), 6)
+        # A cached body isn't converted twice.
+        self.assertIs(f.get_comp_fixtures(2021, as_frame=True), frame)
+        # So callers can't change each other's frame.
+        with self.assertRaises(ValueError):
+            frame.status[0] = 0
+        with self.assertRaises(ValueError):
+            frame[:2].home_goals[0] = 9
+        self.assertTrue(frame.filter(status='FINISHED').id.flags.writeable)
+        self.assertIsInstance(f.get_team_fixtures(57, as_frame=True),
+                              FixtureFrame)
+        self.assertIsInstance(f.get_comp_fixtures(2021)[0], Fixture)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import json
+import unittest
+from unittest.mock import Mock, patch
+
+from tests import resources
+from pyfootball.football import Football
+from pyfootball.identity import IdentityMap, TeamRef
+
+ROUTES = {
+    '/competitions/': resources.COMPETITIONS_V4,
+    '/competitions/2021/matches': resources.FIXTURES_V4,
+    '/competitions/2021/standings': resources.LEAGUE_TABLE_V4,
+    '/persons/7784': resources.PLAYER_V4,
+}
+
+
+def body(data):
+    # A fresh copy, as decoded from a response.
+    return json.loads(json.dumps(data))
+
+
+class TestIdentityMap(unittest.TestCase):
+    def test_intern_body(self):
+        identity_map = IdentityMap()
+        fixtures = identity_map.intern_body(body(resources.FIXTURES_V4))
+        table = identity_map.intern_body(body(resources.LEAGUE_TABLE_V4))
+        first, second = fixtures['matches'][0], fixtures['matches'][2]
+        self.assertIs(first['awayTeam'], second['homeTeam'])
+        self.assertIs(first['competition'], second['competition'])
+        self.assertIs(first['area'], table['area'])
+        self.assertIs(first['homeTeam'],
+                      table['standings'][0]['table'][1]['team'])
+        self.assertEqual(fixtures, body(resources.FIXTURES_V4))
+        self.assertGreater(identity_map.hits, 0)
+
+    def test_team_ref(self):
+        identity_map = IdentityMap()
+        data = identity_map.intern_body(body(resources.FIXTURES_V4))
+        team = data['matches'][0]['homeTeam']
+        self.assertIsInstance(team, TeamRef)
+        self.assertEqual((team.id, team.name, team.tla),
+                         (57, 'Arsenal FC', 'ARS'))
+        self.assertEqual(team, resources.FIXTURE_V4['homeTeam'])
+        self.assertNotEqual(team, data['matches'][0]['awayTeam'])
+        self.assertEqual(len({m['homeTeam'] for m in data['matches']}), 4)
+        self.assertEqual(identity_map.get('team', 57), [team])
+
+    def test_shapes_and_updates(self):
+        identity_map = IdentityMap()
+        data = identity_map.intern_body(body(resources.FIXTURES_V4))
+        player = identity_map.intern_body(body(resources.PLAYER_V4))
+        # A player's short team dict is kept apart from the full one.
+        self.assertEqual(set(player['currentTeam']), {'id', 'name'})
+        self.assertEqual(len(identity_map.get('team', 57)), 2)
+
+        renamed = body(resources.FIXTURES_V4)
+        for match in renamed['matches']:
+            for team in (match['homeTeam'], match['awayTeam']):
+                if team['id'] == 57:
+                    team['name'] = 'The Arsenal'
+        renamed = identity_map.intern_body(renamed)
+        self.assertEqual(renamed['matches'][0]['homeTeam'].name,
+                         'The Arsenal')
+        self.assertEqual(data['matches'][0]['homeTeam'].name, 'Arsenal FC')
+        later = identity_map.intern_body(body(renamed))
+        self.assertIs(later['matches'][0]['homeTeam'],
+                      renamed['matches'][0]['homeTeam'])
+        identity_map.clear()
+        self.assertEqual(len(identity_map), 0)
+
+
+class TestClient(unittest.TestCase):
+    def _get(self, url, **kwargs):
+        response = Mock(headers={}, content=b'{}')
+        response.json.return_value = body(ROUTES[url.split('/v4')[1]])
+        encoded = json.dumps(response.json.return_value).encode()
+        response.iter_content.return_value = [encoded]
+        return response
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_shared_across_requests(self, mock_get):
+        mock_get.side_effect = self._get
+        for models in (None, 'compact', 'lazy'):
+            f = Football(api_key='key', rate_limiter=None,
+                         identity_map=True, models=models)
+            fixtures = f.get_comp_fixtures(2021)
+            table = f.get_league_table(2021)
+            self.assertIs(fixtures[0].home_team, fixtures[3].away_team)
+            self.assertIs(fixtures[0].home_team,
+                          table.total_standings[1].team)
+            self.assertEqual(fixtures[0].home_team.name, 'Arsenal FC')
+            streamed = list(f.iter_comp_fixtures(2021))
+            self.assertIs(streamed[0].home_team, fixtures[0].home_team)
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_disabled(self, mock_get):
+        mock_get.side_effect = self._get
+        f = Football(api_key='key', rate_limiter=None)
+        fixtures = f.get_comp_fixtures(2021)
+        self.assertIsNot(fixtures[0].home_team, fixtures[3].away_team)
+        self.assertNotIsInstance(fixtures[0].home_team, TeamRef)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import copy
+import unittest
+from datetime import datetime
+
+from tests import resources
+from pyfootball.cache import ResponseCache
+from pyfootball.index import FixtureIndex
+from pyfootball.models.fixture import Fixture
+
+
+def ids(fixtures):
+    return [f.id for f in fixtures]
+
+
+def scan(fixtures, condition):
+    # The result of a linear scan, in kickoff order.
+    return ids(sorted((f for f in fixtures if condition(f)),
+                      key=lambda f: (f.date, f.id)))
+
+
+class TestFixtureIndex(unittest.TestCase):
+    def setUp(self):
+        self.matches = resources.season_v4(played_matchdays=20)
+        self.fixtures = [Fixture(m) for m in self.matches]
+        self.index = FixtureIndex(self.fixtures)
+
+    def test_lookups(self):
+        index, fixtures = self.index, self.fixtures
+        self.assertEqual(len(index), 380)
+        self.assertIn(500000, index)
+        self.assertIs(index.get(500000), fixtures[0])
+        self.assertEqual(ids(index.by_team(1003)), scan(
+            fixtures, lambda f: 1003 in (f.home_team_id, f.away_team_id)))
+        self.assertEqual(len(index.by_team(1003)), 38)
+        self.assertEqual(ids(index.by_matchday(12)),
+                         scan(fixtures, lambda f: f.matchday == 12))
+        self.assertEqual(ids(index.by_status('TIMED')),
+                         scan(fixtures, lambda f: f.status == 'TIMED'))
+        self.assertEqual(len(index.by_competition(2021)), 380)
+        self.assertEqual(index.by_team(1), [])
+        self.assertEqual(ids(index), scan(fixtures, lambda f: True))
+
+    def test_ranges(self):
+        index, fixtures = self.index, self.fixtures
+        start, end = datetime(2023, 9, 1), datetime(2023, 10, 7, 15)
+        self.assertEqual(ids(index.between(start, end)),
+                         scan(fixtures, lambda f: start <= f.date < end))
+        self.assertEqual(len(index.between(start, end)), 50)
+        self.assertEqual(ids(index.between(start, end, team_id=1003)),
+                         scan(fixtures, lambda f: start <= f.date < end and
+                              1003 in (f.home_team_id, f.away_team_id)))
+        self.assertEqual(len(index.between(end=start)), 30)
+
+        after = datetime(2023, 12, 30, 15)
+        fixture = index.next_fixture(1003, after)
+        self.assertEqual(fixture.date, after)
+        self.assertIn(1003, (fixture.home_team_id, fixture.away_team_id))
+        self.assertIsNone(index.next_fixture(1003, datetime(2025, 1, 1)))
+
+    def test_query(self):
+        index, fixtures = self.index, self.fixtures
+        self.assertEqual(
+            ids(index.query(team_id=1003, status='FINISHED',
+                            start=datetime(2023, 10, 1))),
+            scan(fixtures, lambda f: 1003 in (f.home_team_id,
+                                              f.away_team_id) and
+                 f.status == 'FINISHED' and f.date >= datetime(2023, 10, 1)))
+        self.assertEqual(len(index.query(matchday=3, comp_id=2021)), 10)
+        self.assertEqual(index.query(matchday=3, status='TIMED'), [])
+        self.assertEqual(len(index.query()), 380)
+
+    def test_query_reads_one_bucket(self):
+        class Bucket(list):
+            reads = 0
+
+            def __iter__(self):
+                Bucket.reads += 1
+                return super(Bucket, self).__iter__()
+
+        index = self.index
+        buckets = index._indexes['competition']
+        buckets[2021] = Bucket(buckets[2021])
+        fixtures = index.query(team_id=1003, comp_id=2021, status='TIMED')
+        self.assertEqual(ids(fixtures), scan(
+            self.fixtures, lambda f: 1003 in (f.home_team_id,
+                                              f.away_team_id) and
+            f.status == 'TIMED'))
+        self.assertEqual(Bucket.reads, 0)
+        self.assertEqual(index.query(team_id=1003, comp_id=2014), [])
+
+    def test_incremental(self):
+        index = self.index
+        match = copy.deepcopy(self.matches[250])
+        match['status'] = 'POSTPONED'
+        match['utcDate'] = '2024-06-01T15:00:00Z'
+        index.add(match)
+        self.assertEqual(len(index), 380)
+        self.assertEqual(ids(index.by_status('POSTPONED')), [match['id']])
+        self.assertNotIn(match['id'], ids(index.by_status('TIMED')))
+        self.assertEqual(index.between()[-1].id, match['id'])
+        self.assertEqual(len(index.by_matchday(26)), 10)
+
+        removed = index.remove(match['id'])
+        self.assertEqual(removed.id, match['id'])
+        self.assertIsNone(index.remove(match['id']))
+        self.assertEqual(len(index), 379)
+        self.assertEqual(index.by_status('POSTPONED'), [])
+        self.assertEqual(len(index.by_matchday(26)), 9)
+
+    def test_from_cache(self):
+        cache = ResponseCache()
+        cache.set('https://api.football-data.org/v4/matches/',
+                  resources.FIXTURES_V4, 1)
+        cache.set('https://api.football-data.org/v4/matches/435943',
+                  resources.FIXTURE_V4, 1)
+        cache.set('https://api.football-data.org/v4/teams/57',
+                  resources.TEAM_V4, 1)
+        index = FixtureIndex.from_cache(cache)
+        self.assertEqual(len(index), 6)
+        self.assertEqual(ids(index.by_team(57)), [435943, 435946, 435947])
+        self.assertEqual(cache.stats()['hits'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
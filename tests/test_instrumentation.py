@@ -0,0 +1,218 @@
+import asyncio
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+import warnings
+from unittest.mock import patch
+
+from requests import HTTPError
+
+from tests.server import FootballDataServer
+from pyfootball.cache import ResponseCache
+from pyfootball.diskcache import DiskCache
+from pyfootball.football import Football
+from pyfootball.instrumentation import Histogram, HistogramExporter, \
+    PrometheusExporter, RequestRecord
+from pyfootball.transport import Transport
+
+try:
+    from pyfootball.aio import AsyncFootball, AsyncTransport
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class TestHistogram(unittest.TestCase):
+    def test_observe(self):
+        histogram = Histogram(buckets=(0.1, 0.2, 0.4))
+        for value in (0.05, 0.15, 0.15, 0.3, 1.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.count, 5)
+        self.assertAlmostEqual(histogram.mean, 0.33)
+        self.assertEqual(histogram.cumulative(), [
+            (0.1, 1), (0.2, 3), (0.4, 4), (float('inf'), 5)])
+        self.assertAlmostEqual(histogram.quantile(0.5), 0.175)
+        self.assertEqual(histogram.quantile(1.0), 0.4)
+        self.assertIsNone(Histogram().quantile(0.5))
+
+    def test_prometheus(self):
+        exporter = PrometheusExporter(buckets=(0.1, 1.0))
+        exporter(RequestRecord(endpoint='team', status=200, cache='miss',
+                               total=0.05, ttfb=0.04, bytes=100,
+                               rate_limit_remaining=9))
+        exporter(RequestRecord(endpoint='team', status=None, cache='hit'))
+        text = exporter.render()
+        self.assertIn('pyfootball_requests_total{endpoint="team",'
+                      'status="200",cache="miss"} 1\n', text)
+        self.assertIn('pyfootball_requests_total{endpoint="team",'
+                      'status="",cache="hit"} 1\n', text)
+        self.assertIn('pyfootball_response_bytes_total{endpoint="team"} '
+                      '100\n', text)
+        self.assertIn('pyfootball_request_seconds_bucket{endpoint="team",'
+                      'phase="total",le="0.1"} 1\n', text)
+        self.assertIn('pyfootball_request_seconds_bucket{endpoint="team",'
+                      'phase="total",le="+Inf"} 1\n', text)
+        self.assertIn('pyfootball_request_seconds_count{endpoint="team",'
+                      'phase="ttfb"} 1\n', text)
+        self.assertIn('pyfootball_rate_limit_remaining 9\n', text)
+
+
+class TestInstrumentation(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FootballDataServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.latency, self.server.rate_limit = 0.0, None
+        self.records = []
+
+    def client(self, **kwargs):
+        kwargs.setdefault('rate_limiter', None)
+        transport = Transport(base_url=self.server.url,
+                              hooks=[self.records.append], **kwargs)
+        return Football(api_key='key', transport=transport)
+
+    def test_records(self):
+        f = self.client(cache=ResponseCache())
+        f.get_team(1000)
+        f.get_team(1000)
+        constructor, miss, hit = self.records
+        self.assertEqual(constructor.endpoint, 'all_competitions')
+        self.assertIsNotNone(constructor.connect)
+        self.assertEqual(miss.endpoint, 'team')
+        self.assertTrue(miss.url.endswith('/teams/1000'))
+        self.assertEqual((miss.status, miss.cache), (200, 'miss'))
+        # The connection opened by the constructor is reused.
+        self.assertIsNone(miss.connect)
+        self.assertLessEqual(miss.ttfb, miss.total)
+        self.assertGreater(miss.bytes, 500)
+        self.assertIsNotNone(miss.decode)
+        self.assertIsNotNone(miss.build)
+        self.assertEqual(miss.retries, 0)
+        self.assertEqual((hit.status, hit.cache), (None, 'hit'))
+        self.assertIsNotNone(hit.build)
+        self.assertEqual(f.get_prev_response()['Status-Code'], 200)
+        self.assertEqual(f.get_prev_response()['Endpoint'], miss.url)
+
+    def test_host_resolved_once(self):
+        transport = Transport(
+            base_url=self.server.url.replace('127.0.0.1', 'localhost'),
+            rate_limiter=None, hooks=[self.records.append])
+        with patch('socket.getaddrinfo',
+                   wraps=socket.getaddrinfo) as getaddrinfo:
+            Football(api_key='key', transport=transport)
+        hosts = [call[0][0] for call in getaddrinfo.call_args_list]
+        self.assertEqual(hosts.count('localhost'), 1)
+        self.assertIsNotNone(self.records[0].dns)
+        self.assertIsNotNone(self.records[0].connect)
+
+    def test_errors_and_rate_limit(self):
+        self.server.rate_limit = 10
+        f = self.client()
+        with self.assertRaises(HTTPError):
+            f.get_team(1)
+        record = self.records[-1]
+        self.assertEqual((record.endpoint, record.status), ('team', 404))
+        self.assertEqual(record.rate_limit_remaining, 8)
+        self.assertEqual(f.get_prev_response()['Status-Code'], 404)
+
+    def test_streaming(self):
+        f = self.client()
+        self.assertEqual(sum(1 for fixture in f.iter_all_fixtures()), 760)
+        record = self.records[-1]
+        self.assertEqual((record.endpoint, record.cache),
+                         ('all_fixtures', 'stream'))
+        self.assertGreater(record.bytes, 100000)
+        self.assertGreaterEqual(record.total, record.ttfb)
+
+    def test_coalesced(self):
+        self.server.latency = 0.05
+        f = self.client()
+        f.get_teams([1000] * 4, max_workers=4)
+        outcomes = sorted(record.cache for record in self.records[1:])
+        self.assertIn('miss', outcomes)
+        self.assertIn('coalesced', outcomes)
+        self.assertEqual(len(outcomes), 4)
+
+    def test_revalidated(self):
+        directory = tempfile.mkdtemp()
+        try:
+            f = self.client(disk_cache=DiskCache(
+                directory, ttls={'comp_fixtures': 0, 'team': 60}))
+            f.get_comp_fixtures(2021)
+            f.get_comp_fixtures(2021)
+            f.get_team(1000)
+            f.get_team(1000)
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual([(record.status, record.cache)
+                          for record in self.records[1:]],
+                         [(200, 'miss'), (304, 'revalidated'),
+                          (200, 'miss'), (None, 'disk')])
+
+    def test_prev_response_per_thread(self):
+        f = self.client()
+        f.get_team(1000)
+        seen = []
+
+        def fetch():
+            seen.append(f.get_prev_response())
+            f.get_team(1001)
+            seen.append(f.get_prev_response()['Endpoint'])
+
+        thread = threading.Thread(target=fetch)
+        thread.start()
+        thread.join()
+        # Another thread's responses aren't reported.
+        self.assertEqual(seen[0], {})
+        self.assertTrue(seen[1].endswith('/teams/1001'))
+        self.assertTrue(f.get_prev_response()['Endpoint']
+                        .endswith('/teams/1000'))
+
+    def test_exporter_and_failing_hook(self):
+        exporter = HistogramExporter()
+
+        def fail(record):
+            raise ValueError('broken hook')
+
+        f = self.client()
+        f.transport.instrumentation.add_hook(exporter)
+        f.transport.instrumentation.add_hook(fail)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            for team_id in range(1000, 1005):
+                f.get_team(team_id)
+        self.assertEqual(len(caught), 5)
+        self.assertEqual(exporter.requests[('team', 200, 'miss')], 5)
+        self.assertEqual(exporter.histogram('team').count, 5)
+        summary = exporter.summary()['team']['total']
+        self.assertLessEqual(summary['p50'], summary['p99'])
+
+    @unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+    def test_async(self):
+        async def run():
+            transport = AsyncTransport(base_url=self.server.url,
+                                       rate_limiter=None,
+                                       hooks=[self.records.append])
+            async with AsyncFootball(api_key='key',
+                                     transport=transport) as f:
+                await f.get_comp_fixtures(2021)
+                self.assertEqual(f.get_prev_response()['Status-Code'], 200)
+
+        asyncio.run(run())
+        validate, fixtures = self.records
+        self.assertIsNotNone(validate.connect)
+        self.assertEqual((fixtures.endpoint, fixtures.cache),
+                         ('comp_fixtures', 'miss'))
+        self.assertIsNotNone(fixtures.build)
+        self.assertGreater(fixtures.bytes, 100000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import asyncio
+import time
+import unittest
+from collections import Counter
+
+from tests.server import FootballDataServer
+from pyfootball.football import Football
+from pyfootball.keypool import KeyPool
+from pyfootball.ratelimit import AVAILABLE_HEADER, RESET_HEADER
+from pyfootball.transport import Transport
+
+try:
+    from pyfootball.aio import AsyncFootball, AsyncTransport
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+def _headers(available, reset=60):
+    return {AVAILABLE_HEADER: str(available), RESET_HEADER: str(reset)}
+
+
+class TestKeyPool(unittest.TestCase):
+    def test_weighted_by_remaining(self):
+        pool = KeyPool(['a', 'b', 'c'], seed=1)
+        pool.update('a', _headers(90))
+        pool.update('b', _headers(10))
+        counts = Counter(pool.choose() for i in range(2000))
+        # c's budget isn't known, so it counts as much as the fullest key.
+        self.assertGreater(counts['a'], counts['b'] * 4)
+        self.assertGreater(counts['c'], counts['b'] * 4)
+        self.assertEqual(pool.remaining('b'), 10)
+        self.assertIsNone(pool.remaining('c'))
+
+    def test_quarantine(self):
+        pool = KeyPool(['a', 'b'], quarantine=60)
+        pool.update('a', {}, 403)
+        self.assertEqual(pool.available(), ['b'])
+        self.assertEqual({pool.choose() for i in range(20)}, {'b'})
+        pool.update('b', _headers(0, 5), 429)
+        # Both are out; b's counter resets first.
+        self.assertEqual(pool.choose(), 'b')
+        self.assertEqual(pool.quarantined, {'a': 1, 'b': 1})
+        pool.release('a')
+        self.assertEqual(pool.choose(), 'a')
+
+    def test_used_up_key(self):
+        pool = KeyPool(['a', 'b'])
+        pool.update('a', _headers(0), 200)
+        self.assertEqual({pool.choose() for i in range(20)}, {'b'})
+
+    def test_no_keys(self):
+        with self.assertRaises(ValueError):
+            KeyPool([])
+
+
+class TestKeyPoolClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FootballDataServer(reset_seconds=60).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.keys.clear()
+        self.server.throttled = 0
+        self.server._windows.clear()
+
+    def client(self, keys):
+        transport = Transport(base_url=self.server.url, rate_limiter=None)
+        return Football(api_key=keys, transport=transport)
+
+    def test_spreads_requests(self):
+        self.server.rate_limit, self.server.api_key = 5, None
+        f = self.client(['k1', 'k2', 'k3'])
+        for team_id in range(1000, 1014):
+            f.get_team(team_id)
+        self.assertEqual(sum(self.server.keys.values()), 15)
+        self.assertEqual(set(self.server.keys.values()), {5})
+        self.assertEqual(self.server.throttled, 0)
+
+    def test_retries_with_another_key(self):
+        self.server.rate_limit = None
+        self.server.api_key = {'k1', 'k2'}
+        pool = KeyPool(['bad', 'k1', 'k2'])
+        # Only bad has requests left, so it is tried first.
+        pool.update('k1', _headers(0))
+        pool.update('k2', _headers(0))
+        f = self.client(pool)
+        competition = f.get_competition(2021)
+        teams = competition.get_teams()
+        self.assertEqual(len(teams[0].get_fixtures()), 38)
+        self.assertEqual(self.server.keys['bad'], 1)
+        self.assertEqual(pool.quarantined['bad'], 1)
+        self.assertEqual(pool.available(), ['k1', 'k2'])
+        self.assertEqual(f.get_prev_response()['Status-Code'], 200)
+
+    def test_retries_after_429(self):
+        self.server.rate_limit, self.server.api_key = 5, None
+        f = self.client(['k1', 'k2'])
+        records = []
+        f.transport.instrumentation.add_hook(records.append)
+        # k1 is used up, but the pool thinks k2 is instead.
+        self.server._windows['k1'] = (0, time.monotonic() + 60)
+        f.transport.key_pool.update('k2', _headers(0))
+        f.get_team(1000)
+        self.assertEqual(self.server.throttled, 1)
+        self.assertEqual(records[-1].retries, 1)
+        self.assertEqual(records[-1].status, 200)
+        self.assertEqual(f.transport.key_pool.available(), ['k2'])
+
+    @unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+    def test_async(self):
+        self.server.rate_limit, self.server.api_key = 5, {'k1', 'k2'}
+
+        async def run():
+            transport = AsyncTransport(base_url=self.server.url,
+                                       rate_limiter=None)
+            async with AsyncFootball(api_key=['k1', 'bad', 'k2'],
+                                     transport=transport) as f:
+                for team_id in range(1000, 1008):
+                    await f.get_team(team_id)
+
+        asyncio.run(run())
+        self.assertEqual(self.server.keys['k1'] + self.server.keys['k2'], 9)
+        self.assertLessEqual(self.server.keys['bad'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
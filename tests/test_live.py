@@ -0,0 +1,207 @@
+import asyncio
+import copy
+import threading
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+from tests import resources
+from pyfootball import live
+from pyfootball.football import Football
+from pyfootball.live import Poller, diff, next_interval
+from pyfootball.models.fixture import Fixture
+
+# Saturday 26 August 2023, 14:00 UTC: Arsenal v Liverpool kicks off, and
+# Chelsea v Manchester City is due at 16:30.
+KICKOFF = 1693058400
+
+
+def timestamp(*args):
+    return (datetime(*args) - datetime(1970, 1, 1)).total_seconds()
+
+
+class Match(object):
+    """One match's data across polls."""
+    def __init__(self, data):
+        self.data = copy.deepcopy(data)
+
+    def update(self, status=None, score=None, updated=None):
+        if status is not None:
+            self.data['status'] = status
+        if score is not None:
+            self.data['score']['fullTime'] = {'home': score[0],
+                                              'away': score[1]}
+        self.data['lastUpdated'] = updated or self.data['lastUpdated']
+
+
+class TestDiff(unittest.TestCase):
+    def setUp(self):
+        self.matches = [Match(m) for m in resources.FIXTURES_V4['matches']]
+        self.in_play = self.matches[4]
+        self.timed = self.matches[5]
+
+    def snapshot(self):
+        return {m.data['id']: Fixture(copy.deepcopy(m.data))
+                for m in self.matches}
+
+    def test_unchanged(self):
+        self.assertEqual(diff(self.snapshot(), self.snapshot()), [])
+
+    def test_events(self):
+        before = self.snapshot()
+        self.in_play.update(score=(2, 0), updated='2023-08-26T14:50:00Z')
+        self.timed.update(status='IN_PLAY', score=(0, 0),
+                          updated='2023-08-26T16:31:00Z')
+        events = diff(before, self.snapshot())
+        self.assertEqual([(e.type, e.fixture.id) for e in events],
+                         [(live.GOAL, 435947), (live.KICKOFF, 435948)])
+        self.assertEqual(events[0].score, (2, 0))
+        self.assertEqual(events[0].previous.score['fullTime']['home'], 1)
+
+        before = self.snapshot()
+        self.in_play.update(status='PAUSED')
+        self.timed.update(status='FINISHED', score=(0, 1))
+        events = diff(before, self.snapshot())
+        self.assertEqual([(e.type, e.fixture.id) for e in events],
+                         [(live.STATUS_CHANGE, 435947), (live.GOAL, 435948),
+                          (live.FULL_TIME, 435948)])
+
+    def test_missing_fixtures(self):
+        before = self.snapshot()
+        del before[435947]
+        self.in_play.update(score=(2, 0))
+        self.assertEqual(diff(before, self.snapshot()), [])
+
+
+class TestNextInterval(unittest.TestCase):
+    def fixtures(self, *statuses):
+        return [Fixture(dict(m, status=status)) for m, status in
+                zip(resources.FIXTURES_V4['matches'][4:], statuses)]
+
+    def test_live(self):
+        fixtures = self.fixtures('IN_PLAY', 'TIMED')
+        self.assertEqual(next_interval(fixtures, KICKOFF, 20, 3600), 20)
+
+    def test_next_kickoff(self):
+        fixtures = self.fixtures('FINISHED', 'TIMED')
+        now = timestamp(2023, 8, 26, 16, 0)
+        self.assertEqual(next_interval(fixtures, now, 20, 3600), 1800)
+        self.assertEqual(next_interval(fixtures, now, 20, 600), 600)
+        # Overdue, but the status hasn't changed yet.
+        now = timestamp(2023, 8, 26, 16, 35)
+        self.assertEqual(next_interval(fixtures, now, 20, 3600), 20)
+
+    def test_idle(self):
+        fixtures = self.fixtures('FINISHED', 'POSTPONED')
+        self.assertEqual(next_interval(fixtures, KICKOFF, 20, 3600), 3600)
+        self.assertEqual(next_interval([], KICKOFF, 20, 3600), 3600)
+
+
+class TestPoller(unittest.TestCase):
+    def setUp(self):
+        self.match = Match(resources.FIXTURES_V4['matches'][4])
+        self.updates = [
+            {},
+            {'score': (1, 1), 'updated': '2023-08-26T14:40:00Z'},
+            {'status': 'PAUSED'},
+            {'status': 'IN_PLAY'},
+            {'status': 'FINISHED', 'score': (2, 1)},
+        ]
+
+    def fetch(self):
+        self.match.update(**self.updates.pop(0))
+        return [copy.deepcopy(self.match.data)]
+
+    def test_callbacks(self):
+        poller = Poller(self.fetch, 0.01, 1, clock=lambda: KICKOFF)
+        events, goals = [], []
+        poller.on(events.append)
+        poller.on(goals.append, live.GOAL)
+        poller.run(max_polls=5)
+        self.assertEqual([e.type for e in events],
+                         [live.GOAL, live.STATUS_CHANGE, live.STATUS_CHANGE,
+                          live.GOAL, live.FULL_TIME])
+        self.assertEqual([e.score for e in goals], [(1, 1), (2, 1)])
+        self.assertEqual(poller.polls, 5)
+        self.assertEqual(poller.interval, 1)
+        with self.assertRaises(ValueError):
+            poller.on(print, 'penalty')
+
+    def test_stop(self):
+        # Stopping ends the wait for the next poll.
+        polled = threading.Event()
+        poller = Poller(lambda: polled.set() or self.fetch(), 60, 60,
+                        clock=lambda: KICKOFF)
+        thread = threading.Thread(target=poller.run)
+        thread.start()
+        polled.wait(5)
+        poller.stop()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(poller.polls, 1)
+
+    def test_async_iterator(self):
+        async def fetch():
+            return self.fetch()
+
+        async def collect(poller):
+            return [event.type async for event in poller.events(max_polls=5)]
+
+        types = asyncio.run(collect(Poller(fetch, 0.01, 1,
+                                           clock=lambda: KICKOFF)))
+        self.assertEqual(types[-2:], [live.GOAL, live.FULL_TIME])
+        self.setUp()
+        types = asyncio.run(collect(Poller(self.fetch, 0.01, 1,
+                                           clock=lambda: KICKOFF)))
+        self.assertEqual(len(types), 5)
+
+    def test_stop_async(self):
+        # Stopping from the loop or another thread ends a long wait.
+        async def fetch():
+            return self.fetch()
+
+        async def consume(poller, stop):
+            async def stop_soon():
+                await asyncio.sleep(0.05)
+                stop()
+
+            task = asyncio.ensure_future(stop_soon())
+            events = [event async for event in poller.events()]
+            await task
+            return events
+
+        for stop in ('loop', 'thread'):
+            self.setUp()
+            poller = Poller(fetch, 60, 60, clock=lambda: KICKOFF)
+            if stop == 'loop':
+                stopper = poller.stop
+            else:
+                def stopper():
+                    threading.Thread(target=poller.stop).start()
+            start = time.monotonic()
+            asyncio.run(asyncio.wait_for(consume(poller, stopper), 5))
+            self.assertLess(time.monotonic() - start, 1)
+            self.assertEqual(poller.polls, 1)
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_football(self, mock_get):
+        def get(url, **kwargs):
+            response = Mock(headers={}, content=b'')
+            if url.endswith('/competitions/'):
+                response.json.return_value = resources.COMPETITIONS_V4
+            else:
+                response.json.return_value = {'matches': self.fetch()}
+            return response
+
+        mock_get.side_effect = get
+        f = Football(api_key='key', rate_limiter=None)
+        poller = f.live_poller(2021, live_interval=0.01)
+        self.assertEqual(poller.poll(), [])
+        self.assertEqual([e.type for e in poller.poll()], [live.GOAL])
+        self.assertTrue(mock_get.call_args[0][0].endswith(
+            '/competitions/2021/matches'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from pyfootball.ratelimit import RateLimiter, TokenBucket
+from pyfootball.transport import Transport
+
+
+def _headers(available, reset):
+    return {'X-Requests-Available-Minute': str(available),
+            'X-RequestCounter-Reset': str(reset)}
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_unknown_budget_never_waits(self):
+        bucket = TokenBucket()
+        for i in range(100):
+            self.assertLess(bucket.acquire(), 0.01)
+        self.assertIsNone(bucket.tokens)
+
+    def test_plenty_left_adds_no_delay(self):
+        bucket = TokenBucket()
+        bucket.update(_headers(100, 60))
+        start = time.monotonic()
+        for i in range(50):
+            bucket.acquire()
+        self.assertLess(time.monotonic() - start, 0.05)
+        self.assertEqual(bucket.tokens, 50)
+
+    def test_empty_bucket_waits_for_reset(self):
+        bucket = TokenBucket()
+        bucket.update(_headers(0, 0.2))
+        waited = bucket.acquire()
+        self.assertGreaterEqual(waited, 0.15)
+
+    def test_low_budget_is_paced(self):
+        bucket = TokenBucket(pace_below=1.0)
+        bucket.update(_headers(4, 0.4))
+        start = time.monotonic()
+        for i in range(3):
+            bucket.acquire()
+        # Three of four tokens spread over 0.4s leaves gaps of ~0.1s.
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+    def test_429_empties_bucket(self):
+        bucket = TokenBucket()
+        bucket.update(_headers(10, 60))
+        bucket.update({'X-RequestCounter-Reset': '30'}, status_code=429)
+        self.assertEqual(bucket.tokens, 0)
+
+    def test_stale_header_does_not_raise_budget(self):
+        bucket = TokenBucket()
+        bucket.update(_headers(5, 30))
+        bucket.update(_headers(8, 29.5))
+        self.assertEqual(bucket.tokens, 5)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_one_bucket_per_key(self):
+        limiter = RateLimiter()
+        self.assertIs(limiter.bucket('a'), limiter.bucket('a'))
+        self.assertIsNot(limiter.bucket('a'), limiter.bucket('b'))
+
+    def test_concurrent_acquire_never_overdraws(self):
+        limiter = RateLimiter(pace_below=0)
+        limiter.update('a', _headers(20, 60))
+        threads = [threading.Thread(target=limiter.acquire, args=('a',))
+                   for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(limiter.bucket('a').tokens, 0)
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_transport_retries_after_429(self, mock_get):
+        limited = Mock(status_code=429,
+                       headers=_headers(0, 0.1))
+        ok = Mock(status_code=200, headers=_headers(9, 60), content=b'{}')
+        mock_get.side_effect = [limited, ok]
+
+        limiter = RateLimiter()
+        transport = Transport(headers={'X-Auth-Token': 'k'},
+                              rate_limiter=limiter)
+        self.assertIs(transport.get('https://example.org/x'), ok)
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(limiter.bucket('k').tokens, 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import shutil
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from requests import HTTPError
+
+from tests.server import FootballDataServer
+from pyfootball import globals
+from pyfootball.diskcache import DiskCache
+from pyfootball.football import Football
+from pyfootball.frame import np
+from pyfootball.ratelimit import RateLimiter
+from pyfootball.transport import Transport
+
+
+class TestServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FootballDataServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        server = self.server
+        server.latency, server.rate_limit, server.chunk_size = \
+            0.0, None, 64 * 1024
+        server.api_key = None
+        del server.requests[:]
+        server.connections = server.throttled = 0
+
+    def client(self, api_key='key', **kwargs):
+        kwargs.setdefault('rate_limiter', None)
+        transport = Transport(base_url=self.server.url, **kwargs)
+        return Football(api_key=api_key, transport=transport)
+
+    def test_routes(self):
+        f = self.client()
+        self.assertEqual(len(f.get_all_competitions()), 2)
+        self.assertEqual(len(f.get_comp_fixtures(2014)), 380)
+        self.assertEqual(len(f.get_competition_teams(2021)), 20)
+        team = f.get_team(1003)
+        self.assertEqual(team.name, 'Team 03 FC')
+        player = f.get_player(team.squad[0]['id'])
+        self.assertEqual(player.currentTeam['id'], 1003)
+        self.assertEqual(len(f.get_player_matches(player.id, 5)), 5)
+        self.assertEqual(len(f.get_team_fixtures(1003)), 38)
+        self.assertEqual(f.get_fixture(42).id, 42)
+        if np is not None:
+            table = f.get_league_table(2021)
+            self.assertEqual(len(table.total_standings), 20)
+        with self.assertRaises(HTTPError):
+            f.get_team(1)
+        self.assertEqual(self.server.requests[-1][1], 404)
+
+    def test_connection_reuse(self):
+        f = self.client()
+        for team_id in range(1000, 1020):
+            f.get_team(team_id)
+        self.assertEqual(len(self.server.requests), 21)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_concurrency(self):
+        self.server.latency = 0.05
+        f = self.client(pool_size=8)
+        start = time.perf_counter()
+        results = f.get_teams(range(1000, 1016), max_workers=8)
+        elapsed = time.perf_counter() - start
+        self.assertTrue(all(result.ok for result in results))
+        self.assertLess(elapsed, 16 * 0.05 / 2)
+        self.assertLessEqual(self.server.connections, 8)
+
+    def test_rate_limit(self):
+        self.server.rate_limit, self.server.reset_seconds = 3, 1
+        # The constructor's request counts too.
+        f = self.client()
+        for team_id in range(1000, 1002):
+            f.get_team(team_id)
+        with self.assertRaises(HTTPError):
+            f.get_team(1003)
+        self.assertEqual(self.server.throttled, 1)
+
+        # The limiter waits for the window to reset instead.
+        time.sleep(1)
+        f = self.client(rate_limiter=RateLimiter())
+        start = time.perf_counter()
+        for team_id in range(1000, 1005):
+            f.get_team(team_id)
+        self.assertEqual(self.server.throttled, 1)
+        self.assertGreater(time.perf_counter() - start, 0.5)
+
+    def test_clients_with_different_keys(self):
+        self.server.api_key = 'good'
+        good = self.client('good')
+        self.server.api_key = None
+        other = self.client('other')
+        self.server.api_key = 'good'
+        self.assertEqual(globals.headers, {})
+
+        competition = good.get_competition(2021)
+        first = competition.get_teams()[0].id
+
+        def fetch(i):
+            if i % 2:
+                return competition.get_teams()[0].id
+            try:
+                other.get_team(1000)
+            except HTTPError:
+                return 'refused'
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(fetch, range(40)))
+        self.assertEqual(results[1::2], [first] * 20)
+        self.assertEqual(results[::2], ['refused'] * 20)
+        self.assertEqual(good.get_prev_response()['Status-Code'], 200)
+
+    def test_revalidation(self):
+        directory = tempfile.mkdtemp()
+        try:
+            f = self.client(disk_cache=DiskCache(
+                directory, ttls={'comp_fixtures': 0}))
+            fixtures = f.get_comp_fixtures(2021)
+            self.assertEqual(f.get_comp_fixtures(2021)[0].id, fixtures[0].id)
+            self.assertEqual([status for path, status
+                              in self.server.requests[-2:]], [200, 304])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_streaming(self):
+        self.server.chunk_size = 512
+        f = self.client()
+        fixtures = list(f.iter_all_fixtures())
+        self.assertEqual(len(fixtures), 760)
+        self.assertEqual(fixtures[-1].id, 760)
+
+
+if __name__ == '__main__':
+    unittest.main()
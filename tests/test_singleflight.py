@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from tests import resources
+from pyfootball.football import Football
+from pyfootball.singleflight import SingleFlight, AsyncSingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def _run_concurrently(self, n, fn):
+        barrier = threading.Barrier(n)
+        results = [None] * n
+
+        def worker(i):
+            barrier.wait()
+            try:
+                results[i] = fn()
+            except Exception as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=worker, args=(i,))
+                   for i in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    def test_concurrent_calls_share_result(self):
+        group = SingleFlight()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return object()
+
+        results = self._run_concurrently(
+            10, lambda: group.do('key', slow))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(group.coalesced, 9)
+        for result in results:
+            self.assertIs(result, results[0])
+
+    def test_error_is_shared(self):
+        group = SingleFlight()
+
+        def failing():
+            time.sleep(0.1)
+            raise ValueError('boom')
+
+        results = self._run_concurrently(
+            5, lambda: group.do('key', failing))
+        for result in results:
+            self.assertIsInstance(result, ValueError)
+
+    def test_sequential_calls_are_not_coalesced(self):
+        group = SingleFlight()
+        self.assertEqual(group.do('key', lambda: 1), 1)
+        self.assertEqual(group.do('key', lambda: 2), 2)
+        self.assertEqual(group.coalesced, 0)
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_football_coalesces_identical_calls(self, mock_get):
+        response = Mock(status_code=200, headers={}, content=b'')
+        response.json.return_value = resources.FIXTURE_V4
+
+        def slow_get(*args, **kwargs):
+            time.sleep(0.1)
+            return response
+
+        mock_get.side_effect = slow_get
+        f = Football(api_key='key')
+        results = self._run_concurrently(
+            20, lambda: f.get_fixture(435943))
+        # One request validates the key and one fetches the fixture.
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(f.transport.single_flight.coalesced, 19)
+        for fixture in results:
+            self.assertEqual(fixture.id, 435943)
+
+
+class TestAsyncSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_share_result(self):
+        group = AsyncSingleFlight()
+        calls = []
+
+        async def slow(value):
+            calls.append(value)
+            await asyncio.sleep(0.05)
+            return value
+
+        async def run():
+            return await asyncio.gather(
+                *[group.do('key', slow, i) for i in range(10)])
+
+        results = asyncio.run(run())
+        self.assertEqual(calls, [0])
+        self.assertEqual(results, [0] * 10)
+        self.assertEqual(group.coalesced, 9)
+
+    def test_error_is_shared(self):
+        group = AsyncSingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0.05)
+            raise ValueError('boom')
+
+        async def run():
+            return await asyncio.gather(
+                *[group.do('key', failing) for i in range(3)],
+                return_exceptions=True)
+
+        for result in asyncio.run(run()):
+            self.assertIsInstance(result, ValueError)
+
+    def test_cancelled_leader_does_not_cancel_followers(self):
+        group = AsyncSingleFlight()
+        calls = []
+
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return 'done'
+
+        async def run():
+            leader = asyncio.ensure_future(
+                asyncio.wait_for(group.do('key', slow), 0.02))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(group.do('key', slow))
+            with self.assertRaises(asyncio.TimeoutError):
+                await leader
+            return await follower
+
+        self.assertEqual(asyncio.run(run()), 'done')
+        self.assertEqual(calls, [1])
+
+    def test_call_cancelled_once_nobody_waits(self):
+        group = AsyncSingleFlight()
+        finished = []
+
+        async def slow():
+            await asyncio.sleep(0.1)
+            finished.append(1)
+
+        async def run():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(group.do('key', slow), 0.02)
+            await asyncio.sleep(0.15)
+
+        asyncio.run(run())
+        self.assertEqual(finished, [])
+        self.assertEqual(group._calls, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+import json
+import os
+import shutil
+import struct
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from tests import resources
+from pyfootball.diskcache import DiskCache
+from pyfootball.football import Football
+from pyfootball.globals import endpoints
+from pyfootball.snapshot import Snapshot, write_snapshot, competition_keys
+
+ROUTES = {
+    '/competitions/': resources.COMPETITIONS_V4,
+    '/competitions/2021': resources.COMPETITION_V4,
+    '/competitions/2021/teams': resources.COMP_TEAMS_V4,
+    '/competitions/2021/matches': resources.FIXTURES_V4,
+    '/competitions/2021/standings': resources.LEAGUE_TABLE_V4,
+}
+
+
+def body(data):
+    # A fresh copy, as decoded from a response.
+    return json.loads(json.dumps(data))
+
+
+def get(url, **kwargs):
+    data = body(ROUTES[url.split('/v4')[1]])
+    response = Mock(headers={}, status_code=200)
+    response.content = json.dumps(data).encode()
+    response.json.return_value = data
+    response.iter_content.return_value = [response.content]
+    return response
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'pl.snap')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def save(self, mock_get):
+        mock_get.side_effect = get
+        f = Football(api_key='key', rate_limiter=None, cache=True)
+        f.save_snapshot(self.path, comp_ids=[2021])
+        return f
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_round_trip(self, mock_get):
+        self.save(mock_get)
+        self.assertEqual(mock_get.call_count, 6)
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 5)
+            for key in competition_keys(2021):
+                self.assertEqual(snapshot.get(key),
+                                 ROUTES[key.split('/v4')[1]])
+            key = endpoints['comp_fixtures'].format(2021)
+            self.assertIs(snapshot.get(key), snapshot.get(key))
+            self.assertIsNone(snapshot.get(endpoints['team'].format(57)))
+            self.assertLess(time.time() - snapshot.created_at, 60)
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_offline(self, mock_get):
+        self.save(mock_get)
+        mock_get.reset_mock()
+        mock_get.side_effect = AssertionError('Sent a request.')
+        snapshot = Snapshot(self.path, max_age=float('inf'))
+        f = Football(api_key='key', rate_limiter=None, snapshot=snapshot)
+        fixtures = f.get_comp_fixtures(2021)
+        self.assertEqual(len(fixtures), 6)
+        self.assertEqual(fixtures[0].home_team['name'], 'Arsenal FC')
+        again = f.get_comp_fixtures(2021)
+        self.assertIsNot(again[0], fixtures[0])
+        self.assertEqual(again[0].id, fixtures[0].id)
+        competition = f.get_competition(2021)
+        self.assertEqual(len(competition.get_teams()), 4)
+        table = competition.get_league_table()
+        self.assertEqual(table.total_standings[0].team_id, 64)
+        self.assertEqual(mock_get.call_count, 0)
+        snapshot.close()
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_stale(self, mock_get):
+        self.save(mock_get)
+        mock_get.reset_mock()
+        # Written half an hour ago: the league table and fixtures have expired,
+        # the competition and its teams haven't.
+        snapshot = Snapshot(self.path)
+        for key, entry in snapshot.entries.items():
+            snapshot.entries[key] = entry._replace(
+                fetched_at=entry.fetched_at - 30 * 60)
+        f = Football(api_key='key', rate_limiter=None, snapshot=snapshot)
+        self.assertEqual(mock_get.call_count, 0)
+        f.get_competition(2021).get_teams()
+        self.assertEqual(mock_get.call_count, 0)
+
+        key = endpoints['league_table'].format(2021)
+        table = f.get_league_table(2021)
+        self.assertEqual(mock_get.call_count, 1)
+        # Unchanged, so the snapshot's body is kept and counted as fresh.
+        self.assertIs(f.transport.get_json(key), snapshot.get(key))
+        self.assertIsNotNone(snapshot.get_fresh(key))
+        self.assertEqual(table.total_standings[0].team_id, 64)
+
+        changed = body(resources.FIXTURES_V4)
+        changed['matches'][0]['lastUpdated'] = '2023-08-20T10:00:00Z'
+        key = endpoints['comp_fixtures'].format(2021)
+        with patch.dict(ROUTES, {'/competitions/2021/matches': changed}):
+            data = f.transport.get_json(key)
+        self.assertEqual(data, changed)
+        self.assertIsNot(data, snapshot.get(key))
+        snapshot.close()
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_competition(self, mock_get):
+        f = self.save(mock_get)
+        path = os.path.join(self.directory, 'comp.snap')
+        f.get_competition(2021).save_snapshot(path)
+        self.assertEqual(mock_get.call_count, 6)
+        with Snapshot(path) as snapshot:
+            self.assertEqual(sorted(snapshot.keys()),
+                             sorted(competition_keys(2021)))
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_cached_bodies_keep_fetch_time(self, mock_get):
+        mock_get.side_effect = get
+        for kwargs in ({'cache': True},
+                       {'disk_cache': os.path.join(self.directory, 'db')}):
+            f = Football(api_key='key', rate_limiter=None, **kwargs)
+            competition = f.get_competition(2021)
+            competition.get_fixtures()
+            time.sleep(0.01)
+            saved = time.time()
+            path = os.path.join(self.directory, 'later.snap')
+            competition.save_snapshot(path)
+            with Snapshot(path) as snapshot:
+                # Served by the cache, so stamped when they were fetched.
+                for key in (endpoints['competition'].format(2021),
+                            endpoints['comp_fixtures'].format(2021)):
+                    self.assertLess(snapshot.entries[key].fetched_at, saved,
+                                    kwargs)
+                key = endpoints['league_table'].format(2021)
+                self.assertGreaterEqual(snapshot.entries[key].fetched_at,
+                                        saved)
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_memory_and_disk_cache_keep_fetch_time(self, mock_get):
+        mock_get.side_effect = get
+        disk_cache = DiskCache(os.path.join(self.directory, 'db'))
+        Football(api_key='key', rate_limiter=None,
+                 disk_cache=disk_cache).get_competition(2021)
+        disk_cache._connect().execute(
+            'UPDATE responses SET fetched_at = fetched_at - 3000')
+        f = Football(api_key='key', rate_limiter=None, cache=True,
+                     disk_cache=disk_cache)
+        competition = f.get_competition(2021)
+        competition.save_snapshot(self.path)
+        key = endpoints['competition'].format(2021)
+        with Snapshot(self.path) as snapshot:
+            self.assertGreater(time.time() - snapshot.entries[key].fetched_at,
+                               2990)
+
+    def test_invalid(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a snapshot, just some bytes')
+        with self.assertRaises(ValueError):
+            Snapshot(self.path)
+
+        write_snapshot(self.path, {'key': ({'a': 1}, time.time())})
+        with open(self.path, 'r+b') as f:
+            f.seek(8)
+            f.write(struct.pack('<H', 99))
+        with self.assertRaisesRegex(ValueError, 'version 99'):
+            Snapshot(self.path)
+
+    def test_load_time(self):
+        key = endpoints['comp_fixtures'].format(2021)
+        season = {'matches': resources.season_v4()}
+        write_snapshot(self.path, {key: (season, time.time())})
+        self.assertLess(os.path.getsize(self.path),
+                        len(json.dumps(season)) / 5)
+        start = time.perf_counter()
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot.get_fresh(key)['matches']), 380)
+        self.assertLess(time.perf_counter() - start, 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import json
+import subprocess
+import sys
+import unittest
+
+from requests import HTTPError
+
+from tests.server import FootballDataServer
+from pyfootball.football import Football
+from pyfootball.transport import Transport
+
+# Budgets for the best of several runs in a fresh interpreter. Before lazy
+# imports, ``import pyfootball.football`` took about 0.2s here; it now takes
+# about 0.05s, and a lazy client is built in well under a millisecond.
+IMPORT_BUDGET = 0.15
+CONSTRUCTOR_BUDGET = 0.01
+RUNS = 5
+
+# Modules that are only needed once a request is sent, or by optional
+# features.
+HEAVY_MODULES = ('requests', 'urllib3', 'numpy', 'asyncio', 'aiohttp',
+                 'sqlite3', 'concurrent.futures')
+
+_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from pyfootball.football import Football
+imported = time.perf_counter()
+Football(api_key='key', lazy=True)
+built = time.perf_counter()
+print(json.dumps({'import': imported - start, 'constructor': built - imported,
+                  'modules': sorted(sys.modules)}))
+"""
+
+
+def _measure():
+    output = subprocess.check_output([sys.executable, '-c', _SCRIPT])
+    return json.loads(output.decode('utf-8'))
+
+
+class TestStartup(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.runs = [_measure() for i in range(RUNS)]
+
+    def test_import_budget(self):
+        best = min(run['import'] for run in self.runs)
+        self.assertLess(best, IMPORT_BUDGET)
+
+    def test_constructor_budget(self):
+        best = min(run['constructor'] for run in self.runs)
+        self.assertLess(best, CONSTRUCTOR_BUDGET)
+
+    def test_heavy_modules_not_loaded(self):
+        modules = set(self.runs[0]['modules'])
+        for name in HEAVY_MODULES:
+            self.assertNotIn(name, modules)
+
+
+class TestLazyClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FootballDataServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.api_key = 'good'
+
+    def tearDown(self):
+        self.server.api_key = None
+
+    def client(self, api_key):
+        transport = Transport(base_url=self.server.url, rate_limiter=None)
+        return Football(api_key=api_key, transport=transport, lazy=True)
+
+    def test_no_request_until_first_call(self):
+        f = self.client('good')
+        self.assertIsNone(f.transport._session)
+        self.assertEqual(f.get_team(1000).id, 1000)
+
+    def test_bad_key_fails_on_first_call(self):
+        f = self.client('bad')
+        with self.assertRaises(HTTPError):
+            f.get_team(1000)
+        self.assertEqual(f.get_prev_response()['Status-Code'], 403)
+        with self.assertRaises(HTTPError):
+            f.validate()
+
+    def test_package_exports(self):
+        import pyfootball
+        self.assertIs(pyfootball.Football, Football)
+        self.assertIn('KeyPool', dir(pyfootball))
+        with self.assertRaises(AttributeError):
+            pyfootball.Missing
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import copy
+import json
+import tracemalloc
+import unittest
+from unittest.mock import Mock, patch
+
+from tests import resources
+from pyfootball.football import Football
+from pyfootball.models.competition import Competition
+from pyfootball.models.fixture import Fixture
+from pyfootball.streaming import iter_items
+
+
+def _chunks(body, size):
+    for i in range(0, len(body), size):
+        yield body[i:i + size]
+
+
+def _response(payload=None, body=None):
+    if body is None:
+        body = json.dumps(payload).encode()
+    response = Mock(status_code=200, headers={}, content=body)
+    response.json.return_value = payload
+    response.raise_for_status.side_effect = None
+    response.iter_content.side_effect = lambda size: _chunks(body, size)
+    return response
+
+
+class TestIterItems(unittest.TestCase):
+    def test_any_chunk_size(self):
+        doc = dict(resources.FIXTURES_V4, name='Zürich — 1. FC')
+        body = json.dumps(doc, ensure_ascii=False).encode()
+        for size in (1, 2, 7, 64, len(body)):
+            items = list(iter_items(_chunks(body, size), 'matches'))
+            self.assertEqual(items, resources.FIXTURES_V4['matches'])
+
+    def test_other_keys_are_skipped(self):
+        body = '{"count": 1234, "filters": {"a": [1, {"b": "]"}]}, ' \
+               '"matches" : [ {"id": 1} , {"id": 2}], "after": 1}'
+        self.assertEqual(list(iter_items(_chunks(body, 3), 'matches')),
+                         [{'id': 1}, {'id': 2}])
+        self.assertEqual(list(iter_items(['{"x": [1, 2]}'], 'matches')), [])
+        self.assertEqual(list(iter_items(['{}'], 'matches')), [])
+        self.assertEqual(list(iter_items(['{"matches": []}'], 'matches')),
+                         [])
+
+    def test_malformed(self):
+        with self.assertRaises(ValueError):
+            list(iter_items(['[1, 2]'], 'matches'))
+        with self.assertRaises(ValueError):
+            list(iter_items(['{"matches": [{"id": 1}, {"id"'], 'matches'))
+
+
+class TestStreamingFootball(unittest.TestCase):
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_iter_methods(self, mock_get):
+        mock_get.return_value = _response(resources.FIXTURES_V4)
+        f = Football(api_key='key', rate_limiter=None)
+        for fixtures in (f.iter_comp_fixtures(2021), f.iter_all_fixtures(),
+                         f.iter_team_fixtures(57)):
+            fixtures = list(fixtures)
+            self.assertEqual(len(fixtures), 6)
+            self.assertIsInstance(fixtures[0], Fixture)
+        args, kwargs = mock_get.call_args
+        self.assertTrue(kwargs['stream'])
+
+        comp = Competition(resources.COMPETITION_V4,
+                           transport=f.transport)
+        self.assertEqual([x.id for x in comp.iter_fixtures()],
+                         [m['id'] for m in resources.FIXTURES_V4['matches']])
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_peak_memory_is_flat(self, mock_get):
+        template = resources.FIXTURES_V4['matches'][0]
+        matches = []
+        for i in range(5000):
+            match = copy.deepcopy(template)
+            match['id'] = i
+            matches.append(match)
+        body = json.dumps({'matches': matches}).encode()
+        del matches
+        mock_get.return_value = _response(body=body)
+        f = Football(api_key='key', rate_limiter=None)
+
+        tracemalloc.start()
+        try:
+            count = 0
+            for fixture in f.iter_comp_fixtures(2021):
+                count += 1
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(count, 5000)
+        # Decoding the whole body at once would need several times its size.
+        self.assertLess(peak, len(body) / 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
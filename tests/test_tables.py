@@ -0,0 +1,254 @@
+import copy
+import random
+import time
+import unittest
+from unittest.mock import patch
+
+from tests import resources
+from pyfootball.football import Football
+from pyfootball.models.fixture import Fixture
+from pyfootball.models.standings import Standings, LazyStandings
+
+try:
+    import numpy as np
+    from pyfootball.frame import FixtureFrame
+    from pyfootball.tables import compute_standings, compute_table_data, \
+        TableUpdater
+except ImportError:
+    np = None
+
+
+def reference_table(matches, venue=None):
+    """A straightforward table computation to check the engine against."""
+    rows = {}
+    for m in matches:
+        for side in ('homeTeam', 'awayTeam'):
+            rows.setdefault(m[side]['id'], {
+                'team': m[side], 'playedGames': 0, 'won': 0, 'draw': 0,
+                'lost': 0, 'points': 0, 'goalsFor': 0, 'goalsAgainst': 0,
+                'results': []})
+    for m in sorted(matches, key=lambda m: (m['utcDate'], m['id'])):
+        if m['status'] != 'FINISHED':
+            continue
+        home, away = m['score']['fullTime']['home'], \
+            m['score']['fullTime']['away']
+        for side, gf, ga in (('homeTeam', home, away),
+                             ('awayTeam', away, home)):
+            if venue is not None and side != venue:
+                continue
+            row = rows[m[side]['id']]
+            row['playedGames'] += 1
+            row['goalsFor'] += gf
+            row['goalsAgainst'] += ga
+            result = 'W' if gf > ga else 'D' if gf == ga else 'L'
+            row[{'W': 'won', 'D': 'draw', 'L': 'lost'}[result]] += 1
+            row['points'] += {'W': 3, 'D': 1, 'L': 0}[result]
+            row['results'].append(result)
+    table = []
+    for row in rows.values():
+        row['goalDifference'] = row['goalsFor'] - row['goalsAgainst']
+        row['form'] = ','.join(reversed(row.pop('results')[-5:])) or None
+        table.append(row)
+    table.sort(key=lambda r: (-r['points'], -r['goalDifference'],
+                              -r['goalsFor'], r['team']['name']))
+    for position, row in enumerate(table, 1):
+        row['position'] = position
+    return table
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestTables(unittest.TestCase):
+    def test_matches_api(self):
+        fixtures = [Fixture(m) for m in resources.FIXTURES_V4['matches']]
+        data = compute_table_data(fixtures)
+        self.assertEqual(data['standings'],
+                         resources.LEAGUE_TABLE_V4['standings'])
+        frame = FixtureFrame.from_json(resources.FIXTURES_V4['matches'])
+        self.assertEqual(compute_table_data(frame)['standings'],
+                         resources.LEAGUE_TABLE_V4['standings'])
+
+    def test_standings_object(self):
+        fixtures = [Fixture(m) for m in resources.FIXTURES_V4['matches']]
+        table = Standings.from_fixtures(fixtures)
+        api = Standings(resources.LEAGUE_TABLE_V4)
+        for name in ('total_standings', 'home_standings', 'away_standings'):
+            self.assertEqual([vars(s) for s in getattr(table, name)],
+                             [vars(s) for s in getattr(api, name)])
+        self.assertEqual(table.competition['id'], 2021)
+        self.assertIsInstance(LazyStandings.from_fixtures(fixtures),
+                              LazyStandings)
+
+    def test_full_season(self):
+        matches = resources.season_v4(played_matchdays=30)
+        data = compute_table_data(FixtureFrame.from_json(matches))
+        for standing, venue in zip(data['standings'],
+                                   [None, 'homeTeam', 'awayTeam']):
+            self.assertEqual(standing['table'],
+                             reference_table(matches, venue))
+
+    def test_tie_breaks(self):
+        # Every team wins once, so all three are level on points.
+        a, b, c = (1, 'B Team', 'BBB'), (2, 'A Team', 'AAA'), \
+            (3, 'C Team', 'CCC')
+        fix = resources._fixture_v4
+        matches = [fix(1, 1, '2023-08-12T12:00:00Z', a, b, 'FINISHED',
+                       (1, 0)),
+                   fix(2, 2, '2023-08-19T12:00:00Z', b, c, 'FINISHED',
+                       (2, 0)),
+                   fix(3, 3, '2023-08-26T12:00:00Z', c, a, 'FINISHED',
+                       (1, 0))]
+        frame = FixtureFrame.from_json(matches)
+
+        def order(tie_breaks):
+            table = compute_standings(frame, tie_breaks).total_standings
+            return [s.team_name for s in table]
+
+        self.assertEqual(order(None), ['A Team', 'B Team', 'C Team'])
+        self.assertEqual(order(['points', 'goal_difference',
+                                'head_to_head_points']),
+                         ['A Team', 'B Team', 'C Team'])
+        self.assertEqual(order(['points', 'away_goals_for']),
+                         ['A Team', 'B Team', 'C Team'])
+        self.assertEqual(order(['points', 'goals_against']),
+                         ['A Team', 'B Team', 'C Team'])
+        self.assertEqual(order(['points', 'wins']),
+                         ['A Team', 'B Team', 'C Team'])
+        self.assertEqual(order([]), ['A Team', 'B Team', 'C Team'])
+        with self.assertRaises(ValueError):
+            order(['coin_toss'])
+
+    def test_head_to_head(self):
+        a, b, c = (1, 'A Team', 'AAA'), (2, 'B Team', 'BBB'), \
+            (3, 'C Team', 'CCC')
+        fix = resources._fixture_v4
+        matches = [fix(1, 1, '2023-08-12T12:00:00Z', b, a, 'FINISHED',
+                       (1, 0)),
+                   fix(2, 2, '2023-08-19T12:00:00Z', a, c, 'FINISHED',
+                       (5, 0)),
+                   fix(3, 3, '2023-08-26T12:00:00Z', c, b, 'FINISHED',
+                       (0, 0))]
+        table = compute_standings([Fixture(m) for m in matches],
+                                  ['points', 'head_to_head_points',
+                                   'goal_difference'])
+        self.assertEqual([s.team_name for s in table.total_standings],
+                         ['B Team', 'A Team', 'C Team'])
+
+    def test_season_takes_milliseconds(self):
+        frame = FixtureFrame.from_json(resources.season_v4())
+        compute_table_data(frame)
+        start = time.perf_counter()
+        for i in range(10):
+            compute_table_data(frame)
+        self.assertLess((time.perf_counter() - start) / 10, 0.05)
+
+
+def rows(standings):
+    return [[(s.position, s.team_id, s.games_played, s.form, s.wins,
+              s.draws, s.losses, s.points, s.goals, s.goals_against,
+              s.goal_difference) for s in table]
+            for table in (standings.total_standings, standings.home_standings,
+                          standings.away_standings)]
+
+
+def recompute(matches):
+    return rows(compute_standings([Fixture(m) for m in matches]))
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestTableUpdater(unittest.TestCase):
+    def test_random_changes(self):
+        # New results, corrected scores, matches in play and annulled
+        # results, in random order, against a full recompute.
+        matches = resources.season_v4(played_matchdays=20)
+        current = {m['id']: m for m in matches}
+        table = Standings.from_fixtures([Fixture(m) for m in matches])
+        rng = random.Random(1)
+        for step in range(200):
+            match = copy.deepcopy(rng.choice(matches))
+            match['status'] = rng.choice(['FINISHED', 'AWARDED', 'IN_PLAY',
+                                          'TIMED'])
+            if match['status'] == 'TIMED':
+                score = {'home': None, 'away': None}
+            else:
+                score = {'home': rng.randint(0, 3), 'away': rng.randint(0, 3)}
+            match['score']['fullTime'] = score
+            current[match['id']] = match
+            table.apply(Fixture(match))
+            if step % 40 == 0:
+                self.assertEqual(rows(table), recompute(current.values()))
+        self.assertEqual(rows(table), recompute(current.values()))
+
+    def test_fetched_table(self):
+        # A table from the API, with the match in play finishing.
+        table = Standings(resources.LEAGUE_TABLE_V4)
+        matches = copy.deepcopy(resources.FIXTURES_V4['matches'])
+        self.assertFalse(table.apply(matches[4]))
+        matches[4]['status'] = 'FINISHED'
+        self.assertTrue(table.apply(matches[4]))
+        self.assertEqual(rows(table), recompute(matches))
+        self.assertEqual(table.total_standings[0].team_name, 'Arsenal FC')
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_cached_table_not_shared(self, mock_get):
+        mock_get.return_value.headers = {}
+        mock_get.return_value.content = b'x' * 10
+        mock_get.return_value.json.return_value = resources.LEAGUE_TABLE_V4
+        f = Football(api_key='key', cache=True)
+        table = f.get_league_table(2021)
+        before = rows(f.get_league_table(2021))
+        matches = copy.deepcopy(resources.FIXTURES_V4['matches'])
+        matches[4]['status'] = 'FINISHED'
+        self.assertTrue(table.apply(matches[4]))
+        self.assertNotEqual(rows(table), before)
+        # Another caller, served from the same cached body, is unaffected.
+        self.assertEqual(rows(f.get_league_table(2021)), before)
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_tracked_correction(self):
+        matches = copy.deepcopy(resources.FIXTURES_V4['matches'])
+        table = Standings(resources.LEAGUE_TABLE_V4)
+        table.track(matches)
+        matches[2]['score']['fullTime'] = {'home': 3, 'away': 3}
+        self.assertEqual(table.apply_many(matches), 1)
+        self.assertEqual(rows(table), recompute(matches))
+        matches[2]['status'] = 'CANCELLED'
+        table.apply(matches[2])
+        self.assertEqual(rows(table), recompute(matches))
+
+    def test_frame(self):
+        matches = resources.season_v4(played_matchdays=10)
+        table = Standings.from_fixtures(FixtureFrame.from_json(matches))
+        matches[200]['status'] = 'FINISHED'
+        matches[200]['score']['fullTime'] = {'home': 2, 'away': 0}
+        table.apply(matches[200])
+        self.assertEqual(rows(table), recompute(matches))
+
+    def test_unsupported(self):
+        with self.assertRaises(ValueError):
+            Standings(resources.LEAGUE_TABLE_V4).track(
+                [], tie_breaks=['points', 'head_to_head_points'])
+        table = Standings(resources.LEAGUE_TABLE_V4)
+        match = resources._fixture_v4(1, 4, '2023-09-02T14:00:00Z',
+                                      (1, 'A', 'A'), (2, 'B', 'B'),
+                                      'FINISHED', (1, 0))
+        with self.assertRaises(ValueError):
+            table.apply(match)
+
+    def test_takes_microseconds(self):
+        matches = resources.season_v4(played_matchdays=30)
+        table = Standings.from_fixtures([Fixture(m) for m in matches])
+        events = []
+        for goals in range(1000):
+            match = copy.deepcopy(matches[0])
+            match['score']['fullTime']['home'] = goals % 5
+            events.append(Fixture(match))
+        updater = TableUpdater(table)
+        start = time.perf_counter()
+        updater.track(matches[:1])
+        for fixture in events:
+            updater.apply(fixture)
+        self.assertLess((time.perf_counter() - start) / len(events), 0.001)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import requests
+import unittest
+from unittest.mock import patch
+
+from tests import resources
+from pyfootball.football import Football
+from pyfootball.transport import Transport
+
+
+class TestTransport(unittest.TestCase):
+    def test_pool_size(self):
+        transport = Transport(pool_size=4)
+        adapter = transport.session.get_adapter('https://example.org')
+        self.assertEqual(adapter._pool_connections, 4)
+        self.assertEqual(adapter._pool_maxsize, 4)
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_get_sends_headers_and_timeout(self, mock_get):
+        mock_get.return_value.json.return_value = {'a': 1}
+        transport = Transport(headers={'X-Auth-Token': 'key'}, timeout=3)
+
+        data = transport.get_json('https://example.org/x', params={'b': 2})
+        self.assertEqual(data, {'a': 1})
+        args, kwargs = mock_get.call_args
+        self.assertEqual(kwargs['headers'], {'X-Auth-Token': 'key'})
+        self.assertEqual(kwargs['params'], {'b': 2})
+        self.assertEqual(kwargs['timeout'], 3)
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_get_raises_for_status(self, mock_get):
+        http_err = requests.exceptions.HTTPError()
+        mock_get.return_value.raise_for_status.side_effect = http_err
+        with self.assertRaises(requests.exceptions.HTTPError):
+            Transport().get('https://example.org/x')
+
+
+class TestSharedTransport(unittest.TestCase):
+    @patch('pyfootball.transport.requests.Session.get')
+    def setUp(self, mock_get):
+        mock_get.return_value.headers = {}
+        self.football = Football(api_key='key', pool_size=2, timeout=7,
+                                 headers={'X-Unfold-Goals': 'true'})
+
+    @patch('pyfootball.transport.requests.Session.get')
+    def test_models_share_transport(self, mock_get):
+        mock_get.return_value.headers = {}
+        mock_get.return_value.json.return_value = resources.COMPETITION_V4
+        comp = self.football.get_competition(2021)
+        self.assertIs(comp._transport, self.football._transport)
+
+        mock_get.return_value.json.return_value = resources.COMP_TEAMS_V4
+        teams = comp.get_teams()
+        for team in teams:
+            self.assertIs(team._transport, self.football._transport)
+
+        mock_get.return_value.json.return_value = resources.TEAM_V4
+        teams[0].get_players()
+
+        for args, kwargs in mock_get.call_args_list:
+            self.assertEqual(kwargs['headers'],
+                             {'X-Auth-Token': 'key',
+                              'X-Unfold-Goals': 'true'})
+            self.assertEqual(kwargs['timeout'], 7)
+
+    def test_custom_transport(self):
+        transport = Transport()
+        with patch('pyfootball.transport.requests.Session.get'):
+            football = Football(api_key='key', transport=transport)
+        self.assertIs(football._transport, transport)
+        self.assertEqual(transport.headers, {'X-Auth-Token': 'key'})
+
+
+if __name__ == '__main__':
+    unittest.main()